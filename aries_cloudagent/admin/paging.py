@@ -0,0 +1,125 @@
+"""Pagination and streaming support for admin list endpoints."""
+
+import json
+from typing import AsyncIterator, Optional, Tuple
+
+from aiohttp import web
+
+from ..messaging.models.base import BaseModel
+
+MAX_PAGE_LIMIT = 1000
+
+# serialized results are written to the response in chunks of about this size
+STREAM_CHUNK_SIZE = 65536
+
+PAGING_PARAMETERS = [
+    {
+        "name": "limit",
+        "in": "query",
+        "schema": {"type": "integer", "minimum": 1, "maximum": MAX_PAGE_LIMIT},
+        "required": False,
+        "description": (
+            "Maximum number of results to return in one page. Pages follow "
+            "storage order, so results are only sorted within each page"
+        ),
+    },
+    {
+        "name": "cursor",
+        "in": "query",
+        "schema": {"type": "string"},
+        "required": False,
+        "description": (
+            "Cursor returned as next_cursor by the previous page. Records "
+            "added or removed before the cursor do not shift later pages"
+        ),
+    },
+    {
+        "name": "stream",
+        "in": "query",
+        "schema": {"type": "boolean"},
+        "required": False,
+        "description": "Stream all results in storage order, in constant memory",
+    },
+]
+
+
+def get_paging(request: web.BaseRequest) -> Tuple[Optional[int], int]:
+    """
+    Extract the page limit and cursor from the request query parameters.
+
+    Args:
+        request: aiohttp request object
+
+    Returns:
+        A tuple of the page limit, or `None` if results are not paginated,
+        and the cursor to resume from
+
+    Raises:
+        HTTPBadRequest: If the parameters are invalid
+
+    """
+    limit = request.query.get("limit")
+    cursor = request.query.get("cursor")
+    if limit in (None, ""):
+        if cursor:
+            raise web.HTTPBadRequest(reason="A cursor requires a page limit")
+        return None, 0
+    try:
+        limit = int(limit)
+        cursor = int(cursor) if cursor else 0
+    except ValueError:
+        raise web.HTTPBadRequest(reason="Invalid page limit or cursor")
+    if not 0 < limit <= MAX_PAGE_LIMIT or cursor < 0:
+        raise web.HTTPBadRequest(reason="Invalid page limit or cursor")
+    return limit, cursor
+
+
+def paged_response(results: list, next_cursor: Optional[int]) -> dict:
+    """Build a list response body including the cursor of the next page."""
+    return {
+        "results": results,
+        "next_cursor": None if next_cursor is None else str(next_cursor),
+    }
+
+
+def is_streaming(request: web.BaseRequest) -> bool:
+    """Check whether the request asks for a streamed list response."""
+    return request.query.get("stream", "").lower() in ("1", "true")
+
+
+async def stream_response(
+    request: web.BaseRequest, records: AsyncIterator[BaseModel]
+) -> web.StreamResponse:
+    """
+    Stream a list response body as records are retrieved.
+
+    The response has the same shape as an unpaginated list response, but only
+    the records within the current chunk are held in memory.
+
+    Args:
+        request: aiohttp request object
+        records: an async iterator over the records to serialize
+
+    Returns:
+        The prepared and completed stream response
+
+    """
+    response = web.StreamResponse(headers={"Content-Type": "application/json"})
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+    chunk = ['{"results": [']
+    size = 0
+    separator = ""
+    async for record in records:
+        item = separator + json.dumps(record.serialize())
+        separator = ", "
+        chunk.append(item)
+        size += len(item)
+        if size >= STREAM_CHUNK_SIZE:
+            await response.write("".join(chunk).encode("utf-8"))
+            chunk = []
+            size = 0
+    chunk.append("]}")
+    await response.write("".join(chunk).encode("utf-8"))
+    await response.write_eof()
+    return response
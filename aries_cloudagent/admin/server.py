@@ -11,6 +11,7 @@ import aiohttp_cors
 
 from marshmallow import fields, Schema
 
+from ..cache.base import BaseCache
 from ..config.injection_context import InjectionContext
 from ..core.plugin_registry import PluginRegistry
 from ..messaging.responder import BaseResponder
@@ -310,6 +311,11 @@ class AdminServer(BaseAdminServer):
             status["timing"] = collector.results
         if self.conductor_stats:
             status["conductor"] = await self.conductor_stats()
+        cache: BaseCache = await self.context.inject(BaseCache, required=False)
+        if cache:
+            cache_stats = cache.get_stats()
+            if cache_stats:
+                status["cache"] = cache_stats
         return web.json_response(status)
 
     @docs(tags=["server"], summary="Reset statistics")
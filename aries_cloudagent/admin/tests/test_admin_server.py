@@ -5,6 +5,8 @@ from aiohttp import web
 from asynctest import TestCase as AsyncTestCase
 from asynctest.mock import patch
 
+from ...cache.base import BaseCache
+from ...cache.basic import BasicCache
 from ...config.default_context import DefaultContextBuilder
 from ...config.injection_context import InjectionContext
 from ...config.provider import ClassProvider
@@ -158,6 +160,13 @@ class TestAdminServerClient(AioHTTPTestCase):
         resp = await self.client.request("POST", "/status/reset")
         assert resp.status == 200
 
+    @unittest_run_loop
+    async def test_status_cache(self):
+        self.admin_server.context.injector.bind_instance(BaseCache, BasicCache())
+        resp = await self.client.request("GET", "/status")
+        result = await resp.json()
+        assert result["cache"]["size"] == 0
+
     @unittest_run_loop
     async def test_websocket(self):
         async with self.client.ws_connect("/ws") as ws:
@@ -0,0 +1,53 @@
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase, make_mocked_request, unittest_run_loop
+from asynctest import mock as async_mock
+
+from .. import paging as test_module
+
+
+class TestPaging(AioHTTPTestCase):
+    async def get_application(self):
+        async def handler(request):
+            async def records():
+                for idx in range(int(request.query["count"])):
+                    yield async_mock.MagicMock(
+                        serialize=async_mock.MagicMock(return_value={"idx": idx})
+                    )
+
+            return await test_module.stream_response(request, records())
+
+        app = web.Application()
+        app.add_routes([web.get("/records", handler)])
+        return app
+
+    @unittest_run_loop
+    async def test_stream_response(self):
+        with async_mock.patch.object(test_module, "STREAM_CHUNK_SIZE", 20):
+            for count in (0, 1, 25):
+                async with self.client.get(f"/records?count={count}") as response:
+                    assert response.headers["Content-Type"] == "application/json"
+                    body = json.loads(await response.text())
+                assert body == {"results": [{"idx": idx} for idx in range(count)]}
+
+    def test_get_paging(self):
+        def request(query):
+            return make_mocked_request("GET", "/connections?" + query)
+
+        assert test_module.get_paging(request("")) == (None, 0)
+        assert test_module.get_paging(request("limit=10")) == (10, 0)
+        assert test_module.get_paging(request("limit=10&cursor=30")) == (10, 30)
+        for query in (
+            "cursor=30",
+            "limit=0",
+            "limit=1001",
+            "limit=a",
+            "limit=1&cursor=-1",
+        ):
+            with self.assertRaises(web.HTTPBadRequest):
+                test_module.get_paging(request(query))
+
+    def test_is_streaming(self):
+        assert test_module.is_streaming(make_mocked_request("GET", "/?stream=true"))
+        assert not test_module.is_streaming(make_mocked_request("GET", "/"))
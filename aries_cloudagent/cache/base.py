@@ -2,7 +2,7 @@
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Sequence, Text, Union
+from typing import Any, Callable, Mapping, Sequence, Text, Union
 
 from ..core.error import BaseError
 
@@ -57,9 +57,71 @@ class BaseCache(ABC):
     async def flush(self):
         """Remove all items from the cache."""
 
+    async def get_many(self, keys: Sequence[Text]) -> Sequence[Any]:
+        """
+        Get multiple items from the cache.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A list of the records found, with `None` for missing keys
+
+        """
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: Mapping[Text, Any], ttl: int = None):
+        """
+        Add multiple items to the cache with an optional ttl.
+
+        Args:
+            items: a mapping of keys to the values to store
+            ttl: number of seconds that the records should persist
+
+        """
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+
+    async def publish(self, channel: Text, message: Text):
+        """
+        Publish a message to other agent instances sharing this cache.
+
+        Caches which are not shared between instances ignore the message.
+
+        Args:
+            channel: the channel name
+            message: the message to publish
+
+        """
+
+    async def subscribe(self, channel: Text, handler: Callable) -> bool:
+        """
+        Subscribe to messages published by other agent instances.
+
+        The handler is called with each message received, and with `None` whenever
+        the subscription is (re)established and earlier messages may have been lost.
+
+        Args:
+            channel: the channel name
+            handler: the callable to receive messages
+
+        Returns:
+            `True` if the cache supports subscriptions
+
+        """
+        return False
+
+    def get_stats(self) -> dict:
+        """Get the current cache statistics, if tracked by the implementation."""
+        return {}
+
+    def _create_key_lock(self, key: Text) -> "CacheKeyLock":
+        """Create a new lock instance for a given cache key."""
+        return CacheKeyLock(self, key)
+
     def acquire(self, key: Text):
         """Acquire a lock on a given cache key."""
-        result = CacheKeyLock(self, key)
+        result = self._create_key_lock(key)
         first = self._key_locks.setdefault(key, result)
         if first is not result:
             result.parent = first
@@ -1,6 +1,8 @@
 """Basic in-memory cache implementation."""
 
+import heapq
 import time
+from collections import OrderedDict
 from typing import Any, Sequence, Text, Union
 
 from .base import BaseCache
@@ -9,21 +11,54 @@ from .base import BaseCache
 class BasicCache(BaseCache):
     """Basic in-memory cache class."""
 
-    def __init__(self):
-        """Initialize a `BasicCache` instance."""
+    def __init__(self, max_size: int = None):
+        """
+        Initialize a `BasicCache` instance.
+
+        Args:
+            max_size: the maximum number of entries to hold before evicting the
+                least recently used entry, or `None` for an unbounded cache
+
+        """
         super().__init__()
         # looks like { "key": { "expires": <epoch timestamp>, "value": <val> } }
-        self._cache = {}
+        # ordered from least to most recently used
+        self._cache = OrderedDict()
+        # heap of (expires, key) pairs, entries are checked lazily against _cache
+        self._expiry_heap = []
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
     def _remove_expired_cache_items(self):
-        """Remove all expired items from cache."""
-        for key, val in self._cache.copy().items():  # iterate copy, del from original
-            cache_item_expiry = val["expires"]
-            if cache_item_expiry is None:
-                continue
-            now = time.perf_counter()
-            if now >= cache_item_expiry:
+        """Remove expired items from the head of the expiry heap."""
+        heap = self._expiry_heap
+        now = time.perf_counter()
+        while heap and heap[0][0] <= now:
+            expires, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # skip heap entries for keys which have since been replaced or cleared
+            if entry and entry["expires"] == expires:
                 del self._cache[key]
+                self.expirations += 1
+
+        # drop stale heap entries once they outnumber the live ones
+        if len(heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [
+                (entry["expires"], key)
+                for key, entry in self._cache.items()
+                if entry["expires"] is not None
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def _evict_items(self):
+        """Evict the least recently used items until within the maximum size."""
+        if self.max_size is not None:
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
 
     async def get(self, key: Text):
         """
@@ -36,8 +71,18 @@ class BasicCache(BaseCache):
             The record found or `None`
 
         """
-        self._remove_expired_cache_items()
-        return self._cache.get(key)["value"] if self._cache.get(key) else None
+        entry = self._cache.get(key)
+        if entry:
+            expires = entry["expires"]
+            if expires is not None and time.perf_counter() >= expires:
+                del self._cache[key]
+                self.expirations += 1
+            else:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry["value"]
+        self.misses += 1
+        return None
 
     async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
         """
@@ -55,6 +100,10 @@ class BasicCache(BaseCache):
         expires_ts = time.perf_counter() + ttl if ttl else None
         for key in [keys] if isinstance(keys, Text) else keys:
             self._cache[key] = {"expires": expires_ts, "value": value}
+            self._cache.move_to_end(key)
+            if expires_ts is not None:
+                heapq.heappush(self._expiry_heap, (expires_ts, key))
+        self._evict_items()
 
     async def clear(self, key: Text):
         """
@@ -70,4 +119,16 @@ class BasicCache(BaseCache):
     async def flush(self):
         """Remove all items from the cache."""
 
-        self._cache = {}
+        self._cache = OrderedDict()
+        self._expiry_heap = []
+
+    def get_stats(self) -> dict:
+        """Get the current cache statistics."""
+        return {
+            "size": len(self._cache),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
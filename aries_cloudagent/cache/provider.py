@@ -0,0 +1,40 @@
+"""Default cache provider classes."""
+
+from ..config.base import BaseProvider, BaseInjector, BaseSettings
+from ..utils.classloader import ClassLoader
+
+from .tiered import TieredCache
+
+
+class CacheProvider(BaseProvider):
+    """Provider for the default configurable cache classes."""
+
+    CACHE_TYPES = {
+        "basic": "aries_cloudagent.cache.basic.BasicCache",
+        "redis": "aries_cloudagent.cache.redis.RedisCache",
+    }
+
+    async def provide(self, settings: BaseSettings, injector: BaseInjector):
+        """Create and return the cache instance."""
+
+        cache_type = settings.get_value("cache.type", default="basic").lower()
+        cache_class = ClassLoader.load_class(
+            self.CACHE_TYPES.get(cache_type, cache_type)
+        )
+        args = {}
+        if cache_type == "basic":
+            args["max_size"] = settings.get("cache.max_size")
+            return cache_class(**args)
+
+        for key in ("url", "pool_size", "prefix"):
+            if settings.get(f"cache.{key}"):
+                args[key] = settings[f"cache.{key}"]
+        cache = cache_class(**args)
+
+        # front the shared cache with a local in-memory cache
+        if settings.get("cache.l1_max_size"):
+            args = {"l1_max_size": settings["cache.l1_max_size"]}
+            if settings.get("cache.l1_ttl"):
+                args["l1_ttl"] = settings["cache.l1_ttl"]
+            cache = TieredCache(cache, **args)
+        return cache
@@ -0,0 +1,519 @@
+"""Shared cache implementation for Redis-compatible servers."""
+
+import asyncio
+import json
+import logging
+import ssl
+from typing import Any, Callable, Mapping, Sequence, Text, Union
+from urllib.parse import unquote, urlparse
+from uuid import uuid4
+
+from .base import BaseCache, CacheError, CacheKeyLock
+
+LOGGER = logging.getLogger(__name__)
+
+# delete a lock only if it is still held by the given token
+RELEASE_LOCK_SCRIPT = (
+    'if redis.call("get",KEYS[1])==ARGV[1] then '
+    'return redis.call("del",KEYS[1]) end'
+)
+
+
+class RedisConnection:
+    """A single connection to a Redis-compatible server speaking RESP."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Initialize the connection."""
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(
+        cls,
+        host: str,
+        port: int,
+        db: int = 0,
+        password: str = None,
+        use_ssl: bool = False,
+        timeout: float = None,
+    ) -> "RedisConnection":
+        """Open and authenticate a new connection."""
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    host, port, ssl=ssl.create_default_context() if use_ssl else None
+                ),
+                timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise CacheError(f"Error connecting to cache server: {e}") from e
+        conn = cls(reader, writer)
+        setup = []
+        if password:
+            setup.append(("AUTH", password))
+        if db:
+            setup.append(("SELECT", db))
+        if setup:
+            try:
+                await conn.execute(*setup)
+            except CacheError:
+                conn.close()
+                raise
+        return conn
+
+    @staticmethod
+    def encode_command(*args) -> bytes:
+        """Encode a single command as a RESP array of bulk strings."""
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, bytes):
+                value = arg
+            elif isinstance(arg, str):
+                value = arg.encode("utf-8")
+            else:
+                value = str(arg).encode("ascii")
+            parts.append(b"$%d\r\n%s\r\n" % (len(value), value))
+        return b"".join(parts)
+
+    async def read_reply(self):
+        """Read and decode a single reply from the server."""
+        line = await self.reader.readuntil(b"\r\n")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body.decode("utf-8")
+        if prefix == b"-":
+            return CacheError(body.decode("utf-8"))
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [await self.read_reply() for _ in range(length)]
+        raise CacheError(f"Unexpected reply from cache server: {line!r}")
+
+    async def execute(self, *commands: Sequence) -> list:
+        """
+        Execute a pipeline of commands, returning the list of replies.
+
+        All commands are written before any replies are read, so the
+        pipeline costs a single network round trip.
+        """
+        self.writer.write(b"".join(self.encode_command(*cmd) for cmd in commands))
+        await self.writer.drain()
+        replies = [await self.read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, CacheError):
+                raise reply
+        return replies
+
+    @property
+    def closed(self) -> bool:
+        """Accessor for the closed state of the connection."""
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self):
+        """Close the connection."""
+        self.writer.close()
+
+
+class RedisConnectionPool:
+    """A bounded pool of connections to a Redis-compatible server."""
+
+    def __init__(self, url: str, max_size: int = 10, timeout: float = 10.0):
+        """
+        Initialize the connection pool.
+
+        Args:
+            url: the server URL, like `redis://[:password@]host[:port][/db]`
+            max_size: the maximum number of open connections
+            timeout: the timeout in seconds for opening a connection
+
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "rediss"):
+            raise CacheError(f"Unsupported cache server URL: {url}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.strip("/") or 0)
+        self.use_ssl = parsed.scheme == "rediss"
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = []
+        self._limit = asyncio.Semaphore(max_size)
+        self.active = 0
+        self.total_opened = 0
+
+    @property
+    def idle(self) -> int:
+        """Accessor for the number of idle connections."""
+        return len(self._idle)
+
+    async def acquire(self) -> RedisConnection:
+        """Acquire a connection from the pool, opening one if necessary."""
+        await self._limit.acquire()
+        self.active += 1
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.closed:
+                return conn
+        try:
+            conn = await self.open_connection()
+        except Exception:
+            self.active -= 1
+            self._limit.release()
+            raise
+        self.total_opened += 1
+        return conn
+
+    async def open_connection(self) -> RedisConnection:
+        """Open a new connection outside of the pool."""
+        return await RedisConnection.open(
+            self.host,
+            self.port,
+            db=self.db,
+            password=self.password,
+            use_ssl=self.use_ssl,
+            timeout=self.timeout,
+        )
+
+    def release(self, conn: RedisConnection, discard: bool = False):
+        """Return a connection to the pool."""
+        if discard or conn.closed:
+            conn.close()
+        else:
+            self._idle.append(conn)
+        self.active -= 1
+        self._limit.release()
+
+    async def execute(self, *commands: Sequence) -> list:
+        """Execute a pipeline of commands on a pooled connection."""
+        conn = await self.acquire()
+        try:
+            result = await conn.execute(*commands)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+            self.release(conn, discard=True)
+            raise CacheError(f"Error communicating with cache server: {e}") from e
+        except BaseException:
+            # replies may still be pending on the connection
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+        return result
+
+    def close(self):
+        """Close all idle connections."""
+        while self._idle:
+            self._idle.pop().close()
+
+
+class RedisCacheKeyLock(CacheKeyLock):
+    """
+    A cache key lock which is also held across all instances sharing the cache.
+
+    Once no result is found locally, the lock is claimed on the server so that
+    only one agent instance generates the value while the others wait for it.
+    """
+
+    def __init__(self, cache: "RedisCache", key: Text):
+        """Initialize the key lock."""
+        super().__init__(cache, key)
+        self._lock_token: str = None
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await super().__aenter__()
+        if not self.done:
+            await self._acquire_shared()
+        return self
+
+    async def _acquire_shared(self):
+        """Claim the shared lock or wait for another instance to set a result."""
+        cache: RedisCache = self.cache
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + cache.lock_timeout
+        delay = 0.01
+        token = uuid4().hex
+        while True:
+            if await cache.acquire_shared_lock(self.key, token):
+                self._lock_token = token
+                # another instance may have set the result before releasing
+                found = await cache.get(self.key)
+                if found:
+                    self._future.set_result(found)
+                return
+            found = await cache.get(self.key)
+            if found:
+                self._future.set_result(found)
+                return
+            if loop.time() >= deadline:
+                LOGGER.warning("Timed out waiting for shared cache lock: %s", self.key)
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit, releasing the shared lock."""
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+        if self._lock_token:
+            token, self._lock_token = self._lock_token, None
+            await self.cache.release_shared_lock(self.key, token)
+
+
+class RedisCache(BaseCache):
+    """Cache backed by a shared Redis-compatible server."""
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379",
+        pool_size: int = 10,
+        prefix: str = "acapy::",
+        lock_timeout: float = 30.0,
+    ):
+        """
+        Initialize a `RedisCache` instance.
+
+        Args:
+            url: the URL of the cache server
+            pool_size: the maximum number of pooled connections
+            prefix: a prefix applied to all keys to share a server between agents
+            lock_timeout: seconds after which a shared key lock is abandoned
+
+        """
+        super().__init__()
+        self.pool = RedisConnectionPool(url, pool_size)
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self.hits = 0
+        self.misses = 0
+        self._subscriptions = []
+
+    def _key(self, key: Text) -> str:
+        return self.prefix + key
+
+    def _lock_key(self, key: Text) -> str:
+        return self.prefix + "lock::" + key
+
+    def _set_command(self, key: Text, value: bytes, ttl: Union[int, float]):
+        cmd = ["SET", self._key(key), value]
+        if ttl:
+            cmd.extend(("PX", max(int(ttl * 1000), 1)))
+        return cmd
+
+    def _decode(self, value: bytes) -> Any:
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        (value,) = await self.pool.execute(("GET", self._key(key)))
+        return self._decode(value)
+
+    async def get_many(self, keys: Sequence[Text]) -> Sequence[Any]:
+        """
+        Get multiple items from the cache in a single round trip.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A list of the records found, with `None` for missing keys
+
+        """
+        if not keys:
+            return []
+        (values,) = await self.pool.execute(
+            ["MGET"] + [self._key(key) for key in keys]
+        )
+        return [self._decode(value) for value in values]
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        encoded = json.dumps(value).encode("utf-8")
+        await self.pool.execute(
+            *(
+                self._set_command(key, encoded, ttl)
+                for key in ([keys] if isinstance(keys, Text) else keys)
+            )
+        )
+
+    async def set_many(self, items: Mapping[Text, Any], ttl: int = None):
+        """
+        Add multiple items to the cache in a single round trip.
+
+        Args:
+            items: a mapping of keys to the values to store
+            ttl: number of seconds that the records should persist
+
+        """
+        if items:
+            await self.pool.execute(
+                *(
+                    self._set_command(key, json.dumps(value).encode("utf-8"), ttl)
+                    for key, value in items.items()
+                )
+            )
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        await self.pool.execute(("DEL", self._key(key)))
+
+    async def flush(self):
+        """Remove all items with this cache's prefix from the server."""
+        cursor = b"0"
+        while True:
+            ((cursor, keys),) = await self.pool.execute(
+                ("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 1000)
+            )
+            if keys:
+                await self.pool.execute(["DEL"] + keys)
+            if cursor in (b"0", 0):
+                break
+
+    async def acquire_shared_lock(self, key: Text, token: str) -> bool:
+        """Attempt to claim the shared lock for a cache key."""
+        (result,) = await self.pool.execute(
+            (
+                "SET",
+                self._lock_key(key),
+                token,
+                "NX",
+                "PX",
+                int(self.lock_timeout * 1000),
+            )
+        )
+        return result == "OK"
+
+    async def release_shared_lock(self, key: Text, token: str):
+        """Release the shared lock for a cache key if still held by this token."""
+        try:
+            await self.pool.execute(
+                ("EVAL", RELEASE_LOCK_SCRIPT, 1, self._lock_key(key), token)
+            )
+        except CacheError:
+            # the lock will expire on its own
+            LOGGER.exception("Error releasing shared cache lock: %s", key)
+
+    async def publish(self, channel: Text, message: Text):
+        """
+        Publish a message to other agent instances sharing this cache.
+
+        Args:
+            channel: the channel name
+            message: the message to publish
+
+        """
+        await self.pool.execute(("PUBLISH", self.prefix + channel, message))
+
+    async def subscribe(self, channel: Text, handler: Callable) -> bool:
+        """
+        Subscribe to messages published by other agent instances.
+
+        The subscription is held on a dedicated connection which is
+        reopened if it fails.
+
+        Args:
+            channel: the channel name
+            handler: the callable to receive messages
+
+        Returns:
+            `True` as subscriptions are supported
+
+        """
+        self._subscriptions.append(
+            asyncio.ensure_future(self._run_subscription(channel, handler))
+        )
+        return True
+
+    async def _run_subscription(self, channel: Text, handler: Callable):
+        """Receive subscription messages, reconnecting on failure."""
+        delay = 0.1
+        while True:
+            conn = None
+            try:
+                conn = await self.pool.open_connection()
+                conn.writer.write(
+                    conn.encode_command("SUBSCRIBE", self.prefix + channel)
+                )
+                await conn.writer.drain()
+                while True:
+                    reply = await conn.read_reply()
+                    if not isinstance(reply, list) or len(reply) < 3:
+                        continue
+                    kind = reply[0]
+                    if kind == b"subscribe":
+                        delay = 0.1
+                        message = None
+                    elif kind == b"message":
+                        message = reply[2].decode("utf-8")
+                    else:
+                        continue
+                    try:
+                        handler(message)
+                    except Exception:
+                        LOGGER.exception("Error handling cache subscription message")
+            except asyncio.CancelledError:
+                raise
+            except (CacheError, OSError, asyncio.IncompleteReadError) as e:
+                LOGGER.warning("Cache subscription to %s interrupted: %s", channel, e)
+            finally:
+                if conn:
+                    conn.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5.0)
+
+    def _create_key_lock(self, key: Text) -> CacheKeyLock:
+        """Create a new lock instance for a given cache key."""
+        return RedisCacheKeyLock(self, key)
+
+    def get_stats(self) -> dict:
+        """Get the current cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "pool_active": self.pool.active,
+            "pool_idle": self.pool.idle,
+            "pool_opened": self.pool.total_opened,
+        }
+
+    def close(self):
+        """Close all pooled connections and subscriptions."""
+        for task in self._subscriptions:
+            task.cancel()
+        self._subscriptions = []
+        self.pool.close()
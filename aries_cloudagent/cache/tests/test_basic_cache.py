@@ -66,10 +66,56 @@ class TestBasicCache:
             item = await cache.get(key)
             assert item is None
 
+    @pytest.mark.asyncio
+    async def test_set_expires_replaced(self, cache):
+        await cache.set("key", "value", 0.05)
+        await cache.set("key", "other")
+        await sleep(0.05)
+        await cache.set("key2", "value")
+
+        assert await cache.get("key") == "other"
+        assert cache.expirations == 0
+
+    @pytest.mark.asyncio
+    async def test_expiry_heap_compacted(self, cache):
+        for i in range(200):
+            await cache.set("key", i, 60)
+        assert len(cache._expiry_heap) <= 2 * len(cache._cache) + 64
+
+    @pytest.mark.asyncio
+    async def test_max_size_evicts_lru(self):
+        cache = BasicCache(max_size=2)
+        await cache.set("key1", "value1")
+        await cache.set("key2", "value2")
+        assert await cache.get("key1") == "value1"
+        await cache.set("key3", "value3")
+
+        assert await cache.get("key2") is None
+        assert await cache.get("key1") == "value1"
+        assert await cache.get("key3") == "value3"
+        assert cache.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_stats(self, cache):
+        await cache.get("valid key")
+        await cache.get("doesn't exist")
+        await cache.set("key", "value", 0.01)
+        await sleep(0.01)
+        await cache.get("key")
+
+        stats = cache.get_stats()
+        assert stats["size"] == 1
+        assert stats["max_size"] is None
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["evictions"] == 0
+        assert stats["expirations"] == 1
+
     @pytest.mark.asyncio
     async def test_flush(self, cache):
         await cache.flush()
         assert cache._cache == {}
+        assert cache._expiry_heap == []
 
     @pytest.mark.asyncio
     async def test_clear(self, cache):
@@ -0,0 +1,46 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ...config.settings import Settings
+from ..basic import BasicCache
+from ..redis import RedisCache
+from ..tiered import TieredCache
+from .. import provider as test_module
+
+
+class TestProvider(AsyncTestCase):
+    async def test_provide_basic(self):
+        provider = test_module.CacheProvider()
+        cache = await provider.provide(Settings({"cache.max_size": 10}), None)
+        assert isinstance(cache, BasicCache)
+        assert cache.max_size == 10
+
+    async def test_provide_redis(self):
+        provider = test_module.CacheProvider()
+        cache = await provider.provide(
+            Settings(
+                {
+                    "cache.type": "redis",
+                    "cache.url": "redis://cache-host:6380/2",
+                    "cache.pool_size": 4,
+                }
+            ),
+            None,
+        )
+        assert isinstance(cache, RedisCache)
+        assert cache.pool.host == "cache-host"
+        assert cache.pool.port == 6380
+        assert cache.pool.db == 2
+        assert cache.pool.max_size == 4
+
+    async def test_provide_tiered(self):
+        provider = test_module.CacheProvider()
+        cache = await provider.provide(
+            Settings(
+                {"cache.type": "redis", "cache.l1_max_size": 50, "cache.l1_ttl": 5}
+            ),
+            None,
+        )
+        assert isinstance(cache, TieredCache)
+        assert isinstance(cache.l2, RedisCache)
+        assert cache.l1.max_size == 50
+        assert cache.l1_ttl == 5
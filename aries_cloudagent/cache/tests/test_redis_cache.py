@@ -0,0 +1,224 @@
+import asyncio
+import fnmatch
+import time
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..base import CacheError
+from ..redis import (
+    RELEASE_LOCK_SCRIPT,
+    RedisCache,
+    RedisConnection,
+    RedisConnectionPool,
+)
+
+
+class FakeRedisServer:
+    """In-process stand-in for a Redis server, speaking RESP."""
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+        self.subscribers = {}
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for subs in self.subscribers.values():
+            for writer in subs:
+                writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.port}"
+
+    def lookup(self, key):
+        entry = self.data.get(key)
+        if entry and entry[1] and entry[1] <= time.time():
+            del self.data[key]
+            entry = None
+        return entry and entry[0]
+
+    async def read_command(self, reader):
+        line = await reader.readuntil(b"\r\n")
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    @staticmethod
+    def encode(value):
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, str):
+            return b"+%s\r\n" % value.encode()
+        if isinstance(value, Exception):
+            return b"-ERR %s\r\n" % str(value).encode()
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(
+                FakeRedisServer.encode(v) for v in value
+            )
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def run(self, writer, cmd, *args):
+        self.commands.append(cmd)
+        if cmd == b"SUBSCRIBE":
+            self.subscribers.setdefault(args[0], []).append(writer)
+            return [b"subscribe", args[0], 1]
+        if cmd == b"PUBLISH":
+            subs = [w for w in self.subscribers.get(args[0], []) if not w.is_closing()]
+            for sub in subs:
+                sub.write(self.encode([b"message", args[0], args[1]]))
+            return len(subs)
+        if cmd == b"GET":
+            return self.lookup(args[0])
+        if cmd == b"MGET":
+            return [self.lookup(key) for key in args]
+        if cmd == b"SET":
+            key, value, opts = args[0], args[1], [a.upper() for a in args[2:]]
+            expires = None
+            if b"PX" in opts:
+                expires = time.time() + int(opts[opts.index(b"PX") + 1]) / 1000
+            if b"NX" in opts and self.lookup(key) is not None:
+                return None
+            self.data[key] = (value, expires)
+            return "OK"
+        if cmd == b"DEL":
+            return sum(1 for key in args if self.data.pop(key, None))
+        if cmd == b"EVAL":
+            if args[0].decode() != RELEASE_LOCK_SCRIPT:
+                return ValueError("unknown script")
+            key, token = args[2], args[3]
+            if self.lookup(key) != token:
+                return None
+            del self.data[key]
+            return 1
+        if cmd == b"SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode()
+            keys = [k for k in self.data if fnmatch.fnmatch(k.decode(), pattern)]
+            return [b"0", keys]
+        return ValueError("unknown command")
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                cmd = await self.read_command(reader)
+                writer.write(self.encode(self.run(writer, cmd[0].upper(), *cmd[1:])))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+
+class TestRedisCache(AsyncTestCase):
+    async def setUp(self):
+        self.server = FakeRedisServer()
+        await self.server.start()
+        self.cache = RedisCache(self.server.url, pool_size=2)
+
+    async def tearDown(self):
+        self.cache.close()
+        await self.server.stop()
+
+    async def test_get_set(self):
+        assert await self.cache.get("key") is None
+        await self.cache.set("key", {"dictkey": "dval"})
+        assert await self.cache.get("key") == {"dictkey": "dval"}
+        assert b"acapy::key" in self.server.data
+
+        stats = self.cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["pool_idle"] == 1
+        assert stats["pool_active"] == 0
+
+    async def test_set_expires(self):
+        await self.cache.set("key", "value", 0.05)
+        assert await self.cache.get("key") == "value"
+        await asyncio.sleep(0.05)
+        assert await self.cache.get("key") is None
+
+    async def test_set_multi_pipelined(self):
+        keys = [f"key{i}" for i in range(4)]
+        await self.cache.set(keys, "value")
+        assert await self.cache.get_many(keys + ["missing"]) == ["value"] * 4 + [None]
+        await self.cache.set_many({"a": 1, "b": 2}, 10)
+        assert await self.cache.get_many(["a", "b"]) == [1, 2]
+        assert self.server.commands.count(b"MGET") == 2
+        assert self.cache.pool.total_opened == 1
+
+    async def test_clear_flush(self):
+        await self.cache.set(["key1", "key2"], "value")
+        self.server.data[b"other::key"] = (b"1", None)
+        await self.cache.clear("key1")
+        assert await self.cache.get("key1") is None
+        await self.cache.flush()
+        assert await self.cache.get("key2") is None
+        assert list(self.server.data) == [b"other::key"]
+
+    async def test_publish_subscribe(self):
+        received = []
+        assert await self.cache.subscribe("channel", received.append)
+        while not self.server.subscribers:
+            await asyncio.sleep(0.01)
+        await self.cache.publish("channel", "message")
+        while len(received) < 2:
+            await asyncio.sleep(0.01)
+        assert received == [None, "message"]
+
+    async def test_error_reply(self):
+        conn = await RedisConnection.open("127.0.0.1", self.server.port)
+        with self.assertRaises(CacheError):
+            await conn.execute(("UNKNOWN",))
+        conn.close()
+
+    async def test_bad_url(self):
+        with self.assertRaises(CacheError):
+            RedisConnectionPool("http://localhost")
+
+    async def test_connect_error(self):
+        await self.server.stop()
+        with self.assertRaises(CacheError):
+            await self.cache.get("key")
+        assert self.cache.pool.active == 0
+
+    async def test_shared_lock(self):
+        other = RedisCache(self.server.url)
+        calls = []
+
+        async def generate(cache, delay):
+            async with cache.acquire("key") as entry:
+                if not entry.result:
+                    calls.append(cache)
+                    await asyncio.sleep(delay)
+                    await entry.set_result("value", 60)
+                return entry.result
+
+        results = await asyncio.gather(
+            generate(self.cache, 0.05), generate(other, 0.05)
+        )
+        other.close()
+        assert results == ["value", "value"]
+        assert len(calls) == 1
+        assert not [k for k in self.server.data if b"lock::" in k]
+
+    async def test_shared_lock_timeout(self):
+        self.cache.lock_timeout = 0.05
+        self.server.data[b"acapy::lock::key"] = (b"token", None)
+        async with self.cache.acquire("key") as entry:
+            assert not entry.done
+            assert entry._lock_token is None
+        self.server.commands.clear()
+        await self.cache.release_shared_lock("key", "other")
+        # released with a single compare-and-delete
+        assert self.server.commands == [b"EVAL"]
+        assert not await self.cache.acquire_shared_lock("key", "token2")
+        await self.cache.release_shared_lock("key", "token")
+        assert await self.cache.acquire_shared_lock("key", "token2")
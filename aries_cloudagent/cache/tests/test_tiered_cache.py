@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..basic import BasicCache
+from ..redis import RedisCache
+from ..tiered import TieredCache
+
+from .test_redis_cache import FakeRedisServer
+
+
+class TestTieredCache(AsyncTestCase):
+    async def setUp(self):
+        self.server = FakeRedisServer()
+        await self.server.start()
+        self.caches = [
+            TieredCache(RedisCache(self.server.url), l1_max_size=10) for _ in range(2)
+        ]
+        for cache in self.caches:
+            await cache._subscribe()
+        await self.wait_subscribed()
+
+    async def tearDown(self):
+        for cache in self.caches:
+            cache.close()
+        await self.server.stop()
+
+    async def wait_subscribed(self):
+        key = b"acapy::" + TieredCache.INVALIDATION_CHANNEL.encode()
+        while len(self.server.subscribers.get(key, [])) < len(self.caches):
+            await asyncio.sleep(0.01)
+
+    async def wait_received(self, cache, count):
+        while cache.invalidations_received < count:
+            await asyncio.sleep(0.01)
+
+    async def test_get_set(self):
+        first, second = self.caches
+        await first.set("key", "value", 30)
+        self.server.commands.clear()
+
+        assert await first.get("key") == "value"
+        assert self.server.commands == []
+
+        assert await second.get("key") == "value"
+        assert await second.get("key") == "value"
+        assert self.server.commands.count(b"GET") == 1
+
+        assert await second.get("missing") is None
+        stats = second.get_stats()
+        assert stats["l1"]["hits"] == 1
+        assert stats["l2"]["hits"] == 1
+
+    async def test_get_many(self):
+        first, second = self.caches
+        await first.set_many({"a": 1, "b": 2})
+        await second.l1.set("a", 1)
+        self.server.commands.clear()
+        assert await second.get_many(["a", "b", "c"]) == [1, 2, None]
+        assert self.server.commands == [b"MGET"]
+        assert await second.l1.get("b") == 2
+
+    async def test_invalidation(self):
+        first, second = self.caches
+        await first.set("key", "value")
+        assert await second.get("key") == "value"
+
+        await first.set("key", "updated")
+        await self.wait_received(second, 1)
+        assert await second.get("key") == "updated"
+
+        await first.clear("key")
+        await self.wait_received(second, 2)
+        assert await second.get("key") is None
+        assert first.invalidations_received == 0
+
+        await second.set("key2", "value")
+        assert await second.l1.get("key2") == "value"
+        await first.flush()
+        await self.wait_received(second, 4)
+        assert await second.l1.get("key2") is None
+
+    async def test_invalidation_during_read(self):
+        cache = TieredCache(BasicCache())
+        await cache.l2.set(["a", "b"], "old")
+        l2_get, l2_get_many = cache.l2.get, cache.l2.get_many
+
+        async def get(key):
+            value = await l2_get(key)
+            # the value changes on another instance while it is being read
+            cache._handle_invalidation(json.dumps({"source": "other", "keys": [key]}))
+            return value
+
+        async def get_many(keys):
+            values = await l2_get_many(keys)
+            cache._handle_invalidation(json.dumps({"source": "other", "keys": ["a"]}))
+            return values
+
+        cache.l2.get, cache.l2.get_many = get, get_many
+        assert await cache.get("a") == "old"
+        assert await cache.l1.get("a") is None
+
+        cache.l2.get = l2_get
+        assert await cache.get_many(["a", "b"]) == ["old", "old"]
+        assert await cache.l1.get("a") is None
+        assert await cache.l1.get("b") == "old"
+        assert cache._reading == {}
+
+        assert await cache.get("a") == "old"
+        assert await cache.l1.get("a") == "old"
+
+    async def test_malformed_invalidation(self):
+        cache = self.caches[0]
+        await cache.l1.set("key", "value")
+        cache._handle_invalidation("{")
+        cache._handle_invalidation(json.dumps({"source": "other", "keys": ["key"]}))
+        assert await cache.l1.get("key") is None
+        await cache.l1.set("key", "value")
+        cache._handle_invalidation(None)
+        assert await cache.l1.get("key") is None
+
+    async def test_basic_l2_lock(self):
+        cache = TieredCache(BasicCache())
+        async with cache.acquire("key") as entry:
+            await entry.set_result("value")
+        assert await cache.l2.get("key") == "value"
+        assert await cache.l1.get("key") == "value"
+
+    async def test_shared_lock(self):
+        first, second = self.caches
+        calls = []
+
+        async def generate(cache):
+            async with cache.acquire("key") as entry:
+                if not entry.result:
+                    calls.append(cache)
+                    await asyncio.sleep(0.05)
+                    await entry.set_result("value", 60)
+                return entry.result
+
+        assert await asyncio.gather(generate(first), generate(second)) == [
+            "value",
+            "value",
+        ]
+        assert len(calls) == 1
@@ -0,0 +1,264 @@
+"""Two-tier cache with a local in-memory layer in front of a shared cache."""
+
+import json
+import logging
+from typing import Any, Mapping, Sequence, Text, Union
+from uuid import uuid4
+
+from .base import BaseCache, CacheKeyLock
+from .basic import BasicCache
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TieredCache(BaseCache):
+    """
+    Cache serving hot keys from an in-process L1 cache before a shared L2 cache.
+
+    Updates and removals are published through the L2 cache so that the L1 caches
+    of other agent instances drop their stale entries. Each key being read from
+    the L2 cache has a generation which invalidations increase, so that a value
+    read before an invalidation is not written to the L1 cache after it.
+    """
+
+    INVALIDATION_CHANNEL = "cache-invalidate"
+
+    def __init__(self, l2: BaseCache, l1_max_size: int = 10000, l1_ttl: int = 60):
+        """
+        Initialize a `TieredCache` instance.
+
+        Args:
+            l2: the shared cache instance
+            l1_max_size: the maximum number of entries held in the local cache
+            l1_ttl: the maximum number of seconds to hold an entry locally,
+                bounding staleness if an invalidation message is lost
+
+        """
+        super().__init__()
+        self.l1 = BasicCache(max_size=l1_max_size)
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.instance_id = uuid4().hex
+        self.invalidations_sent = 0
+        self.invalidations_received = 0
+        self._subscribed = False
+        # key -> [generation, number of L2 reads in progress]
+        self._reading = {}
+        self._flushes = 0
+
+    def _l1_ttl(self, ttl: Union[int, float] = None):
+        return min(ttl, self.l1_ttl) if ttl else self.l1_ttl
+
+    def _begin_read(self, keys: Sequence[Text]) -> tuple:
+        """Record the generations of keys before they are read from the L2 cache."""
+        for key in keys:
+            reading = self._reading.get(key)
+            if reading:
+                reading[1] += 1
+            else:
+                self._reading[key] = [0, 1]
+        return self._flushes, [self._reading[key][0] for key in keys]
+
+    def _end_read(self, keys: Sequence[Text], started: tuple) -> Sequence[bool]:
+        """Check which keys were not invalidated while read from the L2 cache."""
+        flushes, generations = started
+        current = []
+        for key, generation in zip(keys, generations):
+            reading = self._reading[key]
+            current.append(flushes == self._flushes and reading[0] == generation)
+            reading[1] -= 1
+            if not reading[1]:
+                del self._reading[key]
+        return current
+
+    def _bump(self, keys: Sequence[Text] = None):
+        """Invalidate the L2 reads in progress for some keys, or for all keys."""
+        if keys is None:
+            self._flushes += 1
+            return
+        for key in keys:
+            reading = self._reading.get(key)
+            if reading:
+                reading[0] += 1
+
+    async def _subscribe(self):
+        """Subscribe to invalidation messages on first use."""
+        if not self._subscribed:
+            self._subscribed = True
+            await self.l2.subscribe(
+                self.INVALIDATION_CHANNEL, self._handle_invalidation
+            )
+
+    def _handle_invalidation(self, message: Text):
+        """Drop local entries invalidated by another instance."""
+        if message is None:
+            # subscription (re)established, messages may have been missed
+            self.l1._cache.clear()
+            self._bump()
+            return
+        try:
+            parsed = json.loads(message)
+        except ValueError:
+            LOGGER.warning("Ignoring malformed cache invalidation message")
+            return
+        if parsed.get("source") == self.instance_id:
+            return
+        self.invalidations_received += 1
+        if parsed.get("flush"):
+            self.l1._cache.clear()
+            self._bump()
+        keys = parsed.get("keys") or ()
+        for key in keys:
+            self.l1._cache.pop(key, None)
+        self._bump(keys)
+
+    async def _invalidate(self, keys: Sequence[Text] = None, flush: bool = False):
+        """Publish an invalidation message to other instances."""
+        message = {"source": self.instance_id}
+        if flush:
+            message["flush"] = True
+        else:
+            message["keys"] = list(keys)
+        self.invalidations_sent += 1
+        await self.l2.publish(self.INVALIDATION_CHANNEL, json.dumps(message))
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        await self._subscribe()
+        value = await self.l1.get(key)
+        if value is None:
+            started = self._begin_read([key])
+            try:
+                value = await self.l2.get(key)
+            finally:
+                (current,) = self._end_read([key], started)
+            if value is not None and current:
+                await self.l1.set(key, value, self.l1_ttl)
+        return value
+
+    async def get_many(self, keys: Sequence[Text]) -> Sequence[Any]:
+        """
+        Get multiple items from the cache.
+
+        Args:
+            keys: the keys to retrieve items for
+
+        Returns:
+            A list of the records found, with `None` for missing keys
+
+        """
+        await self._subscribe()
+        values = [await self.l1.get(key) for key in keys]
+        missing = [idx for idx, value in enumerate(values) if value is None]
+        if missing:
+            missing_keys = [keys[idx] for idx in missing]
+            started = self._begin_read(missing_keys)
+            try:
+                found = await self.l2.get_many(missing_keys)
+            finally:
+                current = self._end_read(missing_keys, started)
+            for idx, value, fill in zip(missing, found, current):
+                if value is not None:
+                    values[idx] = value
+                    if fill:
+                        await self.l1.set(keys[idx], value, self.l1_ttl)
+        return values
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        await self._subscribe()
+        keys = [keys] if isinstance(keys, Text) else list(keys)
+        await self.l2.set(keys, value, ttl)
+        # reads which started before the update may return the old value
+        self._bump(keys)
+        await self.l1.set(keys, value, self._l1_ttl(ttl))
+        await self._invalidate(keys)
+
+    async def set_many(self, items: Mapping[Text, Any], ttl: int = None):
+        """
+        Add multiple items to the cache with an optional ttl.
+
+        Args:
+            items: a mapping of keys to the values to store
+            ttl: number of seconds that the records should persist
+
+        """
+        if items:
+            await self._subscribe()
+            await self.l2.set_many(items, ttl)
+            self._bump(items)
+            await self.l1.set_many(items, self._l1_ttl(ttl))
+            await self._invalidate(list(items))
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        await self._subscribe()
+        await self.l1.clear(key)
+        await self.l2.clear(key)
+        self._bump([key])
+        await self._invalidate([key])
+
+    async def flush(self):
+        """Remove all items from the cache."""
+        await self.l1.flush()
+        await self.l2.flush()
+        self._bump()
+        await self._invalidate(flush=True)
+
+    @property
+    def lock_timeout(self) -> float:
+        """Accessor for the shared lock timeout of the L2 cache."""
+        return self.l2.lock_timeout
+
+    async def acquire_shared_lock(self, key: Text, token: str) -> bool:
+        """Attempt to claim the shared lock for a cache key."""
+        return await self.l2.acquire_shared_lock(key, token)
+
+    async def release_shared_lock(self, key: Text, token: str):
+        """Release the shared lock for a cache key."""
+        await self.l2.release_shared_lock(key, token)
+
+    def _create_key_lock(self, key: Text) -> CacheKeyLock:
+        """Create a new lock instance, using the lock type of the L2 cache."""
+        lock = self.l2._create_key_lock(key)
+        lock.cache = self
+        return lock
+
+    def get_stats(self) -> dict:
+        """Get the current cache statistics."""
+        return {
+            "l1": self.l1.get_stats(),
+            "l2": self.l2.get_stats(),
+            "invalidations_sent": self.invalidations_sent,
+            "invalidations_received": self.invalidations_received,
+        }
+
+    def close(self):
+        """Close the L2 cache."""
+        if hasattr(self.l2, "close"):
+            self.l2.close()
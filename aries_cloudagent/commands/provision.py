@@ -8,6 +8,7 @@ from ..config import argparse as arg
 from ..config.base import BaseError
 from ..config.default_context import DefaultContextBuilder
 from ..config.ledger import ledger_config
+from ..config.records import records_config
 from ..config.util import common_config
 from ..config.wallet import wallet_config
 
@@ -30,6 +31,7 @@ async def provision(settings: dict):
 
     try:
         public_did = await wallet_config(context, True)
+        await records_config(context, True)
 
         if await ledger_config(context, public_did, True):
             print("Ledger configured")
@@ -166,6 +166,83 @@ class AdminGroup(ArgumentGroup):
         return settings
 
 
+@group(CAT_START)
+class CacheGroup(ArgumentGroup):
+    """Cache settings."""
+
+    GROUP_NAME = "Cache"
+
+    def add_arguments(self, parser: ArgumentParser):
+        """Add cache-specific command line arguments to the parser."""
+        parser.add_argument(
+            "--cache-type",
+            type=str,
+            metavar="<cache-type>",
+            help="Specifies the type of cache to use for connection, credential\
+            offer and ledger lookups. Supported cache types are 'basic' (memory)\
+            and 'redis', which may be shared between multiple agent instances.\
+            Default: basic.",
+        )
+        parser.add_argument(
+            "--cache-url",
+            type=str,
+            metavar="<cache-url>",
+            help="Specifies the URL of the shared cache server, for example\
+            'redis://:password@localhost:6379/0'. Only used by the 'redis'\
+            cache type.",
+        )
+        parser.add_argument(
+            "--cache-pool-size",
+            type=int,
+            metavar="<pool-size>",
+            help="Sets the maximum number of pooled connections to the shared\
+            cache server. Default: 10.",
+        )
+        parser.add_argument(
+            "--cache-l1-size",
+            type=int,
+            metavar="<max-size>",
+            help="Enables a local in-memory cache of up to <max-size> entries in\
+            front of the shared cache, so hot keys avoid a network round trip.\
+            Entries updated by other agent instances are invalidated through\
+            the shared cache. Only used with a shared cache type.",
+        )
+        parser.add_argument(
+            "--cache-l1-ttl",
+            type=int,
+            metavar="<seconds>",
+            help="Sets the maximum time in seconds that entries are held in the\
+            local cache in front of the shared cache. Default: 60.",
+        )
+        parser.add_argument(
+            "--cache-max-size",
+            type=int,
+            metavar="<max-size>",
+            help="Sets the maximum number of entries held in the in-memory cache.\
+            The least recently used entries are evicted once this size is\
+            exceeded. Default: unbounded.",
+        )
+
+    def get_settings(self, args: Namespace) -> dict:
+        """Extract cache settings."""
+        settings = {}
+        if args.cache_type:
+            settings["cache.type"] = args.cache_type
+        if args.cache_url:
+            settings["cache.url"] = args.cache_url
+        if args.cache_pool_size:
+            settings["cache.pool_size"] = args.cache_pool_size
+        if args.cache_l1_size:
+            settings["cache.l1_max_size"] = args.cache_l1_size
+        if args.cache_l1_ttl:
+            settings["cache.l1_ttl"] = args.cache_l1_ttl
+        if args.cache_max_size is not None:
+            if args.cache_max_size < 1:
+                raise ArgsParseError("Parameter --cache-max-size must be positive")
+            settings["cache.max_size"] = args.cache_max_size
+        return settings
+
+
 @group(CAT_START)
 class DebugGroup(ArgumentGroup):
     """Debug settings."""
@@ -376,7 +453,8 @@ class GeneralGroup(ArgumentGroup):
             metavar="<storage-type>",
             help="Specifies the type of storage provider to use for the internal\
             storage engine. This storage interface is used to store internal state.\
-            Supported internal storage types are 'basic' (memory) and 'indy'.",
+            Supported internal storage types are 'basic' (memory), 'indy',\
+            and 'sqlite'.",
         )
         parser.add_argument(
             "-e",
@@ -693,6 +771,48 @@ class TransportGroup(ArgumentGroup):
             metavar="<message-size>",
             help="Set the maximum size in bytes for inbound agent messages.",
         )
+        parser.add_argument(
+            "--dispatch-lanes",
+            type=int,
+            metavar="<count>",
+            help="Set the number of lanes used to handle inbound messages.\
+            Messages from the same connection, or else on the same thread,\
+            share a lane and are handled in order, while up to this many\
+            connections or threads are handled in parallel. Use 0 to handle\
+            every message as soon as possible. Default: 64.",
+        )
+        parser.add_argument(
+            "--dispatch-lane-depth",
+            type=int,
+            metavar="<count>",
+            help="Set the maximum number of inbound messages waiting in a\
+            single dispatch lane, that is from one connection or thread.\
+            Further messages for the lane are rejected. Use 0 for no limit.\
+            Default: 0.",
+        )
+        parser.add_argument(
+            "--inbound-shed-pending",
+            type=int,
+            metavar="<count>",
+            help="Set the number of inbound messages waiting to be dispatched\
+            at which new inbound messages are shed: the HTTP transport\
+            responds with 503 and the websocket transport stops reading until\
+            the load falls. Use 0 for no limit. Default: 0.",
+        )
+        parser.add_argument(
+            "--inbound-shed-loop-lag",
+            type=float,
+            metavar="<seconds>",
+            help="Set the event loop lag at which new inbound messages are\
+            shed. Use 0 for no limit. Default: 0.",
+        )
+        parser.add_argument(
+            "--inbound-retry-after",
+            type=int,
+            metavar="<seconds>",
+            help="Set the number of seconds after which clients are asked to\
+            retry rejected inbound HTTP requests. Default: 5.",
+        )
         parser.add_argument(
             "--enable-undelivered-queue",
             action="store_true",
@@ -700,6 +820,193 @@ class TransportGroup(ArgumentGroup):
             to hold messages for delivery to agents without an endpoint. This\
             option will require additional memory to store messages in the queue.",
         )
+        parser.add_argument(
+            "--max-message-retries",
+            type=int,
+            metavar="<count>",
+            help="Set the number of times delivery of an outbound message is\
+            retried after a failed attempt. Default: 4.",
+        )
+        parser.add_argument(
+            "--retry-backoff",
+            type=float,
+            metavar="<seconds>",
+            help="Set the delay before retrying delivery of an outbound message.\
+            The delay doubles after each failed attempt. Default: 10.",
+        )
+        parser.add_argument(
+            "--retry-backoff-max",
+            type=float,
+            metavar="<seconds>",
+            help="Set the maximum delay before retrying delivery of an outbound\
+            message. Default: 300.",
+        )
+        parser.add_argument(
+            "--retry-jitter",
+            type=float,
+            metavar="<fraction>",
+            help="Set the fraction by which retry delays are randomly varied,\
+            to spread out retries to the same endpoint. Default: 0.2.",
+        )
+        parser.add_argument(
+            "--max-outbound-deliveries",
+            type=int,
+            metavar="<count>",
+            help="Set the maximum number of outbound messages and webhooks\
+            being delivered at once. Use 0 for no limit. Default: 200.",
+        )
+        parser.add_argument(
+            "--max-endpoint-deliveries",
+            type=int,
+            metavar="<count>",
+            help="Set the maximum number of messages being delivered at once\
+            to a single endpoint, so that busy endpoints cannot hold up\
+            delivery to others. Use 0 for no limit, leaving only the\
+            per-host limit of the HTTP connection pool. Default: 0.",
+        )
+        parser.add_argument(
+            "--webhook-weight",
+            type=int,
+            metavar="<weight>",
+            help="Set the share of deliveries given to webhooks relative to\
+            agent messages when both are waiting. For example, a weight of 3\
+            delivers three webhooks for each agent message. Default: 1.",
+        )
+        parser.add_argument(
+            "--outbound-batch-size",
+            type=int,
+            metavar="<count>",
+            help="Set the maximum number of messages to the same endpoint which\
+            are sent together as one batch, for transports which support it\
+            (currently websockets, as a burst of frames over one connection).\
+            Use 1 to deliver each message separately. Default: 1.",
+        )
+        parser.add_argument(
+            "--outbound-batch-linger",
+            type=float,
+            metavar="<seconds>",
+            help="Set the time to wait for more messages to the same endpoint\
+            before an incomplete batch is sent. Default: 0.005.",
+        )
+        parser.add_argument(
+            "--circuit-breaker-failures",
+            type=int,
+            metavar="<count>",
+            help="Set the number of consecutive delivery failures after which\
+            messages to an endpoint are held back, and the endpoint is only\
+            probed periodically until it recovers. Endpoints with the same\
+            scheme, host and port are tracked together. Use 0 to disable.\
+            Default: 5.",
+        )
+        parser.add_argument(
+            "--circuit-breaker-reset",
+            type=float,
+            metavar="<seconds>",
+            help="Set the number of seconds before an unreachable endpoint is\
+            first probed. The interval doubles after each failed probe.\
+            Default: 30.",
+        )
+        parser.add_argument(
+            "--circuit-breaker-reset-max",
+            type=float,
+            metavar="<seconds>",
+            help="Set the maximum number of seconds between probes of an\
+            unreachable endpoint. Default: 300.",
+        )
+        parser.add_argument(
+            "--http-pool-size",
+            type=int,
+            metavar="<count>",
+            help="Set the maximum number of open connections used by the\
+            outbound HTTP transport. Use 0 for no limit. Default: 200.",
+        )
+        parser.add_argument(
+            "--http-pool-size-per-host",
+            type=int,
+            metavar="<count>",
+            help="Set the maximum number of open outbound HTTP connections to\
+            a single host. Use 0 for no limit. Default: 50.",
+        )
+        parser.add_argument(
+            "--http-dns-ttl",
+            type=float,
+            metavar="<seconds>",
+            help="Set the number of seconds for which resolved host names are\
+            cached by the outbound HTTP transport. Use 0 to disable the cache.\
+            Default: 10.",
+        )
+        parser.add_argument(
+            "--http-keepalive",
+            type=float,
+            metavar="<seconds>",
+            help="Set the number of seconds for which idle outbound HTTP\
+            connections are kept open for reuse. Use 0 to close connections\
+            after each request. Default: 15.",
+        )
+        parser.add_argument(
+            "--http-connect-timeout",
+            type=float,
+            metavar="<seconds>",
+            help="Set the number of seconds to wait for an outbound HTTP\
+            connection to be established. Default: 10.",
+        )
+        parser.add_argument(
+            "--http-read-timeout",
+            type=float,
+            metavar="<seconds>",
+            help="Set the number of seconds to wait for data from the peer\
+            when sending an outbound HTTP message. Default: 30.",
+        )
+        parser.add_argument(
+            "--http-total-timeout",
+            type=float,
+            metavar="<seconds>",
+            help="Set the maximum number of seconds an outbound HTTP message\
+            may take to send, including connecting and reading the response.\
+            Default: 300.",
+        )
+        parser.add_argument(
+            "--ws-pool-size-per-host",
+            type=int,
+            metavar="<count>",
+            help="Set the maximum number of outbound websocket connections kept\
+            open to a single endpoint. Messages share the open connections.\
+            Default: 2.",
+        )
+        parser.add_argument(
+            "--ws-heartbeat",
+            type=float,
+            metavar="<seconds>",
+            help="Set the interval between pings on outbound websocket\
+            connections, which are closed when a ping is not answered.\
+            Use 0 to disable. Default: 30.",
+        )
+        parser.add_argument(
+            "--ws-idle-timeout",
+            type=float,
+            metavar="<seconds>",
+            help="Set the number of seconds after which an unused outbound\
+            websocket connection is closed. Use 0 to keep connections open\
+            until the peer closes them. Default: 60.",
+        )
+        parser.add_argument(
+            "--outbound-queue",
+            type=str,
+            metavar="<path>",
+            help="Keep queued outbound messages and webhooks in a durable\
+            journal at the given path, so that they are delivered after\
+            the agent restarts. Messages are journaled once encoded, but\
+            webhook payloads are stored as sent, so the journal file is\
+            readable only by its owner. Messages may be delivered more\
+            than once.",
+        )
+        parser.add_argument(
+            "--outbound-queue-type",
+            type=str,
+            metavar="<queue-type>",
+            help="Specifies the type of outbound queue journal to use, or the\
+            path of a custom journal class. Default: 'sqlite'.",
+        )
 
     def get_settings(self, args: Namespace):
         """Extract transport settings."""
@@ -712,6 +1019,133 @@ class TransportGroup(ArgumentGroup):
             settings["default_label"] = args.label
         if args.max_message_size:
             settings["transport.max_message_size"] = args.max_message_size
+        for name in ("dispatch_lanes", "dispatch_lane_depth"):
+            value = getattr(args, name)
+            if value is not None:
+                if value < 0:
+                    raise ArgsParseError(
+                        f"Parameter --{name.replace('_', '-')} must be >= 0"
+                    )
+                settings[f"transport.{name}"] = value
+        if args.inbound_shed_pending is not None:
+            if args.inbound_shed_pending < 0:
+                raise ArgsParseError("Parameter --inbound-shed-pending must be >= 0")
+            settings["transport.shed_pending"] = args.inbound_shed_pending
+        if args.inbound_shed_loop_lag is not None:
+            if args.inbound_shed_loop_lag < 0:
+                raise ArgsParseError("Parameter --inbound-shed-loop-lag must be >= 0")
+            settings["transport.shed_loop_lag"] = args.inbound_shed_loop_lag
+        if args.inbound_retry_after is not None:
+            if args.inbound_retry_after < 0:
+                raise ArgsParseError("Parameter --inbound-retry-after must be >= 0")
+            settings["transport.shed_retry_after"] = args.inbound_retry_after
+        if args.max_message_retries is not None:
+            if args.max_message_retries < 0:
+                raise ArgsParseError("Parameter --max-message-retries must be >= 0")
+            settings["transport.max_retries"] = args.max_message_retries
+        if args.retry_backoff is not None:
+            if args.retry_backoff <= 0:
+                raise ArgsParseError("Parameter --retry-backoff must be positive")
+            settings["transport.retry_backoff"] = args.retry_backoff
+        if args.retry_backoff_max is not None:
+            if args.retry_backoff_max <= 0:
+                raise ArgsParseError("Parameter --retry-backoff-max must be positive")
+            settings["transport.retry_backoff_max"] = args.retry_backoff_max
+        if args.retry_jitter is not None:
+            if not 0 <= args.retry_jitter < 1:
+                raise ArgsParseError(
+                    "Parameter --retry-jitter must be between 0 and 1"
+                )
+            settings["transport.retry_jitter"] = args.retry_jitter
+        if args.max_outbound_deliveries is not None:
+            if args.max_outbound_deliveries < 0:
+                raise ArgsParseError(
+                    "Parameter --max-outbound-deliveries must be >= 0"
+                )
+            settings["transport.max_deliveries"] = args.max_outbound_deliveries
+        if args.max_endpoint_deliveries is not None:
+            if args.max_endpoint_deliveries < 0:
+                raise ArgsParseError(
+                    "Parameter --max-endpoint-deliveries must be >= 0"
+                )
+            settings["transport.max_endpoint_deliveries"] = args.max_endpoint_deliveries
+        if args.webhook_weight is not None:
+            if args.webhook_weight < 1:
+                raise ArgsParseError("Parameter --webhook-weight must be positive")
+            settings["transport.webhook_weight"] = args.webhook_weight
+        if args.outbound_batch_size is not None:
+            if args.outbound_batch_size < 1:
+                raise ArgsParseError("Parameter --outbound-batch-size must be positive")
+            settings["transport.batch_size"] = args.outbound_batch_size
+        if args.outbound_batch_linger is not None:
+            if args.outbound_batch_linger < 0:
+                raise ArgsParseError("Parameter --outbound-batch-linger must be >= 0")
+            settings["transport.batch_linger"] = args.outbound_batch_linger
+        if args.circuit_breaker_failures is not None:
+            if args.circuit_breaker_failures < 0:
+                raise ArgsParseError(
+                    "Parameter --circuit-breaker-failures must be >= 0"
+                )
+            settings["transport.circuit_failures"] = args.circuit_breaker_failures
+        if args.circuit_breaker_reset is not None:
+            if args.circuit_breaker_reset <= 0:
+                raise ArgsParseError(
+                    "Parameter --circuit-breaker-reset must be positive"
+                )
+            settings["transport.circuit_reset"] = args.circuit_breaker_reset
+        if args.circuit_breaker_reset_max is not None:
+            if args.circuit_breaker_reset_max <= 0:
+                raise ArgsParseError(
+                    "Parameter --circuit-breaker-reset-max must be positive"
+                )
+            settings["transport.circuit_reset_max"] = args.circuit_breaker_reset_max
+        for name, key in (
+            ("http_pool_size", "transport.http_pool_size"),
+            ("http_pool_size_per_host", "transport.http_pool_size_host"),
+            ("http_dns_ttl", "transport.http_dns_ttl"),
+            ("http_keepalive", "transport.http_keepalive"),
+        ):
+            value = getattr(args, name)
+            if value is not None:
+                if value < 0:
+                    raise ArgsParseError(
+                        f"Parameter --{name.replace('_', '-')} must be >= 0"
+                    )
+                settings[key] = value
+        if args.ws_pool_size_per_host is not None:
+            if args.ws_pool_size_per_host < 1:
+                raise ArgsParseError(
+                    "Parameter --ws-pool-size-per-host must be positive"
+                )
+            settings["transport.ws_pool_size_host"] = args.ws_pool_size_per_host
+        for name in ("ws_heartbeat", "ws_idle_timeout"):
+            value = getattr(args, name)
+            if value is not None:
+                if value < 0:
+                    raise ArgsParseError(
+                        f"Parameter --{name.replace('_', '-')} must be >= 0"
+                    )
+                settings[f"transport.{name}"] = value
+        for name in (
+            "http_connect_timeout",
+            "http_read_timeout",
+            "http_total_timeout",
+        ):
+            value = getattr(args, name)
+            if value is not None:
+                if value <= 0:
+                    raise ArgsParseError(
+                        f"Parameter --{name.replace('_', '-')} must be positive"
+                    )
+                settings[f"transport.{name}"] = value
+        if args.outbound_queue:
+            settings["transport.outbound_queue"] = args.outbound_queue
+        if args.outbound_queue_type:
+            if not args.outbound_queue:
+                raise ArgsParseError(
+                    "Parameter --outbound-queue-type requires --outbound-queue"
+                )
+            settings["transport.outbound_queue_type"] = args.outbound_queue_type
 
         return settings
 
@@ -750,7 +1184,8 @@ class WalletGroup(ArgumentGroup):
             type=str,
             metavar="<wallet-type>",
             help="Specifies the type of Indy wallet provider to use.\
-            Supported internal storage types are 'basic' (memory) and 'indy'.",
+            Supported internal storage types are 'basic' (memory), 'indy',\
+            and 'sqlite' (a persistent local database file).",
         )
         parser.add_argument(
             "--wallet-storage-type",
@@ -766,7 +1201,10 @@ class WalletGroup(ArgumentGroup):
             metavar="<storage-config>",
             help="Specifies the storage configuration to use for the wallet.\
             This is required if you are for using 'postgres_storage' wallet\
-            storage type. For example, '{\"url\":\"localhost:5432\"}'.",
+            storage type. For example, '{\"url\":\"localhost:5432\"}'.\
+            The 'sqlite' wallet type accepts the database file path and\
+            connection pool size, for example '{\"path\":\"wallet.db\",\
+            \"pool_size\":4}'.",
         )
         parser.add_argument(
             "--wallet-storage-creds",
@@ -778,6 +1216,23 @@ class WalletGroup(ArgumentGroup):
             \"mysecretpassword\",\"admin_account\":\"postgres\",\"admin_password\":\
             \"mysecretpassword\"}'",
         )
+        parser.add_argument(
+            "--crypto-workers",
+            type=int,
+            metavar="<count>",
+            help="Set the number of workers used to pack and unpack messages\
+            with the 'basic' and 'sqlite' wallet types. By default the\
+            shared thread pool of the event loop is used.",
+        )
+        parser.add_argument(
+            "--crypto-executor",
+            type=str,
+            choices=("thread", "process"),
+            metavar="<executor>",
+            help="Run the --crypto-workers as threads, which share the CPU\
+            time spent in Python code, or as processes, which can use one\
+            core each. Default: 'thread'.",
+        )
         parser.add_argument(
             "--replace-public-did",
             action="store_true",
@@ -803,6 +1258,12 @@ class WalletGroup(ArgumentGroup):
             settings["wallet.storage_config"] = args.wallet_storage_config
         if args.wallet_storage_creds:
             settings["wallet.storage_creds"] = args.wallet_storage_creds
+        if args.crypto_workers is not None:
+            if args.crypto_workers < 1:
+                raise ArgsParseError("Parameter --crypto-workers must be positive")
+            settings["wallet.crypto_workers"] = args.crypto_workers
+        if args.crypto_executor:
+            settings["wallet.crypto_executor"] = args.crypto_executor
         if args.replace_public_did:
             settings["wallet.replace_public_did"] = True
         return settings
@@ -5,7 +5,7 @@ from .injection_context import InjectionContext
 from .provider import CachedProvider, ClassProvider, StatsProvider
 
 from ..cache.base import BaseCache
-from ..cache.basic import BasicCache
+from ..cache.provider import CacheProvider
 from ..core.plugin_registry import PluginRegistry
 from ..core.protocol_registry import ProtocolRegistry
 from ..ledger.base import BaseLedger
@@ -38,8 +38,8 @@ class DefaultContextBuilder(ContextBuilder):
             collector = Collector(log_path=timing_log)
             context.injector.bind_instance(Collector, collector)
 
-        # Shared in-memory cache
-        context.injector.bind_instance(BaseCache, BasicCache())
+        # Shared cache
+        context.injector.bind_provider(BaseCache, CachedProvider(CacheProvider()))
 
         # Global protocol registry
         context.injector.bind_instance(ProtocolRegistry, ProtocolRegistry())
@@ -56,7 +56,8 @@ class DefaultContextBuilder(ContextBuilder):
             BaseStorage,
             CachedProvider(
                 StatsProvider(
-                    StorageProvider(), ("add_record", "get_record", "search_records")
+                    StorageProvider(),
+                    ("add_record", "get_record", "update_record", "search_records"),
                 )
             ),
         )
@@ -0,0 +1,62 @@
+"""Stored record configuration."""
+
+import json
+import logging
+
+from ..connections.models.connection_record import ConnectionRecord
+from ..protocols.issue_credential.v1_0.models.credential_exchange import (
+    V10CredentialExchange,
+)
+from ..protocols.present_proof.v1_0.models.presentation_exchange import (
+    V10PresentationExchange,
+)
+from ..storage.base import BaseStorage
+from ..storage.error import StorageNotFoundError
+from ..storage.record import StorageRecord
+
+from .injection_context import InjectionContext
+
+LOGGER = logging.getLogger(__name__)
+
+RECORD_TAGS_TYPE = "record_tags"
+
+# record classes whose stored tags are migrated when their TAG_NAMES change
+RETAG_RECORD_CLASSES = (
+    ConnectionRecord,
+    V10CredentialExchange,
+    V10PresentationExchange,
+)
+
+
+async def records_config(context: InjectionContext, provision: bool = False):
+    """
+    Re-tag stored records whose class has declared new tags since they were saved.
+
+    The tag names applied to each record type are stored, so the migration runs
+    once per change of `TAG_NAMES` for a wallet.
+    """
+    storage: BaseStorage = await context.inject(BaseStorage)
+    for record_cls in RETAG_RECORD_CLASSES:
+        tag_names = sorted(record_cls.TAG_NAMES)
+        try:
+            marker = await storage.get_record(RECORD_TAGS_TYPE, record_cls.RECORD_TYPE)
+        except StorageNotFoundError:
+            marker = None
+        if marker and json.loads(marker.value) == tag_names:
+            continue
+
+        count = await record_cls.retag_records(context)
+        if count:
+            LOGGER.info(
+                "Updated tags of %d %s records", count, record_cls.RECORD_TYPE
+            )
+            if provision:
+                print(f"Updated tags of {count} {record_cls.RECORD_TYPE} records")
+
+        value = json.dumps(tag_names)
+        if marker:
+            await storage.update_record_value(marker, value)
+        else:
+            await storage.add_record(
+                StorageRecord(RECORD_TAGS_TYPE, value, None, record_cls.RECORD_TYPE)
+            )
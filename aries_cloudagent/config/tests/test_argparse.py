@@ -50,6 +50,162 @@ class TestArgParse(AsyncTestCase):
 
         assert settings.get("transport.inbound_configs") == [["http", "0.0.0.0", "80"]]
         assert settings.get("transport.outbound_configs") == ["http"]
+        assert "transport.max_retries" not in settings
+
+        base_args = ["-it", "http", "0.0.0.0", "80", "-ot", "http"]
+        result = parser.parse_args(
+            base_args
+            + [
+                "--max-message-retries",
+                "2",
+                "--retry-backoff",
+                "0.5",
+                "--retry-backoff-max",
+                "60",
+                "--retry-jitter",
+                "0",
+                "--outbound-queue",
+                "outbound.db",
+                "--circuit-breaker-failures",
+                "0",
+                "--circuit-breaker-reset",
+                "5",
+                "--circuit-breaker-reset-max",
+                "50",
+                "--max-outbound-deliveries",
+                "100",
+                "--max-endpoint-deliveries",
+                "0",
+                "--webhook-weight",
+                "3",
+                "--http-pool-size",
+                "20",
+                "--http-pool-size-per-host",
+                "5",
+                "--http-dns-ttl",
+                "0",
+                "--http-keepalive",
+                "30",
+                "--http-connect-timeout",
+                "2.5",
+                "--http-read-timeout",
+                "60",
+                "--http-total-timeout",
+                "120",
+                "--ws-pool-size-per-host",
+                "4",
+                "--ws-heartbeat",
+                "0",
+                "--ws-idle-timeout",
+                "120",
+                "--outbound-batch-size",
+                "20",
+                "--outbound-batch-linger",
+                "0.01",
+                "--dispatch-lanes",
+                "16",
+                "--dispatch-lane-depth",
+                "100",
+                "--inbound-shed-pending",
+                "500",
+                "--inbound-shed-loop-lag",
+                "0.5",
+                "--inbound-retry-after",
+                "10",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("transport.outbound_queue") == "outbound.db"
+        assert settings.get("transport.circuit_failures") == 0
+        assert settings.get("transport.circuit_reset") == 5
+        assert settings.get("transport.circuit_reset_max") == 50
+        assert settings.get("transport.max_deliveries") == 100
+        assert settings.get("transport.max_endpoint_deliveries") == 0
+        assert settings.get("transport.webhook_weight") == 3
+        assert settings.get("transport.http_pool_size") == 20
+        assert settings.get("transport.http_pool_size_host") == 5
+        assert settings.get("transport.http_dns_ttl") == 0
+        assert settings.get("transport.http_keepalive") == 30
+        assert settings.get("transport.http_connect_timeout") == 2.5
+        assert settings.get("transport.http_read_timeout") == 60
+        assert settings.get("transport.http_total_timeout") == 120
+        assert settings.get("transport.ws_pool_size_host") == 4
+        assert settings.get("transport.ws_heartbeat") == 0
+        assert settings.get("transport.ws_idle_timeout") == 120
+        assert settings.get("transport.batch_size") == 20
+        assert settings.get("transport.batch_linger") == 0.01
+        assert settings.get("transport.dispatch_lanes") == 16
+        assert settings.get("transport.dispatch_lane_depth") == 100
+        assert settings.get("transport.shed_pending") == 500
+        assert settings.get("transport.shed_loop_lag") == 0.5
+        assert settings.get("transport.shed_retry_after") == 10
+        assert settings.get("transport.max_retries") == 2
+        assert settings.get("transport.retry_backoff") == 0.5
+        assert settings.get("transport.retry_backoff_max") == 60
+        assert settings.get("transport.retry_jitter") == 0
+
+        for args in (
+            ["--max-message-retries", "-1"],
+            ["--retry-backoff", "0"],
+            ["--retry-backoff-max", "0"],
+            ["--retry-jitter", "1"],
+            ["--outbound-queue-type", "sqlite"],
+            ["--circuit-breaker-failures", "-1"],
+            ["--circuit-breaker-reset", "0"],
+            ["--circuit-breaker-reset-max", "0"],
+            ["--max-outbound-deliveries", "-1"],
+            ["--max-endpoint-deliveries", "-1"],
+            ["--webhook-weight", "0"],
+            ["--http-pool-size", "-1"],
+            ["--http-keepalive", "-1"],
+            ["--http-read-timeout", "0"],
+            ["--http-total-timeout", "0"],
+            ["--ws-pool-size-per-host", "0"],
+            ["--ws-idle-timeout", "-1"],
+            ["--outbound-batch-size", "0"],
+            ["--outbound-batch-linger", "-1"],
+            ["--dispatch-lanes", "-1"],
+            ["--dispatch-lane-depth", "-1"],
+            ["--inbound-shed-pending", "-1"],
+            ["--inbound-shed-loop-lag", "-1"],
+            ["--inbound-retry-after", "-1"],
+        ):
+            result = parser.parse_args(base_args + args)
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
+
+    async def test_wallet_settings(self):
+        """Test wallet argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.WalletGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            ["--crypto-workers", "4", "--crypto-executor", "process"]
+        )
+        settings = group.get_settings(result)
+        assert settings.get("wallet.crypto_workers") == 4
+        assert settings.get("wallet.crypto_executor") == "process"
+
+        result = parser.parse_args(["--crypto-workers", "0"])
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
+
+    async def test_cache_settings(self):
+        """Test cache argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.CacheGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(["--cache-max-size", "1000"])
+        settings = group.get_settings(result)
+        assert settings.get("cache.max_size") == 1000
+
+        result = parser.parse_args(["--cache-max-size", "0"])
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
 
     def test_bytesize(self):
         bs = ByteSize()
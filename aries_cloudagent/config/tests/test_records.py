@@ -0,0 +1,37 @@
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from ...connections.models.connection_record import ConnectionRecord
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+
+from ..injection_context import InjectionContext
+from .. import records as test_module
+
+
+class TestRecordsConfig(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.storage = BasicStorage()
+        self.context.injector.bind_instance(BaseStorage, self.storage)
+
+    async def test_retag_once(self):
+        record = ConnectionRecord(state=ConnectionRecord.STATE_ACTIVE)
+        await record.save(self.context)
+        await self.storage.update_record_tags(record.storage_record, {})
+
+        await test_module.records_config(self.context)
+        found = await ConnectionRecord.query(
+            self.context, None, {"state": ConnectionRecord.STATE_ACTIVE}
+        )
+        assert found == [record]
+
+        with async_mock.patch.object(
+            ConnectionRecord, "retag_records", async_mock.CoroutineMock()
+        ) as retag:
+            await test_module.records_config(self.context)
+            retag.assert_not_awaited()
+            with async_mock.patch.object(
+                ConnectionRecord, "TAG_NAMES", {"state", "alias"}
+            ):
+                await test_module.records_config(self.context)
+            retag.assert_awaited_once_with(self.context)
@@ -15,8 +15,8 @@ async def wallet_config(context: InjectionContext, provision: bool = False):
     """Initialize the wallet."""
     wallet: BaseWallet = await context.inject(BaseWallet)
     if provision:
-        if wallet.WALLET_TYPE != "indy":
-            raise ConfigError("Cannot provision a non-Indy wallet type")
+        if wallet.WALLET_TYPE not in ("indy", "sqlite"):
+            raise ConfigError("Cannot provision a non-persistent wallet type")
         if wallet.created:
             print("Created new wallet")
         else:
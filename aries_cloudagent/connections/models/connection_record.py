@@ -29,6 +29,9 @@ class ConnectionRecord(BaseRecord):  # lgtm[py/missing-equals]
         "their_did",
         "request_id",
         "invitation_key",
+        "state",
+        "initiator",
+        "their_role",
     }
 
     RECORD_TYPE = "connection"
@@ -13,10 +13,12 @@ import logging
 
 from ..admin.base_server import BaseAdminServer
 from ..admin.server import AdminServer
+from ..cache.base import BaseCache
 from ..config.default_context import ContextBuilder
 from ..config.injection_context import InjectionContext
 from ..config.ledger import ledger_config
 from ..config.logging import LoggingConfigurator
+from ..config.records import records_config
 from ..config.wallet import wallet_config
 from ..messaging.responder import BaseResponder
 from ..protocols.connections.manager import ConnectionManager, ConnectionManagerError
@@ -73,7 +75,10 @@ class Conductor:
 
         # Register all inbound transports
         self.inbound_transport_manager = InboundTransportManager(
-            context, self.inbound_message_router, self.handle_not_returned,
+            context,
+            self.inbound_message_router,
+            self.handle_not_returned,
+            self.dispatcher.pending_count,
         )
         await self.inbound_transport_manager.setup()
 
@@ -140,6 +145,9 @@ class Conductor:
         # Configure the wallet
         public_did = await wallet_config(context)
 
+        # Migrate the tags of stored records
+        await records_config(context)
+
         # Configure the ledger
         await ledger_config(context, public_did)
 
@@ -225,6 +233,12 @@ class Conductor:
             shutdown.run(self.outbound_transport_manager.stop())
         await shutdown.complete(timeout)
 
+        # release shared cache connections and stop its subscriptions
+        if self.context:
+            cache = await self.context.inject(BaseCache, required=False)
+            if cache and hasattr(cache, "close"):
+                cache.close()
+
     def inbound_message_router(
         self, message: InboundMessage, can_respond: bool = False
     ):
@@ -263,20 +277,9 @@ class Conductor:
 
     async def get_stats(self) -> dict:
         """Get the current stats tracked by the conductor."""
-        stats = {
-            "in_sessions": len(self.inbound_transport_manager.sessions),
-            "out_encode": 0,
-            "out_deliver": 0,
-            "task_active": self.dispatcher.task_queue.current_active,
-            "task_done": self.dispatcher.task_queue.total_done,
-            "task_failed": self.dispatcher.task_queue.total_failed,
-            "task_pending": self.dispatcher.task_queue.current_pending,
-        }
-        for m in self.outbound_transport_manager.outbound_buffer:
-            if m.state == m.STATE_ENCODE:
-                stats["out_encode"] += 1
-            if m.state == m.STATE_DELIVER:
-                stats["out_deliver"] += 1
+        stats = self.inbound_transport_manager.get_stats()
+        stats.update(self.dispatcher.get_stats())
+        stats.update(self.outbound_transport_manager.get_stats())
         return stats
 
     async def outbound_message_router(
@@ -25,6 +25,7 @@ from ..protocols.problem_report.message import ProblemReport
 from ..transport.inbound.message import InboundMessage
 from ..transport.outbound.message import OutboundMessage
 from ..utils.stats import Collector
+from ..utils.task_lanes import TaskLanes
 from ..utils.task_queue import CompletedTask, PendingTask, TaskQueue
 
 from ..utils.tracing import trace_event, get_timer
@@ -45,6 +46,7 @@ class Dispatcher:
         self.context = context
         self.collector: Collector = None
         self.task_queue: TaskQueue = None
+        self.task_lanes: TaskLanes = None
 
     async def setup(self):
         """Perform async instance setup."""
@@ -53,6 +55,12 @@ class Dispatcher:
         self.task_queue = TaskQueue(
             max_active=max_active, timed=bool(self.collector), trace_fn=self.log_task
         )
+        settings = self.context.settings
+        self.task_lanes = TaskLanes(
+            self.task_queue,
+            int(settings.get("transport.dispatch_lanes", 64)),
+            int(settings.get("transport.dispatch_lane_depth", 0)),
+        )
 
     def put_task(
         self, coro: Coroutine, complete: Callable = None, ident: str = None
@@ -98,14 +106,45 @@ class Dispatcher:
             send_webhook: Async function to dispatch a webhook
             complete: Function to call when the handler has completed
 
+        Messages from the same connection, or else with the same thread, are
+        handled one at a time in the order they were received.
+
         Returns:
             A pending task instance resolving to the handler task
 
+        Raises:
+            TaskLaneFullError: If too many messages are waiting for the same lane
+
         """
-        return self.put_task(
-            self.handle_message(inbound_message, send_outbound, send_webhook), complete
+        return self.task_lanes.put(
+            self.handle_message(inbound_message, send_outbound, send_webhook),
+            complete,
+            key=self.dispatch_key(inbound_message),
         )
 
+    @staticmethod
+    def dispatch_key(inbound_message: InboundMessage) -> str:
+        """Get the key of the messages which must be handled in order."""
+        receipt = inbound_message.receipt
+        if receipt.sender_verkey:
+            return f"{receipt.recipient_verkey}:{receipt.sender_verkey}"
+        return receipt.thread_id
+
+    def pending_count(self) -> int:
+        """Get the number of tasks waiting to be run."""
+        return self.task_queue.current_pending + self.task_lanes.total_waiting
+
+    def get_stats(self) -> dict:
+        """Get the current task queue and lane statistics."""
+        stats = {
+            "task_active": self.task_queue.current_active,
+            "task_done": self.task_queue.total_done,
+            "task_failed": self.task_queue.total_failed,
+            "task_pending": self.task_queue.current_pending,
+        }
+        stats.update(self.task_lanes.get_stats())
+        return stats
+
     async def handle_message(
         self,
         inbound_message: InboundMessage,
@@ -222,6 +261,7 @@ class Dispatcher:
 
     async def complete(self, timeout: float = 0.1):
         """Wait for pending tasks to complete."""
+        self.task_lanes.cancel_pending()
         await self.task_queue.complete(timeout=timeout)
 
 
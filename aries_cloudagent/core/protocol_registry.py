@@ -13,6 +13,8 @@ class ProtocolRegistry:
         """Initialize a `ProtocolRegistry` instance."""
         self._controllers = {}
         self._typemap = {}
+        # message classes loaded from their registered paths
+        self._resolved = {}
 
     @property
     def protocols(self) -> Sequence[str]:
@@ -60,6 +62,8 @@ class ProtocolRegistry:
         """
         for typeset in typesets:
             self._typemap.update(typeset)
+            for message_type in typeset:
+                self._resolved.pop(message_type, None)
 
     def register_controllers(self, *controller_sets):
         """
@@ -86,9 +90,13 @@ class ProtocolRegistry:
             The resolved message class
 
         """
-        msg_cls = self._typemap.get(message_type)
-        if isinstance(msg_cls, str):
-            msg_cls = ClassLoader.load_class(msg_cls)
+        msg_cls = self._resolved.get(message_type)
+        if not msg_cls:
+            msg_cls = self._typemap.get(message_type)
+            if isinstance(msg_cls, str):
+                msg_cls = ClassLoader.load_class(msg_cls)
+            if msg_cls:
+                self._resolved[message_type] = msg_cls
         return msg_cls
 
     async def prepare_disclosed(
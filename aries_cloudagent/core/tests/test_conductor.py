@@ -5,6 +5,7 @@ from asynctest import mock as async_mock
 
 from .. import conductor as test_module
 from ...admin.base_server import BaseAdminServer
+from ...cache.base import BaseCache
 from ...config.base_context import ContextBuilder
 from ...config.injection_context import InjectionContext
 from ...connections.models.connection_record import ConnectionRecord
@@ -113,10 +114,13 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
 
             mock_logger.print_banner.assert_called_once()
 
+            cache = async_mock.MagicMock()
+            conductor.context.injector.bind_instance(BaseCache, cache)
             await conductor.stop()
 
             mock_inbound_mgr.return_value.stop.assert_awaited_once_with()
             mock_outbound_mgr.return_value.stop.assert_awaited_once_with()
+            cache.close.assert_called_once_with()
 
     async def test_inbound_message_handler(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
@@ -12,6 +12,7 @@ from ...protocols.problem_report.message import ProblemReport
 from ...transport.inbound.message import InboundMessage
 from ...transport.inbound.receipt import MessageReceipt
 from ...transport.outbound.message import OutboundMessage
+from ...utils.task_lanes import TaskLaneFullError
 
 from .. import dispatcher as test_module
 
@@ -94,3 +95,52 @@ class TestDispatcher(AsyncTestCase):
         assert rcv.messages and isinstance(rcv.messages[0][1], OutboundMessage)
         payload = json.loads(rcv.messages[0][1].payload)
         assert payload["@type"] == ProblemReport.Meta.message_type
+
+    async def test_dispatch_lanes(self):
+        context = make_context()
+        context.enforce_typing = False
+        context.settings["transport.dispatch_lane_depth"] = 1
+        registry = await context.inject(ProtocolRegistry)
+        registry.register_message_types(
+            {StubAgentMessage.Meta.message_type: StubAgentMessage}
+        )
+        dispatcher = test_module.Dispatcher(context)
+        await dispatcher.setup()
+        rcv = Receiver()
+        message = {"@type": StubAgentMessage.Meta.message_type}
+        events = []
+
+        async def handle(handler, context, responder):
+            sender = context.message_receipt.sender_verkey
+            events.append(("start", sender))
+            await asyncio.sleep(0.01)
+            events.append(("end", sender))
+
+        def inbound(sender):
+            return InboundMessage(
+                message, MessageReceipt(recipient_verkey="me", sender_verkey=sender)
+            )
+
+        with async_mock.patch.object(
+            StubAgentMessageHandler, "handle", handle
+        ), async_mock.patch.object(
+            test_module.ConnectionManager,
+            "find_inbound_connection",
+            async_mock.CoroutineMock(return_value=None),
+        ):
+            dispatcher.queue_message(inbound("a"), rcv.send)
+            dispatcher.queue_message(inbound("a"), rcv.send)
+            dispatcher.queue_message(inbound("b"), rcv.send)
+            with self.assertRaises(TaskLaneFullError):
+                dispatcher.queue_message(inbound("a"), rcv.send)
+            stats = dispatcher.get_stats()
+            assert stats["lanes_busy"] == 2
+            assert stats["lane_waiting"] == 1
+            assert stats["lane_rejected"] == 1
+
+            while dispatcher.get_stats()["lanes_busy"]:
+                await dispatcher.task_queue
+        assert len(events) == 6
+        # the second message from "a" waits for the first, but not for "b"
+        assert events[:2] == [("start", "a"), ("start", "b")]
+        assert events.index(("end", "a")) < events.index(("start", "a"), 1)
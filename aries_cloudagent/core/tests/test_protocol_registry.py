@@ -3,6 +3,7 @@ from asynctest import TestCase as AsyncTestCase, mock as async_mock
 from ...config.injection_context import InjectionContext
 from ...messaging.error import MessageParseError
 
+from .. import protocol_registry as test_module
 from ..protocol_registry import ProtocolRegistry
 
 
@@ -63,5 +64,26 @@ class TestProtocolRegistry(AsyncTestCase):
         assert published[0]["pid"] == self.test_protocol
         assert published[0]["roles"] == ["ROLE"]
 
+    def test_resolve_message_class(self):
+        ping_cls = "aries_cloudagent.protocols.trustping.messages.ping.Ping"
+        self.registry.register_message_types({self.test_message_type: ping_cls})
+        with async_mock.patch.object(
+            test_module.ClassLoader,
+            "load_class",
+            wraps=test_module.ClassLoader.load_class,
+        ) as load_class:
+            resolved = self.registry.resolve_message_class(self.test_message_type)
+            assert resolved.__name__ == "Ping"
+            assert self.registry.resolve_message_class(self.test_message_type) is (
+                resolved
+            )
+            load_class.assert_called_once_with(ping_cls)
+
+            # registering the type again replaces the resolved class
+            self.registry.register_message_types({self.test_message_type: dict})
+            assert self.registry.resolve_message_class(self.test_message_type) is dict
+
+        assert self.registry.resolve_message_class("unknown") is None
+
     def test_repr(self):
         assert type(repr(self.registry)) is str
@@ -354,6 +354,8 @@ class AgentMessageSchema(BaseModelSchema):
             ValidationError: If there is a missing field signature
 
         """
+        # the schema instance is reused, so each message gets new decorators
+        self._decorators = DecoratorSet()
         processed = self._decorators.extract_decorators(data, self.__class__)
 
         expect_fields = resolve_meta_property(self, "signed_fields") or ()
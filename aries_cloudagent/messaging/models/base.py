@@ -1,6 +1,8 @@
 """Base classes for Models and Schemas."""
 import logging
 from abc import ABC
+from contextlib import contextmanager
+from functools import lru_cache
 import json
 from typing import Union
 
@@ -9,9 +11,17 @@ from marshmallow import Schema, post_dump, pre_load, post_load, ValidationError
 from ...core.error import BaseError
 from ...utils.classloader import ClassLoader
 
+from . import compiled
+
 LOGGER = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _load_class(class_name: str, default_module: str = None) -> type:
+    """Load a class by name, caching the result for later lookups."""
+    return ClassLoader.load_class(class_name, default_module)
+
+
 def resolve_class(the_cls, relative_cls: type = None):
     """
     Resolve a class.
@@ -32,10 +42,42 @@ def resolve_class(the_cls, relative_cls: type = None):
         resolved = the_cls
     elif isinstance(the_cls, str):
         default_module = relative_cls and relative_cls.__module__
-        resolved = ClassLoader.load_class(the_cls, default_module)
+        resolved = _load_class(the_cls, default_module)
     return resolved
 
 
+# idle schema instances by schema class and options
+SCHEMA_POOLS = {}
+
+
+@contextmanager
+def schema_instance(schema_cls: type, **options) -> Schema:
+    """
+    Borrow a schema instance, reusing instances across calls.
+
+    Building a schema copies its declared fields, so instances are kept for
+    reuse. An instance is only used by one caller at a time: a schema loading
+    or dumping a nested model of the same class gets its own instance.
+
+    Args:
+        schema_cls: The schema class
+        options: Keyword arguments for the schema constructor
+
+    """
+    key = (schema_cls, tuple(sorted(options.items()))) if options else schema_cls
+    pool = SCHEMA_POOLS.get(key)
+    if pool is None:
+        pool = SCHEMA_POOLS.setdefault(key, [])
+    try:
+        schema = pool.pop()
+    except IndexError:
+        schema = schema_cls(**options)
+    try:
+        yield schema
+    finally:
+        pool.append(schema)
+
+
 def resolve_meta_property(obj, prop_name: str, defval=None):
     """
     Resolve a meta property.
@@ -111,20 +153,32 @@ class BaseModel(ABC):
         return self._get_schema_class()
 
     @classmethod
-    def deserialize(cls, obj):
+    def deserialize(cls, obj, unknown: str = None):
         """
         Convert from JSON representation to a model instance.
 
         Args:
             obj: The dict to load into a model instance
+            unknown: Override the handling of unknown fields, one of the
+                marshmallow `EXCLUDE`, `INCLUDE` or `RAISE` options
 
         Returns:
             A model instance for this data
 
         """
-        schema = cls._get_schema_class()()
+        options = {"unknown": unknown} if unknown else {}
         try:
-            return schema.loads(obj) if isinstance(obj, str) else schema.load(obj)
+            with schema_instance(cls._get_schema_class()) as schema:
+                mode = compiled.get_mode()
+                if mode == compiled.MODE_OFF:
+                    if isinstance(obj, str):
+                        return schema.loads(obj, **options)
+                    return schema.load(obj, **options)
+                if isinstance(obj, str):
+                    obj = schema.opts.render_module.loads(obj)
+                if mode == compiled.MODE_VERIFY:
+                    return compiled.verify_load(schema, obj, **options)
+                return compiled.load(schema, obj, **options)
         except ValidationError as e:
             LOGGER.exception(f"{cls.__name__} message validation error:")
             raise BaseModelError(f"{cls.__name__} schema validation failed") from e
@@ -140,9 +194,20 @@ class BaseModel(ABC):
             A dict representation of this model, or a JSON string if as_string is True
 
         """
-        schema = self.Schema()
         try:
-            return schema.dumps(self) if as_string else schema.dump(self)
+            with schema_instance(self.Schema) as schema:
+                mode = compiled.get_mode()
+                if mode == compiled.MODE_OFF:
+                    return schema.dumps(self) if as_string else schema.dump(self)
+                if mode == compiled.MODE_VERIFY:
+                    serialized = compiled.verify_dump(schema, self)
+                else:
+                    serialized = compiled.dump(schema, self)
+                return (
+                    schema.opts.render_module.dumps(serialized)
+                    if as_string
+                    else serialized
+                )
         except ValidationError as e:
             LOGGER.exception(f"{self.__class__.__name__} message serialization error:")
             raise BaseModelError(
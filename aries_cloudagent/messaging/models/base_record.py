@@ -5,7 +5,7 @@ import sys
 import uuid
 
 from datetime import datetime
-from typing import Any, Mapping, Sequence, Union
+from typing import Any, AsyncIterator, Mapping, Optional, Sequence, Tuple, Union
 
 from marshmallow import fields
 
@@ -229,6 +229,7 @@ class BaseRecord(BaseModel):
             tag_filter: The filter dictionary to apply
             post_filter: Additional value filters to apply after retrieval
         """
+        tag_filter, post_filter, _ = cls.plan_query(tag_filter, post_filter)
         storage: BaseStorage = await context.inject(BaseStorage)
         query = storage.search_records(
             cls.RECORD_TYPE,
@@ -263,6 +264,35 @@ class BaseRecord(BaseModel):
             post_filter_positive: Additional value filters to apply matching positively
             post_filter_negative: Additional value filters to apply matching negatively
         """
+        return [
+            record
+            async for record in cls.iter_query(
+                context, tag_filter, post_filter_positive, post_filter_negative
+            )
+        ]
+
+    @classmethod
+    async def iter_query(
+        cls,
+        context: InjectionContext,
+        tag_filter: dict = None,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+    ) -> AsyncIterator["BaseRecord"]:
+        """Iterate over stored records matching a query.
+
+        Records are fetched from storage one page at a time and decoded as they
+        are consumed, so memory use does not grow with the number of results.
+
+        Args:
+            context: The injection context to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+        """
+        tag_filter, post_filter_positive, post_filter_negative = cls.plan_query(
+            tag_filter, post_filter_positive, post_filter_negative
+        )
         storage: BaseStorage = await context.inject(BaseStorage)
         query = storage.search_records(
             cls.RECORD_TYPE,
@@ -270,16 +300,115 @@ class BaseRecord(BaseModel):
             None,
             {"retrieveTags": False},
         )
+        # closes the search if the caller stops iterating early
+        async with query:
+            async for record in query:
+                vals = json.loads(record.value)
+                if match_post_filter(
+                    vals, post_filter_positive, True
+                ) and match_post_filter(vals, post_filter_negative, False):
+                    yield cls.from_storage(record.id, vals)
+
+    @classmethod
+    async def query_page(
+        cls,
+        context: InjectionContext,
+        tag_filter: dict = None,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        *,
+        limit: int,
+        cursor: int = 0,
+    ) -> Tuple[Sequence["BaseRecord"], Optional[int]]:
+        """Query a page of stored records.
+
+        Only the records within the page are decoded, so memory use is bounded
+        by the page size rather than the number of matching records. Pages
+        follow the storage order. Where the storage supports it, the cursor is
+        the position of the last record examined, so later pages do not load
+        earlier records and are not shifted when records are added or removed.
+        Otherwise the cursor is the number of records examined.
+
+        Args:
+            context: The injection context to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            limit: The maximum number of records to return
+            cursor: The cursor returned for the previous page, or 0 to start
+
+        Returns:
+            A tuple of the records found and the cursor for the next page,
+            or `None` if there are no more records
+
+        """
+        tag_filter, post_filter_positive, post_filter_negative = cls.plan_query(
+            tag_filter, post_filter_positive, post_filter_negative
+        )
+        storage: BaseStorage = await context.inject(BaseStorage)
+        post_filtered = post_filter_positive or post_filter_negative
+        query = storage.search_records(
+            cls.RECORD_TYPE,
+            cls.prefix_tag_filter(tag_filter),
+            None if post_filtered else limit,
+            {"retrieveTags": False},
+        )
         result = []
-        async for record in query:
-            vals = json.loads(record.value)
-            if match_post_filter(
-                vals, post_filter_positive, True
-            ) and match_post_filter(
-                vals, post_filter_negative, False
-            ):
-                result.append(cls.from_storage(record.id, vals))
-        return result
+        next_cursor = cursor
+        async with query:
+            if cursor and not await query.resume_after(cursor):
+                # the storage can only resume from an offset
+                if await query.skip(cursor) < cursor:
+                    return result, None
+            while len(result) < limit:
+                rows = await query.fetch(query.page_size)
+                if not rows:
+                    return result, None
+                for record in rows:
+                    position = query.position(record)
+                    next_cursor = next_cursor + 1 if position is None else position
+                    vals = json.loads(record.value)
+                    if match_post_filter(
+                        vals, post_filter_positive, True
+                    ) and match_post_filter(vals, post_filter_negative, False):
+                        result.append(cls.from_storage(record.id, vals))
+                        if len(result) == limit:
+                            break
+        return result, next_cursor
+
+    @classmethod
+    async def retag_records(cls, context: InjectionContext) -> int:
+        """Update the stored tags of existing records to match `TAG_NAMES`.
+
+        Used to migrate the records of a wallet after new tags are declared,
+        so that queries on those tags also find records saved beforehand.
+
+        Args:
+            context: The injection context to use
+
+        Returns:
+            The number of records updated
+
+        """
+        storage: BaseStorage = await context.inject(BaseStorage)
+        query = storage.search_records(
+            cls.RECORD_TYPE, None, None, {"retrieveTags": True}
+        )
+        updated = 0
+        pending = []
+        async with query:
+            async for stored in query:
+                tags = cls.from_storage(stored.id, json.loads(stored.value)).tags
+                if tags != (stored.tags or {}):
+                    pending.append(stored._replace(tags=tags))
+                    if len(pending) >= query.page_size:
+                        await storage.update_records(pending)
+                        updated += len(pending)
+                        pending = []
+        if pending:
+            await storage.update_records(pending)
+            updated += len(pending)
+        return updated
 
     async def save(
         self,
@@ -310,8 +439,7 @@ class BaseRecord(BaseModel):
                 new_record = True
             else:
                 record = self.storage_record
-                await storage.update_record_value(record, record.value)
-                await storage.update_record_tags(record, record.tags)
+                await storage.update_record(record, record.value, record.tags)
                 new_record = False
         finally:
             params = {self.RECORD_TYPE: self.serialize()}
@@ -360,6 +488,7 @@ class BaseRecord(BaseModel):
         if self._id:
             storage: BaseStorage = await context.inject(BaseStorage)
             await storage.delete_record(self.storage_record)
+            await self.clear_cached(context)
         # FIXME - update state and send webhook?
 
     @property
@@ -417,6 +546,46 @@ class BaseRecord(BaseModel):
             {(k[1:] if "~" in k else k): v for (k, v) in tags.items()} if tags else {}
         )
 
+    @classmethod
+    def plan_query(
+        cls,
+        tag_filter: dict = None,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+    ) -> Tuple[dict, dict, dict]:
+        """Move post-filter clauses on tagged properties into the tag filter.
+
+        Matching on tags lets the storage skip non-matching records instead of
+        decoding each one to apply the post-filter.
+
+        Args:
+            tag_filter: The tag filter clauses
+            post_filter_positive: Value filters to apply matching positively
+            post_filter_negative: Value filters to apply matching negatively
+
+        Returns:
+            A tuple of the tag filter and remaining positive and negative filters
+
+        """
+        tag_map = cls.get_tag_map()
+        tag_filter = dict(tag_filter or {})
+        positive = {}
+        for k, v in (post_filter_positive or {}).items():
+            if k in tag_map and isinstance(v, str) and tag_filter.get(k, v) == v:
+                tag_filter[k] = v
+            else:
+                positive[k] = v
+        negative = post_filter_negative
+        if negative and all(
+            k in tag_map and isinstance(v, str) for k, v in negative.items()
+        ):
+            if "$not" in tag_filter:
+                tag_filter = {"$and": [tag_filter, {"$not": dict(negative)}]}
+            else:
+                tag_filter["$not"] = dict(negative)
+            negative = None
+        return tag_filter, positive, negative
+
     @classmethod
     def prefix_tag_filter(cls, tag_filter: dict):
         """Prefix unencrypted tags used in the tag filter."""
@@ -0,0 +1,673 @@
+"""Compiled serialization and deserialization of model schemas."""
+
+import logging
+import os
+from collections.abc import Mapping
+from functools import lru_cache, partial
+
+from marshmallow import fields, missing, Schema, ValidationError
+from marshmallow.decorators import (
+    POST_DUMP,
+    POST_LOAD,
+    PRE_DUMP,
+    PRE_LOAD,
+    VALIDATES_SCHEMA,
+)
+from marshmallow.error_store import ErrorStore
+from marshmallow.utils import EXCLUDE, RAISE, is_iterable_but_not_string, set_value
+
+from ...core.error import BaseError
+
+LOGGER = logging.getLogger(__name__)
+
+MODE_OFF = "off"
+MODE_ON = "on"
+MODE_VERIFY = "verify"
+
+MODES = (MODE_OFF, MODE_ON, MODE_VERIFY)
+
+# field kinds with specialised code
+KIND_GENERIC = "generic"
+KIND_VALUE = "value"
+KIND_RAW = "raw"
+KIND_STR = "str"
+KIND_INT = "int"
+KIND_BOOL = "bool"
+KIND_NESTED = "nested"
+KIND_LIST = "list"
+KIND_DICT = "dict"
+
+_mode = os.getenv("COMPILED_SERIALIZER", MODE_OFF).lower()
+
+
+class SchemaConformanceError(BaseError):
+    """Compiled serialization or loading differs from the output of marshmallow."""
+
+
+def get_mode() -> str:
+    """Get the current compiled serializer mode."""
+    return _mode
+
+
+def set_mode(mode: str):
+    """
+    Set the compiled serializer mode.
+
+    Args:
+        mode: `off` to serialize and load with marshmallow, `on` to use the
+            compiled serializers and loaders, or `verify` to compare the compiled
+            output to marshmallow
+
+    """
+    global _mode
+    mode = (mode or MODE_OFF).lower()
+    if mode not in MODES:
+        raise ValueError(f"Unknown compiled serializer mode: {mode}")
+    _mode = mode
+
+
+def field_kind(field: fields.Field) -> str:
+    """Get the kind of code generated to serialize a field."""
+    field_cls = type(field)
+    serialize = field_cls._serialize
+    if serialize is fields.Field._serialize:
+        return KIND_RAW
+    if serialize is fields.String._serialize:
+        return KIND_STR
+    if field_cls is fields.Integer and not field.as_string:
+        return KIND_INT
+    if field_cls is fields.Boolean:
+        return KIND_BOOL
+    if serialize is fields.Mapping._serialize:
+        if field.key_field is None and field.value_field is None:
+            return KIND_RAW
+    elif serialize is fields.Nested._serialize:
+        return KIND_NESTED
+    elif serialize is fields.List._serialize:
+        # lists of other nested fields are dumped in one call by marshmallow
+        if field_kind(field.inner) == KIND_NESTED or not isinstance(
+            field.inner, fields.Nested
+        ):
+            return KIND_LIST
+    return KIND_VALUE
+
+
+def field_spec(attr_name: str, field: fields.Field) -> tuple:
+    """
+    Describe the code needed to serialize a field.
+
+    Fields with a dotted attribute, a default value or no attribute at all are
+    serialized through marshmallow.
+    """
+    key = field.data_key or attr_name
+    getter = attr_name if field.attribute is None else field.attribute
+    if (
+        not field._CHECK_ATTRIBUTE
+        or "." in getter
+        or getattr(field, "default", missing) is not missing
+    ):
+        return (KIND_GENERIC, attr_name, key, None, None)
+    kind = field_kind(field)
+    inner = None
+    if kind == KIND_NESTED:
+        inner = bool(field.many)
+    elif kind == KIND_LIST:
+        inner = field_kind(field.inner)
+        if inner == KIND_NESTED and field.inner.many:
+            inner = KIND_VALUE
+    return (kind, attr_name, key, getter, inner)
+
+
+def _value_code(kind: str, inner, var: str, attr: str) -> str:
+    """Get the expression serializing the value `v` of a field."""
+    if kind == KIND_RAW:
+        return "v"
+    if kind == KIND_STR:
+        return f"v if v is None or v.__class__ is str else s{var}(v, {attr}, obj)"
+    if kind == KIND_INT:
+        return f"v if v is None or v.__class__ is int else s{var}(v, {attr}, obj)"
+    if kind == KIND_BOOL:
+        return f"v if v is None or v.__class__ is bool else s{var}(v, {attr}, obj)"
+    if kind == KIND_NESTED:
+        return f"None if v is None else dump(f{var}.schema, v, {inner})"
+    if kind == KIND_LIST:
+        if inner == KIND_NESTED:
+            return f"None if v is None else dump(f{var}.inner.schema, v, True)"
+        if inner == KIND_RAW:
+            return "None if v is None else [e for e in v]"
+        if inner == KIND_STR:
+            each = f"e if e is None or e.__class__ is str else i{var}(e, {attr}, obj)"
+        else:
+            each = f"i{var}(e, {attr}, obj)"
+        return f"None if v is None else [{each} for e in v]"
+    return f"s{var}(v, {attr}, obj)"
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(specs: tuple, skip: bool):
+    """
+    Generate and compile the serializer for a set of field specifications.
+
+    Args:
+        specs: The field specifications
+        skip: Whether to leave out values found in `skip_values`
+
+    Returns:
+        A function binding the serializer to the fields of a schema instance
+
+    """
+    params = ["fallback", "dict_class", "get_attribute", "dump", "missing", "skip"]
+    lines = [
+        "def serialize(obj):",
+        "    if hasattr(obj, '__getitem__'):",
+        "        return fallback(obj)",
+        "    ret = {}" if skip else "    ret = dict_class()",
+    ]
+    for index, (kind, attr_name, key, getter, inner) in enumerate(specs):
+        params.extend((f"f{index}", f"s{index}", f"i{index}"))
+        attr = repr(attr_name)
+        if kind == KIND_GENERIC:
+            lines.append(f"    v = f{index}.serialize({attr}, obj, get_attribute)")
+            value = "v"
+        else:
+            lines.append(f"    v = getattr(obj, {getter!r}, missing)")
+            value = _value_code(kind, inner, index, attr)
+        lines.append("    if v is not missing:")
+        if skip:
+            if value != "v":
+                lines.append(f"        v = {value}")
+            lines.append("        if v not in skip:")
+            lines.append(f"            ret[{key!r}] = v")
+        else:
+            lines.append(f"        ret[{key!r}] = {value}")
+    lines.append("    return ret")
+
+    source = "def bind({}):\n{}\n    return serialize\n".format(
+        ", ".join(params), "\n".join("    " + line for line in lines)
+    )
+    namespace = {}
+    exec(compile(source, "<compiled serializer>", "exec"), namespace)
+    bind = namespace["bind"]
+    bind.source = source
+    return bind
+
+
+def inline_skip_values(schema: Schema) -> list:
+    """
+    Get the values to skip if the post-dump hook removing them can be inlined.
+
+    The `BaseModelSchema` hook removing skipped values is applied by the
+    compiled serializer itself when it is the only post-dump hook.
+
+    Returns:
+        The values to skip, or None if the post-dump hooks must run
+
+    """
+    from .base import BaseModelSchema, resolve_meta_property
+
+    if (
+        schema._hooks[(POST_DUMP, False)] == ["remove_skipped_values"]
+        and not schema._hooks[(POST_DUMP, True)]
+        and getattr(type(schema), "remove_skipped_values", None)
+        is BaseModelSchema.remove_skipped_values
+    ):
+        return list(resolve_meta_property(schema, "skip_values", []))
+    return None
+
+
+def bind_serializer(schema: Schema) -> tuple:
+    """
+    Compile the serializer for the fields of a schema instance.
+
+    Returns:
+        The serializer and whether the post-dump hooks must still run
+
+    """
+    skip_values = inline_skip_values(schema)
+    if skip_values is None:
+        fallback = partial(schema._serialize, many=False)
+    else:
+
+        def fallback(obj):
+            return schema.remove_skipped_values(schema._serialize(obj, many=False))
+
+    specs = []
+    args = [
+        fallback,
+        schema.dict_class,
+        schema.get_attribute,
+        dump,
+        missing,
+        skip_values,
+    ]
+    for attr_name, field in schema.dump_fields.items():
+        spec = field_spec(attr_name, field)
+        specs.append(spec)
+        inner = getattr(field, "inner", None)
+        args.extend(
+            (
+                field,
+                field._serialize,
+                inner._serialize if spec[0] == KIND_LIST else None,
+            )
+        )
+    bind = compile_serializer(tuple(specs), skip_values is not None)
+    return bind(*args), skip_values is None
+
+
+def get_serializer(schema: Schema) -> tuple:
+    """
+    Get the compiled serializer for a schema instance, binding it at first use.
+
+    Returns:
+        The serializer and whether the post-dump hooks must still run, or None
+        if the schema must be dumped by marshmallow
+
+    """
+    schema_cls = type(schema)
+    if (
+        schema_cls.dump is not Schema.dump
+        or schema_cls._serialize is not Schema._serialize
+        or schema_cls.get_attribute is not Schema.get_attribute
+    ):
+        return None
+    try:
+        return schema._compiled_serializer
+    except AttributeError:
+        serializer = schema._compiled_serializer = bind_serializer(schema)
+        return serializer
+
+
+def dump(schema: Schema, obj, many: bool = None):
+    """
+    Serialize an object like `Schema.dump`, using a compiled serializer.
+
+    Schema hooks run as they would under marshmallow, and nested schemas are
+    serialized through their own compiled serializers.
+
+    Args:
+        schema: The schema instance
+        obj: The object to serialize
+        many: Whether to serialize a collection of objects
+
+    Returns:
+        The serialized data
+
+    """
+    serializer = get_serializer(schema)
+    if not serializer:
+        return schema.dump(obj) if many is None else schema.dump(obj, many=many)
+    serialize, post_dump = serializer
+
+    many = schema.many if many is None else bool(many)
+    if many and is_iterable_but_not_string(obj):
+        obj = list(obj)
+
+    if schema._has_processors(PRE_DUMP):
+        processed = schema._invoke_dump_processors(
+            PRE_DUMP, obj, many=many, original_data=obj
+        )
+    else:
+        processed = obj
+
+    if many and processed is not None:
+        result = [serialize(item) for item in processed]
+    else:
+        result = serialize(processed)
+
+    if post_dump and schema._has_processors(POST_DUMP):
+        result = schema._invoke_dump_processors(
+            POST_DUMP, result, many=many, original_data=obj
+        )
+    return result
+
+
+def _same(first, second) -> bool:
+    """Check that two serialized values match, including types and key order."""
+    if type(first) is not type(second):
+        return False
+    if hasattr(first, "__dict__") and not isinstance(first, type):
+        # loaded model instances are compared by their attributes
+        first, second = vars(first), vars(second)
+        if first.get("_message_new_id") and second.get("_message_new_id"):
+            # messages loaded without an @id are each given a new random id
+            first, second = (
+                {key: value for key, value in attrs.items() if key != "_message_id"}
+                for attrs in (first, second)
+            )
+        return _same(first, second)
+    if isinstance(first, dict):
+        return list(first) == list(second) and all(
+            _same(value, second[key]) for key, value in first.items()
+        )
+    if isinstance(first, (list, tuple)):
+        return len(first) == len(second) and all(map(_same, first, second))
+    return first == second
+
+
+def verify_dump(schema: Schema, obj, many: bool = None):
+    """
+    Serialize an object with marshmallow and check the compiled output matches.
+
+    Returns:
+        The data serialized by marshmallow
+
+    Raises:
+        SchemaConformanceError: If the compiled serializer output differs
+
+    """
+    expected = schema.dump(obj) if many is None else schema.dump(obj, many=many)
+    if not get_serializer(schema):
+        return expected
+    compiled = dump(schema, obj, many=many)
+    if not _same(expected, compiled):
+        LOGGER.error(
+            "Compiled serializer for %s does not conform: %r != %r",
+            type(schema).__name__,
+            compiled,
+            expected,
+        )
+        raise SchemaConformanceError(
+            f"Compiled serializer for {type(schema).__name__} does not conform"
+        )
+    return expected
+
+
+def field_load_kind(field: fields.Field) -> str:
+    """Get the kind of code generated to load a field."""
+    field_cls = type(field)
+    if (
+        field.validators
+        or field_cls.deserialize is not fields.Field.deserialize
+        or field_cls._validate is not fields.Field._validate
+    ):
+        return KIND_VALUE
+    deserialize = field_cls._deserialize
+    if deserialize is fields.Field._deserialize:
+        return KIND_RAW
+    if deserialize is fields.String._deserialize:
+        return KIND_STR
+    if field_cls is fields.Integer:
+        return KIND_INT
+    if (
+        field_cls is fields.Boolean
+        and field.truthy is fields.Boolean.truthy
+        and field.falsy is fields.Boolean.falsy
+    ):
+        return KIND_BOOL
+    if deserialize is fields.Mapping._deserialize:
+        if field.key_field is None and field.value_field is None:
+            return KIND_DICT
+    elif deserialize is fields.Nested._deserialize:
+        return KIND_NESTED
+    elif deserialize is fields.List._deserialize:
+        return KIND_LIST
+    return KIND_VALUE
+
+
+def field_load_spec(attr_name: str, field: fields.Field) -> tuple:
+    """Describe the code needed to load a field."""
+    key = field.data_key or attr_name
+    kind = field_load_kind(field)
+    inner = None
+    if kind == KIND_NESTED:
+        inner = bool(field.many)
+    elif kind == KIND_LIST:
+        inner = field_load_kind(field.inner)
+        if inner == KIND_NESTED and field.inner.many:
+            inner = KIND_VALUE
+    return (kind, key, field.attribute or attr_name, inner)
+
+
+def _load_code(kind: str, inner, var: str, key: str) -> list:
+    """Get the statements loading the raw value `v` of a field."""
+    generic = f"v = f{var}.deserialize(v, {key}, data)"
+    if kind == KIND_RAW:
+        return ["if v is missing or v is None:", "    " + generic]
+    if kind == KIND_STR:
+        return ["if v.__class__ is not str:", "    " + generic]
+    if kind == KIND_INT:
+        return ["if v.__class__ is not int:", "    " + generic]
+    if kind == KIND_BOOL:
+        return ["if v is not True and v is not False:", "    " + generic]
+    if kind == KIND_DICT:
+        return ["if v.__class__ is not dict:", "    " + generic]
+    if kind == KIND_NESTED:
+        expect = "list" if inner else "dict"
+        return [
+            f"if v.__class__ is {expect}:",
+            f"    v = load(f{var}.schema, v, {inner}, f{var}.unknown)",
+            "else:",
+            "    " + generic,
+        ]
+    if kind == KIND_LIST:
+        if inner == KIND_NESTED:
+            value = (
+                f"[load(f{var}.inner.schema, e, False, f{var}.inner.unknown)"
+                " for e in v]"
+            )
+        elif inner == KIND_STR:
+            value = f"[e if e.__class__ is str else i{var}(e) for e in v]"
+        elif inner == KIND_INT:
+            value = f"[e if e.__class__ is int else i{var}(e) for e in v]"
+        else:
+            value = f"[i{var}(e) for e in v]"
+        return [
+            "if v.__class__ is list:",
+            f"    v = {value}",
+            "else:",
+            "    " + generic,
+        ]
+    return [generic]
+
+
+@lru_cache(maxsize=None)
+def compile_loader(specs: tuple):
+    """
+    Generate and compile the loader for a set of field specifications.
+
+    The loader raises `ValidationError` for any data it does not accept, after
+    which the data is loaded again by marshmallow to report the errors.
+
+    Args:
+        specs: The field load specifications
+
+    Returns:
+        A function binding the loader to the fields of a schema instance
+
+    """
+    params = ["dict_class", "known", "load", "missing", "set_value", "fail"]
+    lines = [
+        "def deserialize(data, unknown):",
+        "    if not isinstance(data, Mapping):",
+        "        fail()",
+        "    ret = dict_class()",
+    ]
+    for index, (kind, key, attr, inner) in enumerate(specs):
+        params.extend((f"f{index}", f"i{index}"))
+        lines.append(f"    v = data.get({key!r}, missing)")
+        code = _load_code(kind, inner, index, repr(key))
+        lines.extend("    " + line for line in code)
+        lines.append("    if v is not missing:")
+        if "." in attr:
+            lines.append(f"        set_value(ret, {attr!r}, v)")
+        else:
+            lines.append(f"        ret[{attr!r}] = v")
+    lines.extend(
+        [
+            "    if unknown != EXCLUDE:",
+            "        for key in set(data) - known:",
+            "            if unknown == RAISE:",
+            "                fail()",
+            "            set_value(ret, key, data[key])",
+            "    return ret",
+        ]
+    )
+
+    source = "def bind({}):\n{}\n    return deserialize\n".format(
+        ", ".join(params), "\n".join("    " + line for line in lines)
+    )
+    namespace = {"Mapping": Mapping, "EXCLUDE": EXCLUDE, "RAISE": RAISE}
+    exec(compile(source, "<compiled loader>", "exec"), namespace)
+    bind = namespace["bind"]
+    bind.source = source
+    return bind
+
+
+def _invalid():
+    """Reject data in a compiled loader, for marshmallow to report the errors."""
+    raise ValidationError("Invalid data for compiled loader")
+
+
+def bind_loader(schema: Schema):
+    """Compile the loader for the fields of a schema instance."""
+    specs = []
+    args = [
+        schema.dict_class,
+        {field.data_key or name for name, field in schema.load_fields.items()},
+        load,
+        missing,
+        set_value,
+        _invalid,
+    ]
+    for attr_name, field in schema.load_fields.items():
+        spec = field_load_spec(attr_name, field)
+        specs.append(spec)
+        args.extend(
+            (field, field.inner.deserialize if spec[0] == KIND_LIST else None)
+        )
+    return compile_loader(tuple(specs))(*args)
+
+
+def get_loader(schema: Schema):
+    """
+    Get the compiled loader for a schema instance, binding it at first use.
+
+    Returns:
+        The loader, or None if the schema must be loaded by marshmallow
+
+    """
+    schema_cls = type(schema)
+    if (
+        schema_cls.load is not Schema.load
+        or schema_cls._do_load is not Schema._do_load
+        or schema_cls._deserialize is not Schema._deserialize
+        or schema.partial
+    ):
+        return None
+    try:
+        return schema._compiled_loader
+    except AttributeError:
+        loader = schema._compiled_loader = bind_loader(schema)
+        return loader
+
+
+def _load_options(many: bool = None, unknown: str = None) -> dict:
+    """Get the options to pass to `Schema.load`, leaving out those not given."""
+    options = {}
+    if many is not None:
+        options["many"] = many
+    if unknown:
+        options["unknown"] = unknown
+    return options
+
+
+def load(schema: Schema, data, many: bool = None, unknown: str = None):
+    """
+    Load data like `Schema.load`, using a compiled loader.
+
+    Schema hooks and validators run as they would under marshmallow, and nested
+    schemas are loaded through their own compiled loaders. Data which fails to
+    load is loaded again by marshmallow, so that the errors are reported in the
+    same way: pre-load hooks must therefore give the same result when repeated.
+
+    Args:
+        schema: The schema instance
+        data: The data to load
+        many: Whether to load a collection of objects
+        unknown: Override the handling of unknown fields
+
+    Returns:
+        The loaded data
+
+    """
+    loader = get_loader(schema)
+    if not loader:
+        return schema.load(data, **_load_options(many, unknown))
+
+    many = schema.many if many is None else bool(many)
+    unknown = unknown or schema.unknown
+    try:
+        if schema._has_processors(PRE_LOAD):
+            processed = schema._invoke_load_processors(
+                PRE_LOAD,
+                data,
+                many=many,
+                original_data=data,
+                partial=schema.partial,
+            )
+        else:
+            processed = data
+        if many:
+            if not isinstance(processed, list):
+                _invalid()
+            result = [loader(item, unknown) for item in processed]
+        else:
+            result = loader(processed, unknown)
+
+        error_store = ErrorStore()
+        schema._invoke_field_validators(
+            error_store=error_store, data=result, many=many
+        )
+        if schema._has_processors(VALIDATES_SCHEMA):
+            for pass_many in (True, False):
+                schema._invoke_schema_validators(
+                    error_store=error_store,
+                    pass_many=pass_many,
+                    data=result,
+                    original_data=data,
+                    many=many,
+                    partial=schema.partial,
+                )
+        if error_store.errors:
+            raise ValidationError(error_store.errors)
+
+        if schema._has_processors(POST_LOAD):
+            result = schema._invoke_load_processors(
+                POST_LOAD,
+                result,
+                many=many,
+                original_data=data,
+                partial=schema.partial,
+            )
+    except ValidationError:
+        return schema.load(data, many=many, unknown=unknown)
+    return result
+
+
+def verify_load(schema: Schema, data, many: bool = None, unknown: str = None):
+    """
+    Load data with marshmallow and check the compiled loader output matches.
+
+    Returns:
+        The data loaded by marshmallow
+
+    Raises:
+        SchemaConformanceError: If the compiled loader output differs
+
+    """
+    expected = schema.load(data, **_load_options(many, unknown))
+    if not get_loader(schema):
+        return expected
+    loaded = load(schema, data, many=many, unknown=unknown)
+    if not _same(expected, loaded):
+        LOGGER.error(
+            "Compiled loader for %s does not conform: %r != %r",
+            type(schema).__name__,
+            loaded,
+            expected,
+        )
+        raise SchemaConformanceError(
+            f"Compiled loader for {type(schema).__name__} does not conform"
+        )
+    return expected
@@ -0,0 +1,53 @@
+from asynctest import TestCase as AsyncTestCase
+from marshmallow import EXCLUDE, fields
+
+from ..base import (
+    BaseModel,
+    BaseModelError,
+    BaseModelSchema,
+    SCHEMA_POOLS,
+    schema_instance,
+)
+
+
+class ModelImpl(BaseModel):
+    class Meta:
+        schema_class = "ModelImplSchema"
+
+    def __init__(self, *, attr=None):
+        self.attr = attr
+
+
+class ModelImplSchema(BaseModelSchema):
+    class Meta:
+        model_class = ModelImpl
+
+    attr = fields.String(required=True)
+
+
+class TestBase(AsyncTestCase):
+    def test_schema_reused(self):
+        ModelImpl(attr="a").serialize()
+        with schema_instance(ModelImplSchema) as schema:
+            # nested use gets a separate instance
+            with schema_instance(ModelImplSchema) as nested:
+                assert nested is not schema
+        assert len(SCHEMA_POOLS[ModelImplSchema]) == 2
+
+        with schema_instance(ModelImplSchema) as again:
+            assert again in (schema, nested)
+        with schema_instance(ModelImplSchema, partial=True) as partial:
+            assert partial not in (schema, nested)
+            assert partial.partial
+
+    def test_serde(self):
+        serial = ModelImpl(attr="a").serialize()
+        assert serial == {"attr": "a"}
+        assert ModelImpl.deserialize(serial).attr == "a"
+        assert ModelImpl.from_json(ModelImpl(attr="b").to_json()).attr == "b"
+
+    def test_deserialize_unknown(self):
+        with self.assertRaises(BaseModelError):
+            ModelImpl.deserialize({"attr": "a", "extra": "b"})
+        loaded = ModelImpl.deserialize({"attr": "a", "extra": "b"}, unknown=EXCLUDE)
+        assert loaded.attr == "a"
@@ -5,6 +5,7 @@ from asynctest import TestCase as AsyncTestCase, mock as async_mock
 from ....cache.base import BaseCache
 from ....config.injection_context import InjectionContext
 from ....storage.base import BaseStorage, StorageRecord
+from ....storage.basic import BasicStorage
 
 from ...responder import BaseResponder, MockResponder
 from ...util import time_now
@@ -58,8 +59,7 @@ class TestBaseRecord(AsyncTestCase):
     async def test_post_save_exist(self):
         context = InjectionContext(enforce_typing=False)
         mock_storage = async_mock.MagicMock()
-        mock_storage.update_record_value = async_mock.CoroutineMock()
-        mock_storage.update_record_tags = async_mock.CoroutineMock()
+        mock_storage.update_record = async_mock.CoroutineMock()
         context.injector.bind_instance(BaseStorage, mock_storage)
         record = BaseRecordImpl()
         last_state = "last_state"
@@ -70,8 +70,7 @@ class TestBaseRecord(AsyncTestCase):
         ) as post_save:
             await record.save(context, reason="reason", webhook=False)
             post_save.assert_called_once_with(context, False, last_state, False)
-        mock_storage.update_record_value.assert_called_once()
-        mock_storage.update_record_tags.assert_called_once()
+        mock_storage.update_record.assert_called_once()
 
     async def test_cache(self):
         context = InjectionContext(enforce_typing=False)
@@ -155,6 +154,107 @@ class TestBaseRecord(AsyncTestCase):
         assert result[0]._id == record_id
         assert result[0].value == record_value
 
+    async def test_iter_query(self):
+        context = InjectionContext(enforce_typing=False)
+        storage = BasicStorage()
+        context.injector.bind_instance(BaseStorage, storage)
+        for idx in range(5):
+            await BaseRecordImpl(state="even" if idx % 2 else "odd").save(context)
+
+        found = [
+            record.state
+            async for record in BaseRecordImpl.iter_query(
+                context, post_filter_negative={"state": "odd"}
+            )
+        ]
+        assert found == ["even", "even"]
+
+        search = storage.search_records(BaseRecordImpl.RECORD_TYPE)
+        with async_mock.patch.object(
+            storage, "search_records", return_value=search
+        ), async_mock.patch.object(search, "close", async_mock.CoroutineMock()):
+            iterator = BaseRecordImpl.iter_query(context)
+            await iterator.__anext__()
+            await iterator.aclose()
+            search.close.assert_awaited()
+
+    async def test_query_page(self):
+        context = InjectionContext(enforce_typing=False)
+        storage = BasicStorage()
+        context.injector.bind_instance(BaseStorage, storage)
+        for idx in range(7):
+            await BaseRecordImpl(state="even" if idx % 2 else "odd").save(context)
+        records = await BaseRecordImpl.query(context)
+
+        pages = []
+        cursor = 0
+        while cursor is not None:
+            page, cursor = await BaseRecordImpl.query_page(
+                context, limit=3, cursor=cursor
+            )
+            pages.append([record._id for record in page])
+        assert pages == [
+            [record._id for record in records[0:3]],
+            [record._id for record in records[3:6]],
+            [records[6]._id],
+        ]
+
+        page, cursor = await BaseRecordImpl.query_page(
+            context, post_filter_positive={"state": "odd"}, limit=2, cursor=0
+        )
+        assert [record._id for record in page] == [records[0]._id, records[2]._id]
+        assert cursor == 3
+        # later pages do not shift when earlier records are added or removed
+        await records[0].delete_record(context)
+        await BaseRecordImpl(state="odd").save(context)
+        page, cursor = await BaseRecordImpl.query_page(
+            context, post_filter_positive={"state": "odd"}, limit=2, cursor=cursor
+        )
+        assert [record._id for record in page] == [records[4]._id, records[6]._id]
+        page, cursor = await BaseRecordImpl.query_page(
+            context, post_filter_positive={"state": "odd"}, limit=2, cursor=cursor
+        )
+        assert len(page) == 1 and cursor is None
+
+        page, cursor = await BaseRecordImpl.query_page(context, limit=3, cursor=100)
+        assert page == [] and cursor is None
+
+    def test_plan_query(self):
+        assert BaseRecordImpl.plan_query(
+            {"tag": "a"}, {"state": "done", "other": "b"}, {"state": "new"}
+        ) == (
+            {"tag": "a", "state": "done", "$not": {"state": "new"}},
+            {"other": "b"},
+            None,
+        )
+        assert BaseRecordImpl.plan_query(
+            {"state": "new"}, {"state": "done"}, {"state": "x", "other": "y"}
+        ) == ({"state": "new"}, {"state": "done"}, {"state": "x", "other": "y"})
+        assert BaseRecordImpl.plan_query({"$not": {"a": "b"}}, None, {"state": "x"})[
+            0
+        ] == {"$and": [{"$not": {"a": "b"}}, {"$not": {"state": "x"}}]}
+
+    async def test_retag_records(self):
+        context = InjectionContext(enforce_typing=False)
+        storage = BasicStorage()
+        context.injector.bind_instance(BaseStorage, storage)
+        records = [BaseRecordImpl(state=state) for state in ("new", "done", None)]
+        for record in records:
+            await record.save(context)
+            # stored before the state tag was declared
+            await storage.update_record_tags(record.storage_record, {})
+
+        assert await BaseRecordImpl.query(context, None, {"state": "done"}) == []
+        assert await BaseRecordImpl.retag_records(context) == 2
+        assert await BaseRecordImpl.query(context, None, {"state": "done"}) == [
+            records[1]
+        ]
+        assert await BaseRecordImpl.query(context, None, None, {"state": "done"}) == [
+            records[0],
+            records[2],
+        ]
+        assert await BaseRecordImpl.retag_records(context) == 0
+
     @async_mock.patch("builtins.print")
     def test_log_state(self, mock_print):
         test_param = "test.log"
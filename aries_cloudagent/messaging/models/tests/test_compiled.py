@@ -0,0 +1,266 @@
+import json
+
+from asynctest import TestCase as AsyncTestCase
+from marshmallow import EXCLUDE, fields, INCLUDE, RAISE, ValidationError
+
+from ....protocols.issue_credential.v1_0.messages.credential_offer import (
+    CredentialOffer,
+)
+from ....protocols.issue_credential.v1_0.messages.inner.credential_preview import (
+    CredAttrSpec,
+    CredentialPreview,
+)
+from ....protocols.issue_credential.v1_0.models.credential_exchange import (
+    V10CredentialExchange,
+)
+from ....protocols.trustping.messages.ping import Ping, PingSchema
+
+from .. import compiled
+from ..base import BaseModel, BaseModelSchema, schema_instance
+
+
+class Upper(fields.Field):
+    def _serialize(self, value, attr, obj, **kwargs):
+        return value.upper() if value else value
+
+
+class ItemImpl(BaseModel):
+    class Meta:
+        schema_class = "ItemImplSchema"
+
+    def __init__(self, *, name=None, count=None):
+        self.name = name
+        self.count = count
+
+
+class ItemImplSchema(BaseModelSchema):
+    class Meta:
+        model_class = ItemImpl
+
+    name = fields.Str()
+    count = fields.Int()
+
+
+class ModelImpl(BaseModel):
+    class Meta:
+        schema_class = "ModelImplSchema"
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class ModelImplSchema(BaseModelSchema):
+    class Meta:
+        model_class = ModelImpl
+
+    text = fields.Str(data_key="@text")
+    number = fields.Int()
+    number_str = fields.Int(as_string=True)
+    flag = fields.Bool()
+    mapping = fields.Dict()
+    typed_mapping = fields.Dict(keys=fields.Str(), values=fields.Int())
+    tags = fields.List(fields.Str())
+    counts = fields.List(fields.Int())
+    raw = fields.List(fields.Raw())
+    item = fields.Nested(ItemImplSchema)
+    items = fields.Nested(ItemImplSchema, many=True)
+    item_list = fields.List(fields.Nested(ItemImplSchema))
+    renamed = fields.Str(attribute="source")
+    dotted = fields.Str(attribute="item.name")
+    defaulted = fields.Str(default="default")
+    constant = fields.Constant("constant")
+    uuid = fields.UUID()
+    upper = Upper()
+
+
+class TestCompiled(AsyncTestCase):
+    def setUp(self):
+        self.mode = compiled.get_mode()
+
+    def tearDown(self):
+        compiled.set_mode(self.mode)
+
+    def model(self):
+        return ModelImpl(
+            text=b"bytes",
+            number="5",
+            number_str=6,
+            flag=1,
+            mapping={"a": [1, 2]},
+            typed_mapping={"a": "1"},
+            tags=["a", b"b", None, 3],
+            counts=[True, "2"],
+            raw=[{"a": 1}],
+            item=ItemImpl(name="one", count=1),
+            items=[ItemImpl(name="two"), ItemImpl(count=False)],
+            item_list=[ItemImpl(name="three")],
+            source="source",
+            uuid="a2a77f50-4e6d-4b1c-9c95-5e0d4ea67ca1",
+            upper="upper",
+        )
+
+    def test_conformance(self):
+        model = self.model()
+        with schema_instance(ModelImplSchema) as schema:
+            expected = schema.dump(model)
+            assert compiled.verify_dump(schema, model) == expected
+            assert compiled.dump(schema, model) == expected
+            assert expected["@text"] == "bytes"
+            assert expected["number"] == 5
+            assert expected["flag"] is True
+            assert expected["defaulted"] == "default"
+            assert expected["dotted"] == "one"
+
+            # skipped values and missing attributes
+            empty = ModelImpl(text=None, item=None, tags=None)
+            assert compiled.verify_dump(schema, empty) == schema.dump(empty)
+
+            models = [model, empty]
+            assert compiled.dump(schema, models, many=True) == schema.dump(
+                models, many=True
+            )
+
+        with schema_instance(ItemImplSchema) as schema:
+            # mappings are read by key
+            assert compiled.verify_dump(schema, {"name": "mapping"}) == {
+                "name": "mapping"
+            }
+
+    def test_nonconformance(self):
+        model = self.model()
+        with schema_instance(ModelImplSchema) as schema:
+            schema._compiled_serializer = (lambda obj: {"text": "wrong"}, True)
+            with self.assertRaises(compiled.SchemaConformanceError):
+                compiled.verify_dump(schema, model)
+            del schema._compiled_serializer
+
+    def test_compiled_once(self):
+        with schema_instance(ModelImplSchema) as schema:
+            compiled.dump(schema, ModelImpl(text="a"))
+            info = compiled.compile_serializer.cache_info()
+            serializer = compiled.get_serializer(schema)
+            assert serializer is compiled.get_serializer(schema)
+            with schema_instance(ModelImplSchema) as other:
+                assert compiled.get_serializer(other) is not serializer
+        assert compiled.compile_serializer.cache_info().misses == info.misses
+
+        with schema_instance(ItemImplSchema) as schema:
+            compiled.dump(schema, ItemImpl(name="a"))
+            # skipped values are removed by the compiled serializer
+            serialize, post_dump = compiled.get_serializer(schema)
+            assert serialize(ItemImpl(name="a")) == {"name": "a"}
+            assert not post_dump
+
+    def test_load_conformance(self):
+        with schema_instance(ModelImplSchema) as schema:
+            serial = schema.dump(self.model())
+            # marshmallow cannot load a dotted attribute into the nested item
+            serial.pop("dotted")
+            serial["tags"] = ["a", "b", "3"]
+            loaded = compiled.verify_load(schema, serial)
+            assert isinstance(loaded, ModelImpl)
+            assert isinstance(loaded.item, ItemImpl)
+            assert loaded.item_list[0].name == "three"
+            assert loaded.tags == ["a", "b", "3"]
+            assert compiled.get_loader(schema)
+
+            # values which are converted by the fields
+            for data in (
+                {"@text": b"bytes", "number": "5", "flag": "true"},
+                {"counts": [1, "2"], "items": [{"count": "3"}], "item_list": []},
+            ):
+                assert compiled.verify_load(schema, data)
+
+            # values which are rejected by the fields
+            for data in (
+                {"raw": None},
+                {"item": None, "items": {"count": 1}},
+                {"mapping": [], "counts": ["many"]},
+                {"item_list": [{"count": "many"}]},
+            ):
+                with self.assertRaises(ValidationError) as context:
+                    compiled.load(schema, data)
+                with self.assertRaises(ValidationError) as expected:
+                    schema.load(data)
+                assert context.exception.messages == expected.exception.messages
+
+            models = compiled.verify_load(schema, [serial, {}], many=True)
+            assert len(models) == 2
+
+            loaded = compiled.verify_load(schema, {"extra": 1}, unknown=INCLUDE)
+            assert loaded.extra == 1
+
+        with schema_instance(ItemImplSchema) as schema:
+            data = {"name": "a", "extra": 1}
+            with self.assertRaises(ValidationError) as context:
+                compiled.load(schema, data, unknown=RAISE)
+            with self.assertRaises(ValidationError) as expected:
+                schema.load(data, unknown=RAISE)
+            assert context.exception.messages == expected.exception.messages
+            assert compiled.verify_load(schema, data, unknown=EXCLUDE).name == "a"
+
+            with self.assertRaises(ValidationError) as context:
+                compiled.load(schema, {"count": "many"}, unknown=EXCLUDE)
+            assert context.exception.messages == {"count": ["Not a valid integer."]}
+
+    def test_load_generated_id(self):
+        data = Ping(comment="ping").serialize()
+        del data["@id"]
+        with schema_instance(PingSchema) as schema:
+            # each load gives a message without an @id its own random id
+            loaded = compiled.verify_load(schema, data)
+            assert loaded._message_new_id
+            assert compiled.load(schema, data)._id != loaded._id
+
+            compiled.set_mode(compiled.MODE_VERIFY)
+            assert Ping.deserialize(data).comment == "ping"
+
+            # given ids are still compared
+            data["@id"] = loaded._id
+            schema._compiled_loader = lambda data, unknown: {"_id": "other"}
+            with self.assertRaises(compiled.SchemaConformanceError):
+                compiled.verify_load(schema, data)
+            del schema._compiled_loader
+
+    def test_load_nonconformance(self):
+        with schema_instance(ItemImplSchema) as schema:
+            schema._compiled_loader = lambda data, unknown: {"name": "wrong"}
+            with self.assertRaises(compiled.SchemaConformanceError):
+                compiled.verify_load(schema, {"name": "right"})
+            del schema._compiled_loader
+
+    def test_serialize_mode(self):
+        model = self.model()
+        expected = model.serialize()
+        for mode in (compiled.MODE_ON, compiled.MODE_VERIFY):
+            compiled.set_mode(mode)
+            assert model.serialize() == expected
+            assert json.loads(model.serialize(as_string=True)) == expected
+
+        with self.assertRaises(ValueError):
+            compiled.set_mode("bad")
+
+    def test_messages_and_records(self):
+        compiled.set_mode(compiled.MODE_VERIFY)
+        offer = CredentialOffer(
+            comment="comment",
+            credential_preview=CredentialPreview(
+                attributes=CredAttrSpec.list_plain({"name": "alice", "age": "20"})
+            ),
+            offers_attach=[CredentialOffer.wrap_indy_offer({"nonce": "1234"})],
+        )
+        offer.assign_thread_id("thread-id")
+        serial = offer.serialize()
+        assert serial["~thread"] == {"thid": "thread-id"}
+        assert CredentialOffer.deserialize(serial).serialize() == serial
+        assert CredentialOffer.deserialize(json.dumps(serial)).comment == "comment"
+        compiled.set_mode(compiled.MODE_ON)
+        assert CredentialOffer.deserialize(serial).serialize() == serial
+
+        record = V10CredentialExchange(
+            connection_id="conn-id",
+            state=V10CredentialExchange.STATE_OFFER_SENT,
+            credential_offer={"nonce": "1234"},
+            auto_offer=True,
+        )
+        assert record.serialize()["auto_offer"] is True
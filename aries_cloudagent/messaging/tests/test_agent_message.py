@@ -1,8 +1,9 @@
-from asynctest import TestCase as AsyncTestCase
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
 from marshmallow import fields
 
 from ..agent_message import AgentMessage, AgentMessageSchema
 from ..decorators.signature_decorator import SignatureDecorator
+from ...utils.classloader import ClassLoader
 from ...wallet.basic import BasicWallet
 
 
@@ -41,6 +42,23 @@ class BasicAgentMessage(AgentMessage):
         message_type = "basic-message"
 
 
+class ThreadedAgentMessage(AgentMessage):
+    """Agent message with a schema"""
+
+    class Meta:
+        """Meta data"""
+
+        schema_class = "ThreadedAgentMessageSchema"
+        message_type = "threaded-message"
+
+
+class ThreadedAgentMessageSchema(AgentMessageSchema):
+    """Utility schema"""
+
+    class Meta:
+        model_class = ThreadedAgentMessage
+
+
 class TestAgentMessage(AsyncTestCase):
     """Tests agent message."""
 
@@ -86,3 +104,21 @@ class TestAgentMessage(AsyncTestCase):
         reply.assign_thread_from(msg)
         assert reply._thread_id == msg._thread_id
         assert reply._thread_id != reply._id
+
+    def test_resolve_classes_cached(self):
+        assert SignedAgentMessage._get_schema_class() is SignedAgentMessageSchema
+        with async_mock.patch.object(
+            ClassLoader, "load_class", wraps=ClassLoader.load_class
+        ) as load_class:
+            assert SignedAgentMessage().Schema is SignedAgentMessageSchema
+            assert SignedAgentMessage().Handler is None
+            load_class.assert_not_called()
+
+    def test_deserialize_decorators(self):
+        msg = ThreadedAgentMessage()
+        msg.assign_thread_id("thread-1")
+        first = ThreadedAgentMessage.deserialize(msg.serialize())
+        second = ThreadedAgentMessage.deserialize(ThreadedAgentMessage().serialize())
+        assert first._decorators is not second._decorators
+        assert first._thread_id == "thread-1"
+        assert second._thread_id == second._id
@@ -5,6 +5,13 @@ from aiohttp_apispec import docs, request_schema, response_schema
 
 from marshmallow import fields, Schema
 
+from ...admin.paging import (
+    PAGING_PARAMETERS,
+    get_paging,
+    is_streaming,
+    paged_response,
+    stream_response,
+)
 from ...connections.models.connection_record import (
     ConnectionRecord,
     ConnectionRecordSchema,
@@ -26,6 +33,11 @@ class ConnectionListSchema(Schema):
         fields.Nested(ConnectionRecordSchema()),
         description="List of connection records",
     )
+    next_cursor = fields.Str(
+        description="Cursor for the next page of results, if paginated",
+        required=False,
+        allow_none=True,
+    )
 
 
 class InvitationResultSchema(Schema):
@@ -98,6 +110,10 @@ def connection_sort_key(conn):
 @docs(
     tags=["connection"],
     summary="Query agent-to-agent connections",
+    description=(
+        "Connections are sorted by state and creation time. When paginated, "
+        "pages follow storage order and the sorting applies within each page"
+    ),
     parameters=[
         {
             "name": "alias",
@@ -152,6 +168,7 @@ def connection_sort_key(conn):
             "schema": {"type": "string"},
             "required": False,
         },
+        *PAGING_PARAMETERS,
     ],
 )
 @response_schema(ConnectionListSchema(), 200)
@@ -185,9 +202,22 @@ async def connections_list(request: web.BaseRequest):
     ):
         if param_name in request.query and request.query[param_name] != "":
             post_filter[param_name] = request.query[param_name]
-    records = await ConnectionRecord.query(context, tag_filter, post_filter)
+    if is_streaming(request):
+        return await stream_response(
+            request, ConnectionRecord.iter_query(context, tag_filter, post_filter)
+        )
+    limit, cursor = get_paging(request)
+    if limit:
+        # pages follow storage order, so sorting below only applies per page
+        records, next_cursor = await ConnectionRecord.query_page(
+            context, tag_filter, post_filter, limit=limit, cursor=cursor
+        )
+    else:
+        records = await ConnectionRecord.query(context, tag_filter, post_filter)
     results = [record.serialize() for record in records]
     results.sort(key=connection_sort_key)
+    if limit:
+        return web.json_response(paged_response(results, next_cursor))
     return web.json_response({"results": results})
 
 
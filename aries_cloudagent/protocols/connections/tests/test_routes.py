@@ -73,6 +73,49 @@ class TestConnectionRoutes(AsyncTestCase):
                     }  # sorted
                 )
 
+    async def test_connections_list_paged(self):
+        context = RequestContext(base_context=InjectionContext(enforce_typing=False))
+        mock_req = async_mock.MagicMock()
+        mock_req.app = {
+            "request_context": context,
+        }
+        mock_req.query = {"state": ConnectionRecord.STATE_ACTIVE, "limit": "2"}
+
+        with async_mock.patch.object(
+            test_module, "ConnectionRecord", autospec=True
+        ) as mock_conn_rec:
+            conn = async_mock.MagicMock(
+                serialize=async_mock.MagicMock(
+                    return_value={
+                        "state": ConnectionRecord.STATE_ACTIVE,
+                        "created_at": "1234567890",
+                    }
+                )
+            )
+            mock_conn_rec.query_page = async_mock.CoroutineMock(
+                return_value=([conn], 5)
+            )
+
+            with async_mock.patch.object(
+                test_module.web, "json_response"
+            ) as mock_response:
+                await test_module.connections_list(mock_req)
+                mock_conn_rec.query_page.assert_awaited_once_with(
+                    context,
+                    {},
+                    {"state": ConnectionRecord.STATE_ACTIVE},
+                    limit=2,
+                    cursor=0,
+                )
+                mock_response.assert_called_once_with(
+                    {"results": [conn.serialize.return_value], "next_cursor": "5"}
+                )
+
+        for query in ({"limit": "0"}, {"limit": "x"}, {"cursor": "5"}):
+            mock_req.query = query
+            with self.assertRaises(test_module.web.HTTPBadRequest):
+                await test_module.connections_list(mock_req)
+
     async def test_connections_retrieve(self):
         context = RequestContext(base_context=InjectionContext(enforce_typing=False))
         mock_req = async_mock.MagicMock()
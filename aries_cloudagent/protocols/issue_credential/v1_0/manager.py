@@ -738,8 +738,7 @@ class CredentialManager:
 
         issuer: BaseIssuer = await self.context.inject(BaseIssuer)
 
-        registry_records = await IssuerRevRegRecord.query_by_pending(self.context)
-        for registry_record in registry_records:
+        async for registry_record in IssuerRevRegRecord.iter_by_pending(self.context):
             revoke_idxs = list(registry_record.pending_pub)
             if revoke_idxs:
                 delta_json = await issuer.revoke_credentials(
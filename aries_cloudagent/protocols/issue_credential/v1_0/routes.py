@@ -7,6 +7,13 @@ from aiohttp_apispec import docs, request_schema, response_schema
 from json.decoder import JSONDecodeError
 from marshmallow import fields, Schema
 
+from ....admin.paging import (
+    PAGING_PARAMETERS,
+    get_paging,
+    is_streaming,
+    paged_response,
+    stream_response,
+)
 from ....connections.models.connection_record import ConnectionRecord
 from ....holder.base import BaseHolder
 from ....issuer.indy import IssuerRevocationRegistryFullError
@@ -48,6 +55,11 @@ class V10CredentialExchangeListResultSchema(Schema):
         fields.Nested(V10CredentialExchangeSchema),
         description="Aries#0036 v1.0 credential exchange records",
     )
+    next_cursor = fields.Str(
+        description="Cursor for the next page of results, if paginated",
+        required=False,
+        allow_none=True,
+    )
 
 
 class V10CredentialStoreRequestSchema(Schema):
@@ -183,7 +195,11 @@ async def attribute_mime_types_get(request: web.BaseRequest):
     return web.json_response(await holder.get_mime_type(credential_id))
 
 
-@docs(tags=["issue-credential"], summary="Fetch all credential exchange records")
+@docs(
+    tags=["issue-credential"],
+    summary="Fetch all credential exchange records",
+    parameters=PAGING_PARAMETERS,
+)
 @response_schema(V10CredentialExchangeListResultSchema(), 200)
 async def credential_exchange_list(request: web.BaseRequest):
     """
@@ -204,6 +220,18 @@ async def credential_exchange_list(request: web.BaseRequest):
     for param_name in ("connection_id", "role", "state"):
         if param_name in request.query and request.query[param_name] != "":
             post_filter[param_name] = request.query[param_name]
+    if is_streaming(request):
+        return await stream_response(
+            request, V10CredentialExchange.iter_query(context, tag_filter, post_filter)
+        )
+    limit, cursor = get_paging(request)
+    if limit:
+        records, next_cursor = await V10CredentialExchange.query_page(
+            context, tag_filter, post_filter, limit=limit, cursor=cursor
+        )
+        return web.json_response(
+            paged_response([record.serialize() for record in records], next_cursor)
+        )
     records = await V10CredentialExchange.query(context, tag_filter, post_filter)
     return web.json_response({"results": [record.serialize() for record in records]})
 
@@ -1222,10 +1222,11 @@ class TestCredentialManager(AsyncTestCase):
             publish_registry_entry=async_mock.CoroutineMock(),
             clear_pending=async_mock.CoroutineMock(),
         )
+        async def iter_by_pending(context):
+            yield mock_issuer_rev_reg_record
+
         with async_mock.patch.object(
-            test_module.IssuerRevRegRecord,
-            "query_by_pending",
-            async_mock.CoroutineMock(return_value=[mock_issuer_rev_reg_record]),
+            test_module.IssuerRevRegRecord, "iter_by_pending", iter_by_pending
         ) as revoc:
             issuer = async_mock.MagicMock(BaseIssuer, autospec=True)
             issuer.merge_revocation_registry_deltas = async_mock.CoroutineMock(
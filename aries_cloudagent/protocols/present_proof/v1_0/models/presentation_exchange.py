@@ -20,7 +20,7 @@ class V10PresentationExchange(BaseRecord):
     RECORD_TYPE = "presentation_exchange_v10"
     RECORD_ID_NAME = "presentation_exchange_id"
     WEBHOOK_TOPIC = "present_proof"
-    TAG_NAMES = {"thread_id"}
+    TAG_NAMES = {"thread_id", "connection_id", "role", "state"}
 
     INITIATOR_SELF = "self"
     INITIATOR_EXTERNAL = "external"
@@ -4,7 +4,7 @@ import json
 import logging
 import uuid
 
-from typing import Any, Sequence
+from typing import Any, AsyncIterator, Sequence
 from urllib.parse import urlparse
 
 from marshmallow import fields, validate
@@ -306,6 +306,17 @@ class IssuerRevRegRecord(BaseRecord):
         """
         return await cls.query(context, None, None, {"pending_pub": []})
 
+    @classmethod
+    def iter_by_pending(
+        cls, context: InjectionContext
+    ) -> AsyncIterator["IssuerRevRegRecord"]:
+        """Iterate over revocation records with revocations pending.
+
+        Args:
+            context: The injection context to use
+        """
+        return cls.iter_query(context, None, None, {"pending_pub": []})
+
     @classmethod
     async def retrieve_by_revoc_reg_id(
         cls, context: InjectionContext, revoc_reg_id: str
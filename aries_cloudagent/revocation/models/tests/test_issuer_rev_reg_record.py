@@ -149,6 +149,10 @@ class TestRecord(AsyncTestCase):
 
         found = await IssuerRevRegRecord.query_by_pending(self.context)
         assert len(found) == 1 and found[0] == rec
+        found = [
+            record async for record in IssuerRevRegRecord.iter_by_pending(self.context)
+        ]
+        assert found == [rec]
 
         await rec.clear_pending(self.context)
         found = await IssuerRevRegRecord.query_by_pending(self.context)
@@ -1,7 +1,7 @@
 """Abstract base classes for non-secrets storage."""
 
 from abc import ABC, abstractmethod
-from typing import Mapping, Sequence
+from typing import Mapping, Optional, Sequence
 
 from .error import StorageDuplicateError, StorageNotFoundError
 from .record import StorageRecord
@@ -62,6 +62,19 @@ class BaseStorage(ABC):
 
         """
 
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """
+        Update an existing stored record's value and tags.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+            tags: The new tags
+
+        """
+        await self.update_record_value(record, value)
+        await self.update_record_tags(record, tags)
+
     @abstractmethod
     async def delete_record_tags(
         self, record: StorageRecord, tags: (Sequence, Mapping)
@@ -85,6 +98,48 @@ class BaseStorage(ABC):
 
         """
 
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add a batch of new records to the store.
+
+        Implementations should add either all of the records or none of them
+        where the backend allows.
+
+        Args:
+            records: the `StorageRecord` instances to be stored
+
+        """
+        for record in records:
+            await self.add_record(record)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update the values and tags of a batch of existing stored records.
+
+        Implementations should update either all of the records or none of them
+        where the backend allows.
+
+        Args:
+            records: the `StorageRecord` instances holding the new values and tags
+
+        """
+        for record in records:
+            await self.update_record(record, record.value, record.tags)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete a batch of existing records.
+
+        Implementations should delete either all of the records or none of them
+        where the backend allows.
+
+        Args:
+            records: the `StorageRecord` instances to delete
+
+        """
+        for record in records:
+            await self.delete_record(record)
+
     @abstractmethod
     def search_records(
         self,
@@ -236,6 +291,63 @@ class BaseStorageRecordSearch(ABC):
 
         """
 
+    async def skip(self, count: int) -> int:
+        """
+        Skip over the next results of the search, as when resuming from an offset.
+
+        Args:
+            count: The number of results to skip
+
+        Returns:
+            The number of results skipped, less than `count` if the search
+            was exhausted
+
+        """
+        if not self.opened:
+            await self.open()
+        skipped = 0
+        if self._buffer:
+            skipped = min(count, len(self._buffer))
+            del self._buffer[:skipped]
+        while skipped < count:
+            rows = await self.fetch(min(count - skipped, self.page_size))
+            if not rows:
+                break
+            skipped += len(rows)
+        return skipped
+
+    def position(self, record: StorageRecord) -> Optional[int]:
+        """
+        Get the position of a fetched record in the order of the search results.
+
+        Positions increase in the order results are returned, and do not change
+        when other records are added or removed.
+
+        Args:
+            record: A record returned by the last fetch
+
+        Returns:
+            The position of the record, or `None` if the backend cannot resume
+            a search after a position
+
+        """
+        return None
+
+    async def resume_after(self, position: int) -> bool:
+        """
+        Continue the search after the record at a position.
+
+        Unlike skipping, earlier results are not loaded.
+
+        Args:
+            position: The position of a record, as returned by `position`
+
+        Returns:
+            False if the backend cannot resume a search after a position
+
+        """
+        return False
+
     async def fetch_all(self) -> Sequence[StorageRecord]:
         """Fetch all records from the query."""
         results = []
@@ -26,6 +26,100 @@ class BasicStorage(BaseStorage):
 
         """
         self._records = OrderedDict()
+        # record IDs by record type, and by (record type, tag name, tag value)
+        self._type_index = {}
+        self._tag_index = {}
+        # insertion sequence numbers, used to return search results in order
+        self._sequence = {}
+        self._next_sequence = 1
+
+    def _put_record(self, record: StorageRecord):
+        """Store a new or updated record, maintaining the search indexes."""
+        oldrec = self._records.get(record.id)
+        if oldrec:
+            # keep the position of updated records in the type index
+            if oldrec.type == record.type:
+                self._unindex_tags(oldrec)
+            else:
+                self._unindex_record(oldrec)
+        else:
+            self._sequence[record.id] = self._next_sequence
+            self._next_sequence += 1
+        self._records[record.id] = record
+        self._type_index.setdefault(record.type, {})[record.id] = None
+        for name, value in (record.tags or {}).items():
+            if isinstance(value, str):
+                self._tag_index.setdefault((record.type, name, value), {})[
+                    record.id
+                ] = None
+
+    def _remove_record(self, record_id: str):
+        """Remove a record, maintaining the search indexes."""
+        record = self._records.pop(record_id)
+        self._unindex_record(record)
+        del self._sequence[record_id]
+
+    def _unindex_record(self, record: StorageRecord):
+        """Remove a record from the search indexes."""
+        _discard_index(self._type_index, record.type, record.id)
+        self._unindex_tags(record)
+
+    def _unindex_tags(self, record: StorageRecord):
+        """Remove the tags of a record from the search indexes."""
+        for name, value in (record.tags or {}).items():
+            if isinstance(value, str):
+                _discard_index(self._tag_index, (record.type, name, value), record.id)
+
+    def _query_candidates(self, record_type: str, tag_query: Mapping):
+        """
+        Find the IDs of records which may match a tag query using the indexes.
+
+        Returns:
+            A collection of candidate record IDs, or `None` if the query cannot
+            be resolved using the indexes
+
+        """
+        if not tag_query:
+            return None
+        result = None
+        for k, v in tag_query.items():
+            found = None
+            if k == "$and" and isinstance(v, list):
+                found = _intersect(
+                    [self._query_candidates(record_type, clause) for clause in v]
+                )
+            elif k == "$or" and isinstance(v, list):
+                options = [self._query_candidates(record_type, clause) for clause in v]
+                if options and all(opt is not None for opt in options):
+                    found = set().union(*options)
+            elif k[0] == "$":
+                pass
+            elif isinstance(v, str):
+                found = self._tag_index.get((record_type, k, v), ())
+            elif (
+                isinstance(v, dict)
+                and len(v) == 1
+                and isinstance(v.get("$in"), list)
+                and all(isinstance(value, str) for value in v["$in"])
+            ):
+                found = set()
+                for value in v["$in"]:
+                    found.update(self._tag_index.get((record_type, k, value), ()))
+            result = _intersect([result, found])
+            if result is not None and not result:
+                break
+        return result
+
+    def _find_records(self, record_type: str, tag_query: Mapping) -> Sequence[str]:
+        """Find the IDs of records which may match a search, in insertion order."""
+        candidates = self._query_candidates(record_type, tag_query)
+        if candidates is None:
+            return list(self._type_index.get(record_type, ()))
+        sequence = self._sequence
+        return sorted(
+            (record_id for record_id in candidates if record_id in sequence),
+            key=sequence.get,
+        )
 
     async def add_record(self, record: StorageRecord):
         """
@@ -45,7 +139,7 @@ class BasicStorage(BaseStorage):
             raise StorageError("Record has no ID")
         if record.id in self._records:
             raise StorageDuplicateError("Duplicate record")
-        self._records[record.id] = record
+        self._put_record(record)
 
     async def get_record(
         self, record_type: str, record_id: str, options: Mapping = None
@@ -86,7 +180,7 @@ class BasicStorage(BaseStorage):
         oldrec = self._records.get(record.id)
         if not oldrec:
             raise StorageNotFoundError("Record not found: {}".format(record.id))
-        self._records[record.id] = oldrec._replace(value=value)
+        self._put_record(oldrec._replace(value=value))
 
     async def update_record_tags(self, record: StorageRecord, tags: Mapping):
         """
@@ -103,7 +197,25 @@ class BasicStorage(BaseStorage):
         oldrec = self._records.get(record.id)
         if not oldrec:
             raise StorageNotFoundError("Record not found: {}".format(record.id))
-        self._records[record.id] = oldrec._replace(tags=dict(tags or {}))
+        self._put_record(oldrec._replace(tags=dict(tags or {})))
+
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """
+        Update an existing stored record's value and tags.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+            tags: The new tags
+
+        Raises:
+            StorageNotFoundError: If record not found
+
+        """
+        oldrec = self._records.get(record.id)
+        if not oldrec:
+            raise StorageNotFoundError("Record not found: {}".format(record.id))
+        self._put_record(oldrec._replace(value=value, tags=dict(tags or {})))
 
     async def delete_record_tags(
         self, record: StorageRecord, tags: (Sequence, Mapping)
@@ -127,7 +239,7 @@ class BasicStorage(BaseStorage):
             for tag in tags:
                 if tag in newtags:
                     del newtags[tag]
-        self._records[record.id] = oldrec._replace(tags=newtags)
+        self._put_record(oldrec._replace(tags=newtags))
 
     async def delete_record(self, record: StorageRecord):
         """
@@ -142,7 +254,71 @@ class BasicStorage(BaseStorage):
         """
         if record.id not in self._records:
             raise StorageNotFoundError("Record not found: {}".format(record.id))
-        del self._records[record.id]
+        self._remove_record(record.id)
+
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add a batch of new records to the store.
+
+        No records are added if any of them is invalid or a duplicate.
+
+        Args:
+            records: the `StorageRecord` instances to be stored
+
+        Raises:
+            StorageError: If a record is missing or has no ID
+            StorageDuplicateError: If a record ID is already in use
+
+        """
+        batch_ids = set()
+        for record in records:
+            if not record:
+                raise StorageError("No record provided")
+            if not record.id:
+                raise StorageError("Record has no ID")
+            if record.id in self._records or record.id in batch_ids:
+                raise StorageDuplicateError("Duplicate record")
+            batch_ids.add(record.id)
+        for record in records:
+            self._put_record(record)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update the values and tags of a batch of existing stored records.
+
+        No records are updated if any of them is not found.
+
+        Args:
+            records: the `StorageRecord` instances holding the new values and tags
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+
+        """
+        for record in records:
+            if record.id not in self._records:
+                raise StorageNotFoundError("Record not found: {}".format(record.id))
+        for record in records:
+            await self.update_record(record, record.value, record.tags)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete a batch of existing records.
+
+        No records are deleted if any of them is not found.
+
+        Args:
+            records: the `StorageRecord` instances to delete
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+
+        """
+        for record in records:
+            if record.id not in self._records:
+                raise StorageNotFoundError("Record not found: {}".format(record.id))
+        for record in records:
+            self._remove_record(record.id)
 
     def search_records(
         self,
@@ -169,6 +345,28 @@ class BasicStorage(BaseStorage):
         )
 
 
+def _discard_index(index: dict, key, record_id: str):
+    """Remove a record ID from an index entry, dropping the entry once empty."""
+    ids = index.get(key)
+    if ids is not None:
+        ids.pop(record_id, None)
+        if not ids:
+            del index[key]
+
+
+def _intersect(candidates: Sequence):
+    """Intersect collections of candidate record IDs, ignoring unresolved ones."""
+    result = None
+    for found in sorted((c for c in candidates if c is not None), key=len):
+        if result is None:
+            result = set(found)
+        else:
+            result.intersection_update(found)
+        if not result:
+            break
+    return result
+
+
 def basic_tag_value_match(value: str, match: dict) -> bool:
     """Match a single tag against a tag subquery.
 
@@ -218,6 +416,10 @@ def basic_tag_query_match(tags: dict, tag_query: dict) -> bool:
                     if basic_tag_query_match(tags, opt):
                         chk = True
                         break
+            elif k == "$and":
+                if not isinstance(v, list):
+                    raise StorageSearchError("Expected list for $and filter value")
+                chk = all(basic_tag_query_match(tags, opt) for opt in v)
             elif k == "$not":
                 if not isinstance(v, dict):
                     raise StorageSearchError("Expected dict for $not filter value")
@@ -263,8 +465,9 @@ class BasicStorageRecordSearch(BaseStorageRecordSearch):
         super(BasicStorageRecordSearch, self).__init__(
             store, type_filter, tag_query, page_size, options
         )
-        self._cache = None
+        self._ids = None
         self._iter = None
+        self._positions = {}
 
     @property
     def opened(self) -> bool:
@@ -275,7 +478,7 @@ class BasicStorageRecordSearch(BaseStorageRecordSearch):
             True if opened, else False
 
         """
-        return self._cache is not None
+        return self._ids is not None
 
     async def fetch(self, max_count: int) -> Sequence[StorageRecord]:
         """
@@ -295,25 +498,47 @@ class BasicStorageRecordSearch(BaseStorageRecordSearch):
             raise StorageSearchError("Search query has not been opened")
         ret = []
         check_type = self.type_filter
+        records = self._store._records
+        sequence = self._store._sequence
+        self._positions = positions = {}
         i = max_count
         while i > 0:
             try:
                 id = next(self._iter)
             except StopIteration:
                 break
-            record = self._cache[id]
-            if record.type == check_type and basic_tag_query_match(
-                record.tags, self.tag_query
+            record = records.get(id)
+            # re-check candidates, which may have changed since the search opened
+            if (
+                record
+                and record.type == check_type
+                and basic_tag_query_match(record.tags, self.tag_query)
             ):
                 ret.append(record)
+                positions[id] = sequence[id]
                 i -= 1
         return ret
 
+    def position(self, record: StorageRecord) -> int:
+        """Get the insertion sequence number of a record returned by the last fetch."""
+        return self._positions.get(record.id)
+
+    async def resume_after(self, position: int) -> bool:
+        """Continue the search after the record with a sequence number."""
+        if not self.opened:
+            await self.open()
+        self._buffer = None
+        sequence = self._store._sequence
+        self._iter = iter(
+            [id for id in self._iter if sequence.get(id, position) > position]
+        )
+        return True
+
     async def open(self):
         """Start the search query."""
-        self._cache = self._store._records.copy()
-        self._iter = iter(self._cache)
+        self._ids = self._store._find_records(self.type_filter, self.tag_query)
+        self._iter = iter(self._ids)
 
     async def close(self):
         """Dispose of the search query."""
-        self._cache = None
+        self._ids = None
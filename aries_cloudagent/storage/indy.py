@@ -1,7 +1,8 @@
 """Indy implementation of BaseStorage interface."""
 
+import asyncio
 import json
-from typing import Mapping, Sequence
+from typing import Awaitable, Callable, Mapping, Sequence, Tuple
 
 from indy import non_secrets
 from indy.error import IndyError, ErrorCode
@@ -31,6 +32,9 @@ def _validate_record(record: StorageRecord):
 class IndyStorage(BaseStorage):
     """Indy Non-Secrets interface."""
 
+    # maximum number of concurrent wallet calls issued for batch operations
+    BATCH_SIZE = 100
+
     def __init__(self, wallet: IndyWallet):
         """
         Initialize a `BasicStorage` instance.
@@ -162,6 +166,28 @@ class IndyStorage(BaseStorage):
                 raise StorageNotFoundError("Record not found: {}".format(record.id))
             raise StorageError(str(x_indy))
 
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """
+        Update an existing stored record's value and tags.
+
+        The non-secrets API has no combined update, so the value and tag
+        updates are issued concurrently to share a single wait.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+            tags: The new tags
+
+        Raises:
+            StorageNotFoundError: If record not found
+            StorageError: If a libindy error occurs
+
+        """
+        await asyncio.gather(
+            self.update_record_value(record, value),
+            self.update_record_tags(record, tags),
+        )
+
     async def delete_record_tags(
         self, record: StorageRecord, tags: (Sequence, Mapping)
     ):
@@ -205,6 +231,105 @@ class IndyStorage(BaseStorage):
                 raise StorageNotFoundError("Record not found: {}".format(record.id))
             raise StorageError(str(x_indy))
 
+    async def _run_batch(
+        self, records: Sequence[StorageRecord], operation: Callable[..., Awaitable]
+    ) -> Tuple[Sequence[StorageRecord], Exception]:
+        """
+        Apply an operation to a batch of records with concurrent wallet calls.
+
+        The records are processed in chunks, and no further chunks are started
+        after a chunk in which the operation failed.
+
+        Returns:
+            A tuple of the list of records for which the operation succeeded
+            and the first error encountered, if any
+
+        """
+        for record in records:
+            _validate_record(record)
+        completed = []
+        error = None
+        for start in range(0, len(records), self.BATCH_SIZE):
+            end = start + self.BATCH_SIZE
+            chunk = records[start:end]
+            results = await asyncio.gather(
+                *(operation(record) for record in chunk), return_exceptions=True
+            )
+            for record, result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    error = error or result
+                else:
+                    completed.append(record)
+            if error:
+                break
+        return completed, error
+
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add a batch of new records to the store.
+
+        If any record cannot be added, the records which were added are removed.
+
+        Args:
+            records: the `StorageRecord` instances to be stored
+
+        Raises:
+            StorageDuplicateError: If a record ID is already in use
+            StorageError: If a libindy error occurs
+
+        """
+        added, error = await self._run_batch(records, self.add_record)
+        if error:
+            await asyncio.gather(
+                *(self.delete_record(record) for record in added),
+                return_exceptions=True,
+            )
+            raise error
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update the values and tags of a batch of existing stored records.
+
+        The wallet does not support transactions, so if some records cannot be
+        updated the records already updated keep their changes. Records after
+        the chunk containing the failure are not updated.
+
+        Args:
+            records: the `StorageRecord` instances holding the new values and tags
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+            StorageError: If a libindy error occurs
+
+        """
+
+        async def update(record: StorageRecord):
+            await self.update_record(record, record.value, record.tags)
+
+        _, error = await self._run_batch(records, update)
+        if error:
+            raise error
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete a batch of existing records.
+
+        The wallet does not support transactions, so if some records cannot be
+        deleted the records already deleted stay deleted. Records after the
+        chunk containing the failure are not deleted.
+
+        Args:
+            records: the `StorageRecord` instances to delete
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+            StorageError: If a libindy error occurs
+
+        """
+        _, error = await self._run_batch(records, self.delete_record)
+        if error:
+            raise error
+
     def search_records(
         self,
         type_filter: str,
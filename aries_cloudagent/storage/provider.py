@@ -16,6 +16,7 @@ class StorageProvider(BaseProvider):
         "basic": "aries_cloudagent.storage.basic.BasicStorage",
         "indy": "aries_cloudagent.storage.indy.IndyStorage",
         "postgres_storage": "aries_cloudagent.storage.indy.IndyStorage",
+        "sqlite": "aries_cloudagent.storage.sqlite.SqliteStorage",
     }
 
     async def provide(self, settings: BaseSettings, injector: BaseInjector):
@@ -24,7 +25,9 @@ class StorageProvider(BaseProvider):
         wallet: BaseWallet = await injector.inject(BaseWallet)
 
         wallet_type = settings.get_value("wallet.type", default="basic").lower()
-        storage_default_type = "indy" if wallet_type == "indy" else "basic"
+        storage_default_type = (
+            wallet_type if wallet_type in ("indy", "sqlite") else "basic"
+        )
         storage_type = settings.get_value(
             "storage.type", default=storage_default_type
         ).lower()
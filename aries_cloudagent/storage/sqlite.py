@@ -0,0 +1,581 @@
+"""SQLite implementation of BaseStorage interface."""
+
+import sqlite3
+from typing import Mapping, Sequence, Tuple
+
+from .base import BaseStorage, BaseStorageRecordSearch
+from .error import (
+    StorageError,
+    StorageDuplicateError,
+    StorageNotFoundError,
+    StorageSearchError,
+)
+from .record import StorageRecord
+from ..wallet.sqlite import SqliteWallet
+
+TAG_OPERATORS = {
+    "$neq": "!=",
+    "$gt": ">",
+    "$gte": ">=",
+    "$lt": "<",
+    "$lte": "<=",
+    "$like": "LIKE",
+}
+
+
+def _validate_record(record: StorageRecord):
+    if not record:
+        raise StorageError("No record provided")
+    if not record.id:
+        raise StorageError("Record has no ID")
+    if not record.type:
+        raise StorageError("Record has no type")
+
+
+def _tag_clause(name: str, op: str, values: Sequence[str]) -> Tuple[str, list]:
+    """Build a clause matching items with a tag value."""
+    if op == "IN":
+        cmp = "IN ({})".format(", ".join("?" * len(values)))
+    else:
+        cmp = op + " ?"
+    return (
+        f"seq IN (SELECT item FROM tags WHERE name = ? AND value {cmp})",
+        [name, *values],
+    )
+
+
+def wql_to_sql(tag_query: Mapping) -> Tuple[str, list]:
+    """
+    Convert a WQL tag query into a SQL condition on the items table.
+
+    Args:
+        tag_query: the tag query to convert
+
+    Returns:
+        A tuple of the SQL condition and its parameters
+
+    Raises:
+        StorageSearchError: If the tag query is invalid
+
+    """
+    clauses = []
+    params = []
+    for k, v in (tag_query or {}).items():
+        if k in ("$or", "$and"):
+            if not isinstance(v, list):
+                raise StorageSearchError(
+                    "Expected list for {} filter value".format(k)
+                )
+            subclauses = []
+            for opt in v:
+                sql, sub_params = wql_to_sql(opt)
+                subclauses.append(sql)
+                params.extend(sub_params)
+            if k == "$or":
+                clauses.append(
+                    "({})".format(" OR ".join(subclauses)) if subclauses else "0"
+                )
+            elif subclauses:
+                clauses.append("({})".format(" AND ".join(subclauses)))
+        elif k == "$not":
+            if not isinstance(v, dict):
+                raise StorageSearchError("Expected dict for $not filter value")
+            sql, sub_params = wql_to_sql(v)
+            clauses.append(f"NOT ({sql})")
+            params.extend(sub_params)
+        elif k[0] == "$":
+            raise StorageSearchError("Unexpected filter operator: {}".format(k))
+        elif isinstance(v, str):
+            sql, sub_params = _tag_clause(k, "=", [v])
+            clauses.append(sql)
+            params.extend(sub_params)
+        elif isinstance(v, dict):
+            if len(v) != 1:
+                raise StorageSearchError("Unsupported subquery: {}".format(v))
+            op, cmp_val = list(v.items())[0]
+            if op == "$in":
+                if not isinstance(cmp_val, list):
+                    raise StorageSearchError("Expected list for $in value")
+                sql, sub_params = (
+                    _tag_clause(k, "IN", cmp_val) if cmp_val else ("0", [])
+                )
+            elif op in TAG_OPERATORS:
+                if not isinstance(cmp_val, str):
+                    raise StorageSearchError("Expected string for filter value")
+                sql, sub_params = _tag_clause(k, TAG_OPERATORS[op], [cmp_val])
+            else:
+                raise StorageSearchError("Unsupported match operator: {}".format(op))
+            clauses.append(sql)
+            params.extend(sub_params)
+        else:
+            raise StorageSearchError(
+                "Expected string or dict for filter value, got {}".format(v)
+            )
+    return (" AND ".join(clauses) if clauses else "1"), params
+
+
+class SqliteStorage(BaseStorage):
+    """SQLite-backed storage class."""
+
+    def __init__(self, wallet: SqliteWallet):
+        """
+        Initialize a `SqliteStorage` instance.
+
+        Args:
+            wallet: The SQLite wallet instance holding the database
+
+        """
+        self._wallet = wallet
+
+    @property
+    def wallet(self) -> SqliteWallet:
+        """Accessor for SqliteWallet instance."""
+        return self._wallet
+
+    async def _run(self, fn, *args, transaction: bool = False):
+        """Run a database function on the wallet connection pool."""
+        pool = self._wallet.pool
+        if not pool:
+            raise StorageError("Wallet is not open")
+        try:
+            if transaction:
+                return await pool.transaction(fn, *args)
+            return await pool.run(fn, *args)
+        except sqlite3.IntegrityError as err:
+            raise StorageDuplicateError("Duplicate record") from err
+        except sqlite3.Error as err:
+            raise StorageError(str(err)) from err
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, record: StorageRecord):
+        seq = conn.execute(
+            "INSERT INTO items (type, id, value) VALUES (?, ?, ?)",
+            (record.type, record.id, record.value),
+        ).lastrowid
+        SqliteStorage._insert_tags(conn, seq, record.tags)
+
+    @staticmethod
+    def _insert_tags(conn: sqlite3.Connection, seq: int, tags: Mapping):
+        if tags:
+            conn.executemany(
+                "INSERT OR REPLACE INTO tags (item, name, value) VALUES (?, ?, ?)",
+                ((seq, name, value) for name, value in tags.items()),
+            )
+
+    @staticmethod
+    def _find(conn: sqlite3.Connection, record: StorageRecord) -> int:
+        row = conn.execute(
+            "SELECT seq FROM items WHERE type = ? AND id = ?", (record.type, record.id)
+        ).fetchone()
+        if not row:
+            raise StorageNotFoundError("Record not found: {}".format(record.id))
+        return row[0]
+
+    @staticmethod
+    def _update(conn: sqlite3.Connection, record: StorageRecord, value, tags):
+        seq = SqliteStorage._find(conn, record)
+        if value is not None:
+            conn.execute("UPDATE items SET value = ? WHERE seq = ?", (value, seq))
+        if tags is not None:
+            conn.execute("DELETE FROM tags WHERE item = ?", (seq,))
+            SqliteStorage._insert_tags(conn, seq, tags)
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, record: StorageRecord):
+        seq = SqliteStorage._find(conn, record)
+        conn.execute("DELETE FROM items WHERE seq = ?", (seq,))
+
+    async def add_record(self, record: StorageRecord):
+        """
+        Add a new record to the store.
+
+        Args:
+            record: `StorageRecord` to be stored
+
+        Raises:
+            StorageError: If no record is provided
+            StorageError: If the record has no ID
+            StorageDuplicateError: If the record ID is already in use
+
+        """
+        _validate_record(record)
+        await self._run(self._insert, record, transaction=True)
+
+    async def get_record(
+        self, record_type: str, record_id: str, options: Mapping = None
+    ) -> StorageRecord:
+        """
+        Fetch a record from the store by type and ID.
+
+        Args:
+            record_type: The record type
+            record_id: The record id
+            options: A dictionary of backend-specific options
+
+        Returns:
+            A `StorageRecord` instance
+
+        Raises:
+            StorageNotFoundError: If the record is not found
+
+        """
+        if not record_type:
+            raise StorageError("Record type not provided")
+        if not record_id:
+            raise StorageError("Record ID not provided")
+        retrieve_tags = (options or {}).get("retrieveTags", True)
+
+        def fetch(conn: sqlite3.Connection):
+            row = conn.execute(
+                "SELECT seq, value FROM items WHERE type = ? AND id = ?",
+                (record_type, record_id),
+            ).fetchone()
+            if not row:
+                return None
+            tags = None
+            if retrieve_tags:
+                tags = dict(
+                    conn.execute(
+                        "SELECT name, value FROM tags WHERE item = ?", (row[0],)
+                    )
+                )
+            return row[1], tags
+
+        result = await self._run(fetch)
+        if not result:
+            raise StorageNotFoundError("Record not found: {}".format(record_id))
+        return StorageRecord(
+            type=record_type, id=record_id, value=result[0], tags=result[1]
+        )
+
+    async def update_record_value(self, record: StorageRecord, value: str):
+        """
+        Update an existing stored record's value.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+
+        Raises:
+            StorageNotFoundError: If record not found
+
+        """
+        _validate_record(record)
+        await self._run(self._update, record, value, None, transaction=True)
+
+    async def update_record_tags(self, record: StorageRecord, tags: Mapping):
+        """
+        Update an existing stored record's tags.
+
+        Args:
+            record: `StorageRecord` to update
+            tags: New tags
+
+        Raises:
+            StorageNotFoundError: If record not found
+
+        """
+        _validate_record(record)
+        await self._run(self._update, record, None, tags or {}, transaction=True)
+
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """
+        Update an existing stored record's value and tags in one transaction.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+            tags: The new tags
+
+        Raises:
+            StorageNotFoundError: If record not found
+
+        """
+        _validate_record(record)
+        await self._run(self._update, record, value, tags or {}, transaction=True)
+
+    async def delete_record_tags(
+        self, record: StorageRecord, tags: (Sequence, Mapping)
+    ):
+        """
+        Update an existing stored record's tags.
+
+        Args:
+            record: `StorageRecord` to delete
+            tags: Tags
+
+        Raises:
+            StorageNotFoundError: If record not found
+
+        """
+        _validate_record(record)
+
+        def delete_tags(conn: sqlite3.Connection):
+            seq = self._find(conn, record)
+            if tags:
+                conn.executemany(
+                    "DELETE FROM tags WHERE item = ? AND name = ?",
+                    ((seq, name) for name in tags),
+                )
+
+        await self._run(delete_tags, transaction=True)
+
+    async def delete_record(self, record: StorageRecord):
+        """
+        Delete a record.
+
+        Args:
+            record: `StorageRecord` to delete
+
+        Raises:
+            StorageNotFoundError: If record not found
+
+        """
+        _validate_record(record)
+        await self._run(self._delete, record, transaction=True)
+
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add a batch of new records to the store in a single transaction.
+
+        No records are added if any of them is invalid or a duplicate.
+
+        Args:
+            records: the `StorageRecord` instances to be stored
+
+        Raises:
+            StorageError: If a record is missing or has no ID
+            StorageDuplicateError: If a record ID is already in use
+
+        """
+        for record in records:
+            _validate_record(record)
+
+        def insert_all(conn: sqlite3.Connection):
+            for record in records:
+                self._insert(conn, record)
+
+        if records:
+            await self._run(insert_all, transaction=True)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Update the values and tags of a batch of records in a single transaction.
+
+        No records are updated if any of them is not found.
+
+        Args:
+            records: the `StorageRecord` instances holding the new values and tags
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+
+        """
+        for record in records:
+            _validate_record(record)
+
+        def update_all(conn: sqlite3.Connection):
+            for record in records:
+                self._update(conn, record, record.value, record.tags or {})
+
+        if records:
+            await self._run(update_all, transaction=True)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete a batch of existing records in a single transaction.
+
+        No records are deleted if any of them is not found.
+
+        Args:
+            records: the `StorageRecord` instances to delete
+
+        Raises:
+            StorageNotFoundError: If a record is not found
+
+        """
+        for record in records:
+            _validate_record(record)
+
+        def delete_all(conn: sqlite3.Connection):
+            for record in records:
+                self._delete(conn, record)
+
+        if records:
+            await self._run(delete_all, transaction=True)
+
+    def search_records(
+        self,
+        type_filter: str,
+        tag_query: Mapping = None,
+        page_size: int = None,
+        options: Mapping = None,
+    ) -> "SqliteStorageRecordSearch":
+        """
+        Search stored records.
+
+        Args:
+            type_filter: Filter string
+            tag_query: Tags to query
+            page_size: Page size
+            options: Dictionary of backend-specific options
+
+        Returns:
+            An instance of `SqliteStorageRecordSearch`
+
+        """
+        return SqliteStorageRecordSearch(
+            self, type_filter, tag_query, page_size, options
+        )
+
+
+class SqliteStorageRecordSearch(BaseStorageRecordSearch):
+    """Represent an active stored records search."""
+
+    def __init__(
+        self,
+        store: SqliteStorage,
+        type_filter: str,
+        tag_query: Mapping,
+        page_size: int = None,
+        options: Mapping = None,
+    ):
+        """
+        Initialize a `SqliteStorageRecordSearch` instance.
+
+        Args:
+            store: `BaseStorage` to search
+            type_filter: Filter string
+            tag_query: Tags to search
+            page_size: Size of page to return
+            options: Dictionary of backend-specific options
+
+        """
+        super(SqliteStorageRecordSearch, self).__init__(
+            store, type_filter, tag_query, page_size, options
+        )
+        self._condition = None
+        self._last_seq = None
+        self._positions = {}
+
+    @property
+    def opened(self) -> bool:
+        """
+        Accessor for open state.
+
+        Returns:
+            True if opened, else False
+
+        """
+        return self._condition is not None
+
+    async def fetch(self, max_count: int) -> Sequence[StorageRecord]:
+        """
+        Fetch the next list of results from the store.
+
+        Results are returned in insertion order, resuming after the last record
+        returned so that pages remain consistent as records are added.
+
+        Args:
+            max_count: Max number of records to return
+
+        Returns:
+            A list of `StorageRecord`
+
+        Raises:
+            StorageSearchError: If the search query has not been opened
+
+        """
+        if not self.opened:
+            raise StorageSearchError("Search query has not been opened")
+        sql, params = self._condition
+        retrieve_tags = self.option("retrieveTags", True)
+        last_seq = self._last_seq
+
+        def fetch_page(conn: sqlite3.Connection):
+            rows = conn.execute(
+                f"SELECT seq, id, value FROM items WHERE type = ? AND seq > ? "
+                f"AND {sql} ORDER BY seq LIMIT ?",
+                (self.type_filter, last_seq, *params, max_count),
+            ).fetchall()
+            tags = {}
+            if rows and retrieve_tags:
+                seqs = [row[0] for row in rows]
+                for item, name, value in conn.execute(
+                    "SELECT item, name, value FROM tags WHERE item IN ({})".format(
+                        ", ".join("?" * len(seqs))
+                    ),
+                    seqs,
+                ):
+                    tags.setdefault(item, {})[name] = value
+            return rows, tags
+
+        rows, tags = await self.store._run(fetch_page)
+        if rows:
+            self._last_seq = rows[-1][0]
+        self._positions = {record_id: seq for seq, record_id, _ in rows}
+        return [
+            StorageRecord(
+                type=self.type_filter,
+                id=record_id,
+                value=value,
+                tags=tags.get(seq) if retrieve_tags else None,
+            )
+            for seq, record_id, value in rows
+        ]
+
+    async def skip(self, count: int) -> int:
+        """
+        Skip over the next results of the search without loading them.
+
+        Args:
+            count: The number of results to skip
+
+        Returns:
+            The number of results skipped, less than `count` if the search
+            was exhausted
+
+        """
+        if not self.opened:
+            await self.open()
+        skipped = 0
+        if self._buffer:
+            skipped = min(count, len(self._buffer))
+            del self._buffer[:skipped]
+        if skipped >= count:
+            return skipped
+        sql, params = self._condition
+        last_seq = self._last_seq
+
+        def skip_rows(conn: sqlite3.Connection):
+            return conn.execute(
+                f"SELECT COUNT(*), MAX(seq) FROM (SELECT seq FROM items "
+                f"WHERE type = ? AND seq > ? AND {sql} ORDER BY seq LIMIT ?)",
+                (self.type_filter, last_seq, *params, count - skipped),
+            ).fetchone()
+
+        found, max_seq = await self.store._run(skip_rows)
+        if found:
+            self._last_seq = max_seq
+        return skipped + found
+
+    def position(self, record: StorageRecord) -> int:
+        """Get the sequence number of a record returned by the last fetch."""
+        return self._positions.get(record.id)
+
+    async def resume_after(self, position: int) -> bool:
+        """Continue the search after the record with a sequence number."""
+        if not self.opened:
+            await self.open()
+        self._buffer = None
+        self._last_seq = max(self._last_seq, position)
+        return True
+
+    async def open(self):
+        """Start the search query."""
+        self._condition = wql_to_sql(self.tag_query)
+        self._last_seq = 0
+
+    async def close(self):
+        """Dispose of the search query."""
+        self._condition = None
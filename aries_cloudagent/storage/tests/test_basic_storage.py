@@ -88,6 +88,21 @@ class TestBasicStorage:
         with pytest.raises(StorageNotFoundError):
             await store.update_record_value(missing, missing.value)
 
+    @pytest.mark.asyncio
+    async def test_update_record(self, store):
+        record = test_record({"a": "A"})._replace(value="a")
+        await store.add_record(record)
+        await store.update_record(record, "b", {"b": "B"})
+        result = await store.get_record(record.type, record.id)
+        assert result.value == "b"
+        assert result.tags == {"b": "B"}
+
+    @pytest.mark.asyncio
+    async def test_update_record_missing(self, store):
+        missing = test_missing_record()
+        with pytest.raises(StorageNotFoundError):
+            await store.update_record(missing, missing.value, {})
+
     @pytest.mark.asyncio
     async def test_update_tags(self, store):
         record = test_record({})
@@ -117,6 +132,62 @@ class TestBasicStorage:
         with pytest.raises(StorageNotFoundError):
             await store.delete_record_tags(missing, {"a": "A"})
 
+    @pytest.mark.asyncio
+    async def test_add_records(self, store):
+        records = [test_record({"a": str(i)}) for i in range(5)]
+        await store.add_records(records)
+        for record in records:
+            result = await store.get_record(record.type, record.id)
+            assert result.value == record.value
+            assert result.tags == record.tags
+
+    @pytest.mark.asyncio
+    async def test_add_records_duplicate(self, store):
+        existing = test_record()
+        await store.add_record(existing)
+        records = [test_record(), existing._replace(value="OTHER"), test_record()]
+        with pytest.raises(StorageDuplicateError):
+            await store.add_records(records)
+        for record in (records[0], records[2]):
+            with pytest.raises(StorageNotFoundError):
+                await store.get_record(record.type, record.id)
+        result = await store.get_record(existing.type, existing.id)
+        assert result.value == existing.value
+
+    @pytest.mark.asyncio
+    async def test_update_records(self, store):
+        records = [test_record({"a": str(i)}) for i in range(3)]
+        await store.add_records(records)
+        updated = [
+            record._replace(value=f"UPDATED{i}", tags={"b": str(i)})
+            for i, record in enumerate(records)
+        ]
+        await store.update_records(updated)
+        for record in updated:
+            result = await store.get_record(record.type, record.id)
+            assert result.value == record.value
+            assert result.tags == record.tags
+
+    @pytest.mark.asyncio
+    async def test_update_records_missing(self, store):
+        record = test_record()
+        await store.add_record(record)
+        with pytest.raises(StorageNotFoundError):
+            await store.update_records([test_missing_record()])
+
+    @pytest.mark.asyncio
+    async def test_delete_records(self, store):
+        records = [test_record() for i in range(3)]
+        await store.add_records(records)
+        await store.delete_records(records[:2])
+        for record in records[:2]:
+            with pytest.raises(StorageNotFoundError):
+                await store.get_record(record.type, record.id)
+        assert await store.get_record(records[2].type, records[2].id)
+
+        with pytest.raises(StorageNotFoundError):
+            await store.delete_records([test_missing_record()])
+
     @pytest.mark.asyncio
     async def test_search(self, store):
         record = test_record()
@@ -147,8 +218,105 @@ class TestBasicStorage:
             count += 1
         assert count == 1
 
+    @pytest.mark.asyncio
+    async def test_resume_after(self, store):
+        records = [StorageRecord("TYPE", str(i), {"num": str(i)}) for i in range(5)]
+        await store.add_records(records)
+        search = store.search_records("TYPE", {})
+        await search.open()
+        rows = await search.fetch(2)
+        position = search.position(rows[-1])
+        assert position > search.position(rows[0])
+        await search.close()
+
+        # later records are not shifted by changes to earlier ones
+        await store.delete_record(records[0])
+        await store.add_record(StorageRecord("TYPE", "5"))
+        search = store.search_records("TYPE", {"num": {"$neq": "3"}})
+        assert await search.resume_after(position)
+        assert [row.value for row in await search.fetch_all()] == ["2", "4"]
+
     @pytest.mark.asyncio
     async def test_closed_search(self, store):
         search = store.search_records("TYPE", {}, None)
         with pytest.raises(StorageSearchError):
             await search.fetch(100)
+
+
+class TestBasicStorageIndexes:
+    async def populate(self, store):
+        records = [
+            StorageRecord(
+                type="TYPE" if i % 3 else "OTHER",
+                value=str(i),
+                tags={"parity": "even" if i % 2 == 0 else "odd", "num": str(i)},
+            )
+            for i in range(12)
+        ]
+        for record in records:
+            await store.add_record(record)
+        return records
+
+    async def search_values(self, store, type_filter, tag_query):
+        search = store.search_records(type_filter, tag_query)
+        return [record.value for record in await search.fetch_all()]
+
+    @pytest.mark.asyncio
+    async def test_indexed_queries(self, store):
+        records = await self.populate(store)
+        assert await self.search_values(store, "TYPE", {"parity": "even"}) == [
+            "2",
+            "4",
+            "8",
+            "10",
+        ]
+        assert await self.search_values(
+            store, "TYPE", {"num": {"$in": ["1", "3", "5"]}}
+        ) == ["1", "5"]
+        assert await self.search_values(
+            store, "TYPE", {"$and": [{"parity": "odd"}, {"num": {"$neq": "1"}}]}
+        ) == ["5", "7", "11"]
+        assert await self.search_values(
+            store, "OTHER", {"$or": [{"num": "0"}, {"num": "9"}]}
+        ) == ["0", "9"]
+        assert await self.search_values(
+            store, "TYPE", {"$not": {"parity": "odd"}, "num": {"$gt": "5"}}
+        ) == ["8"]
+        assert await self.search_values(store, "TYPE", {"parity": "none"}) == []
+        assert len(await self.search_values(store, "OTHER", {})) == 4
+
+    @pytest.mark.asyncio
+    async def test_indexes_maintained(self, store):
+        records = await self.populate(store)
+        await store.update_record_tags(records[1], {"parity": "even"})
+        await store.update_record(records[2], "two", {"parity": "odd"})
+        await store.delete_record_tags(records[4], ["parity"])
+        await store.delete_record(records[8])
+        assert await self.search_values(store, "TYPE", {"parity": "even"}) == [
+            "1",
+            "10",
+        ]
+        assert ("TYPE", "num", "8") not in store._tag_index
+        assert records[8].id not in store._type_index["TYPE"]
+
+    @pytest.mark.asyncio
+    async def test_update_keeps_order(self, store):
+        records = await self.populate(store)
+        await store.update_record_value(records[1], "one")
+        await store.update_record(records[2], "two", {"parity": "odd"})
+        expected = ["one", "two", "4", "5", "7", "8", "10", "11"]
+        assert await self.search_values(store, "TYPE", {}) == expected
+
+        search = store.search_records("TYPE", {}, page_size=3)
+        await search.open()
+        pages = [[rec.value for rec in await search.fetch(3)] for _ in range(3)]
+        assert sum(pages, []) == expected
+
+    @pytest.mark.asyncio
+    async def test_search_changed_after_open(self, store):
+        records = await self.populate(store)
+        search = store.search_records("TYPE", {"parity": "even"})
+        await search.open()
+        await store.update_record_tags(records[2], {"parity": "odd"})
+        await store.delete_record(records[4])
+        assert [rec.value for rec in await search.fetch(10)] == ["8", "10"]
@@ -1,7 +1,10 @@
 import pytest
 import os
 
+from asynctest import mock as async_mock
+
 from aries_cloudagent.wallet.indy import IndyWallet
+from aries_cloudagent.storage.error import StorageDuplicateError
 from aries_cloudagent.storage.indy import IndyStorage
 from aries_cloudagent.storage.record import StorageRecord
 
@@ -25,10 +28,37 @@ async def store():
     await wallet.close()
 
 
+class TestIndyStorageBatch:
+    @pytest.mark.asyncio
+    async def test_add_records_stops_after_failed_chunk(self):
+        storage = IndyStorage(async_mock.MagicMock())
+        storage.BATCH_SIZE = 2
+        records = [StorageRecord("TYPE", str(i), id=str(i)) for i in range(6)]
+
+        async def add_record(record):
+            if record.id == "1":
+                raise StorageDuplicateError("duplicate")
+
+        with async_mock.patch.object(
+            storage, "add_record", async_mock.CoroutineMock(side_effect=add_record)
+        ) as mock_add, async_mock.patch.object(
+            storage, "delete_record", async_mock.CoroutineMock()
+        ) as mock_delete:
+            with pytest.raises(StorageDuplicateError):
+                await storage.add_records(records)
+        # later chunks are not written, and the earlier record is removed
+        assert [call[0][0].id for call in mock_add.call_args_list] == ["0", "1"]
+        mock_delete.assert_called_once_with(records[0])
+
+
 @pytest.mark.indy
 class TestIndyStorage(test_basic_storage.TestBasicStorage):
     """ """
 
+    @pytest.mark.skip(reason="Indy record searches do not report positions")
+    async def test_resume_after(self, store):
+        pass
+
     # TODO get these to run in docker ci/cd
     @pytest.mark.asyncio
     @pytest.mark.postgres
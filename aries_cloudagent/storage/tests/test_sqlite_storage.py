@@ -0,0 +1,94 @@
+import pytest
+
+from aries_cloudagent.storage.error import StorageSearchError
+from aries_cloudagent.storage.record import StorageRecord
+from aries_cloudagent.storage.sqlite import SqliteStorage, wql_to_sql
+from aries_cloudagent.wallet.sqlite import SqliteWallet
+
+from . import test_basic_storage
+
+
+@pytest.fixture()
+async def store(tmp_path):
+    wallet = SqliteWallet(
+        {
+            "name": "test-wallet",
+            "key": SqliteWallet.generate_wallet_key(),
+            "key_derivation_method": "RAW",
+            "storage_config": {"path": str(tmp_path / "wallet.db")},
+            "auto_remove": True,
+        }
+    )
+    await wallet.open()
+    yield SqliteStorage(wallet)
+    await wallet.close()
+
+
+class TestSqliteStorage(test_basic_storage.TestBasicStorage):
+    @pytest.mark.asyncio
+    async def test_tag_queries(self, store):
+        records = [
+            StorageRecord("TYPE", "v1", {"state": "active", "num": "1"}),
+            StorageRecord("TYPE", "v2", {"state": "done", "num": "2"}),
+            StorageRecord("TYPE", "v3", {"state": "active"}),
+            StorageRecord("OTHER", "v4", {"state": "active", "num": "1"}),
+        ]
+        await store.add_records(records)
+
+        async def values(tag_query):
+            search = store.search_records("TYPE", tag_query)
+            return [row.value for row in await search.fetch_all()]
+
+        assert await values({"state": "active"}) == ["v1", "v3"]
+        assert await values({"state": "active", "num": "1"}) == ["v1"]
+        assert await values({"num": {"$in": ["1", "2"]}}) == ["v1", "v2"]
+        assert await values({"num": {"$in": []}}) == []
+        assert await values({"num": {"$neq": "1"}}) == ["v2"]
+        assert await values({"num": {"$gte": "2"}}) == ["v2"]
+        assert await values({"state": {"$like": "act%"}}) == ["v1", "v3"]
+        assert await values({"$or": [{"num": "2"}, {"state": "active"}]}) == [
+            "v1",
+            "v2",
+            "v3",
+        ]
+        assert await values({"$and": [{"state": "active"}, {"num": "1"}]}) == ["v1"]
+        assert await values({"$not": {"state": "active"}}) == ["v2"]
+        assert await values({"$or": []}) == []
+
+    @pytest.mark.asyncio
+    async def test_search_pages(self, store):
+        await store.add_records(
+            [StorageRecord("TYPE", str(i), {"tag": "a"}) for i in range(5)]
+        )
+        search = store.search_records(
+            "TYPE", {"tag": "a"}, options={"retrieveTags": False}
+        )
+        await search.open()
+        first = await search.fetch(3)
+        await store.add_record(StorageRecord("TYPE", "5", {"tag": "a"}))
+        rest = await search.fetch(10)
+        await search.close()
+        assert [row.value for row in first + rest] == [str(i) for i in range(6)]
+        assert first[0].tags == {}
+
+    @pytest.mark.asyncio
+    async def test_record_type_scoped(self, store):
+        record = StorageRecord("TYPE", "value", {"tag": "a"})
+        await store.add_record(record)
+        await store.add_record(record._replace(type="OTHER", value="other"))
+        assert (await store.get_record("TYPE", record.id)).value == "value"
+        assert (await store.get_record("OTHER", record.id)).value == "other"
+
+    def test_wql_errors(self):
+        for query in (
+            {"$or": {}},
+            {"$not": []},
+            {"$xor": []},
+            {"tag": 1},
+            {"tag": {"$in": "a"}},
+            {"tag": {"$gt": 1}},
+            {"tag": {"$regex": "a"}},
+            {"tag": {"$gt": "a", "$lt": "b"}},
+        ):
+            with pytest.raises(StorageSearchError):
+                wql_to_sql(query)
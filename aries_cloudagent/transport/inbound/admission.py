@@ -0,0 +1,142 @@
+"""Admission control for inbound transports under load."""
+
+import asyncio
+import logging
+from typing import Callable
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AdmissionControl:
+    """
+    Decide whether inbound messages are accepted while the agent is busy.
+
+    The agent is considered overloaded when the number of messages waiting to
+    be dispatched, or the lag of the event loop, reaches its threshold. While
+    overloaded, inbound transports reject new requests or stop reading from
+    their connections. Messages are admitted again once both measures have
+    fallen back below a fraction of their thresholds.
+    """
+
+    RESUME_RATIO = 0.8
+
+    def __init__(
+        self,
+        max_pending: int = 0,
+        max_loop_lag: float = 0,
+        retry_after: int = 5,
+        dispatch_pending: Callable = None,
+        interval: float = 0.1,
+    ):
+        """
+        Initialize an `AdmissionControl` instance.
+
+        Args:
+            max_pending: the number of messages waiting to be dispatched at which
+                inbound messages are shed, or 0 for no limit
+            max_loop_lag: the event loop lag in seconds at which inbound messages
+                are shed, or 0 for no limit
+            retry_after: the number of seconds after which clients are asked to
+                retry a rejected request
+            dispatch_pending: a function returning the number of messages
+                waiting to be dispatched
+            interval: the number of seconds between checks of the event loop
+
+        """
+        self.max_pending = max_pending
+        self.max_loop_lag = max_loop_lag
+        self.retry_after = retry_after
+        self.dispatch_pending = dispatch_pending
+        self.interval = interval
+        self.loop_lag = 0.0
+        self.total_shed = 0
+        self._admitted = asyncio.Event()
+        self._admitted.set()
+        self._monitor: asyncio.Task = None
+
+    @property
+    def enabled(self) -> bool:
+        """Check whether any threshold is configured."""
+        return bool((self.max_pending and self.dispatch_pending) or self.max_loop_lag)
+
+    @property
+    def pending(self) -> int:
+        """Get the number of messages waiting to be dispatched."""
+        return self.dispatch_pending() if self.dispatch_pending else 0
+
+    @property
+    def shedding(self) -> bool:
+        """Check whether inbound messages are currently being shed."""
+        self.update()
+        return not self._admitted.is_set()
+
+    def update(self):
+        """Update the shedding state from the current load."""
+        if not self.enabled:
+            return
+        ratio = 1 if self._admitted.is_set() else self.RESUME_RATIO
+        pending = self.pending
+        overloaded = bool(
+            (self.max_pending and pending >= self.max_pending * ratio)
+            or (self.max_loop_lag and self.loop_lag >= self.max_loop_lag * ratio)
+        )
+        if overloaded and self._admitted.is_set():
+            LOGGER.warning(
+                "Shedding inbound messages, dispatch pending: %d, loop lag: %.3fs",
+                pending,
+                self.loop_lag,
+            )
+            self._admitted.clear()
+        elif not overloaded and not self._admitted.is_set():
+            LOGGER.info("Resuming inbound messages")
+            self._admitted.set()
+
+    def admit(self) -> bool:
+        """
+        Check whether a new inbound request should be accepted.
+
+        Returns:
+            False if the request should be rejected
+
+        """
+        if self.shedding:
+            self.total_shed += 1
+            return False
+        return True
+
+    async def wait_admitted(self):
+        """Wait until inbound messages are admitted."""
+        if self.shedding:
+            self.total_shed += 1
+            await self._admitted.wait()
+
+    def start(self):
+        """Start monitoring the load."""
+        if self.enabled and not self._monitor:
+            self._monitor = asyncio.get_event_loop().create_task(self.monitor())
+
+    def stop(self):
+        """Stop monitoring the load and admit any waiting readers."""
+        if self._monitor:
+            self._monitor.cancel()
+            self._monitor = None
+        self.loop_lag = 0.0
+        self._admitted.set()
+
+    async def monitor(self):
+        """Periodically measure the event loop lag and update the state."""
+        loop = asyncio.get_event_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.loop_lag = max(loop.time() - started - self.interval, 0.0)
+            self.update()
+
+    def get_stats(self) -> dict:
+        """Get the current load and shedding state."""
+        return {
+            "in_shedding": not self._admitted.is_set(),
+            "in_shed": self.total_shed,
+            "in_loop_lag": round(self.loop_lag, 6),
+            "in_dispatch_pending": self.pending,
+        }
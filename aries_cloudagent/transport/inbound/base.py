@@ -7,6 +7,7 @@ from typing import Awaitable, Callable
 from ..error import TransportError
 from ..wire_format import BaseWireFormat
 
+from .admission import AdmissionControl
 from .session import InboundSession
 
 
@@ -32,6 +33,7 @@ class BaseInboundTransport(ABC):
         self._create_session = create_session
         self._max_message_size = max_message_size
         self._scheme = scheme
+        self.admission: AdmissionControl = None
         self.wire_format: BaseWireFormat = wire_format
 
     @property
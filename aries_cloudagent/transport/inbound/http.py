@@ -5,6 +5,7 @@ import logging
 from aiohttp import web
 
 from ...messaging.error import MessageParseError
+from ...utils.task_lanes import TaskLaneFullError
 
 from .base import BaseInboundTransport, InboundTransportSetupError
 
@@ -76,6 +77,9 @@ class HttpTransport(BaseInboundTransport):
             The web response
 
         """
+        if self.admission and not self.admission.admit():
+            raise web.HTTPServiceUnavailable(headers=self.retry_headers())
+
         ctype = request.headers.get("content-type", "")
         if ctype.split(";", 1)[0].lower() == "application/json":
             body = await request.text()
@@ -93,6 +97,9 @@ class HttpTransport(BaseInboundTransport):
                 inbound = await session.receive(body)
             except MessageParseError:
                 raise web.HTTPBadRequest()
+            except TaskLaneFullError:
+                # too many messages from the same connection are waiting
+                raise web.HTTPTooManyRequests(headers=self.retry_headers())
 
             if inbound.receipt.direct_response_requested:
                 response = await session.wait_response()
@@ -116,6 +123,11 @@ class HttpTransport(BaseInboundTransport):
                         )
         return web.Response(status=200)
 
+    def retry_headers(self) -> dict:
+        """Get the headers asking a rejected client to retry later."""
+        retry_after = self.admission.retry_after if self.admission else 5
+        return {"Retry-After": str(retry_after)}
+
     async def invite_message_handler(self, request: web.BaseRequest):
         """
         Message handler for invites.
@@ -13,6 +13,7 @@ from ...utils.task_queue import CompletedTask, TaskQueue
 from ..outbound.message import OutboundMessage
 from ..wire_format import BaseWireFormat
 
+from .admission import AdmissionControl
 from .base import (
     BaseInboundTransport,
     InboundTransportConfiguration,
@@ -34,9 +35,12 @@ class InboundTransportManager:
         context: InjectionContext,
         receive_inbound: Coroutine,
         return_inbound: Callable = None,
+        dispatch_pending: Callable = None,
     ):
         """Initialize an `InboundTransportManager` instance."""
+        self.admission: AdmissionControl = None
         self.context = context
+        self.dispatch_pending = dispatch_pending
         self.max_message_size = 0
         self.receive_inbound = receive_inbound
         self.return_inbound = return_inbound
@@ -53,6 +57,14 @@ class InboundTransportManager:
         if self.context.settings.get("transport.max_message_size"):
             self.max_message_size = self.context.settings["transport.max_message_size"]
 
+        settings = self.context.settings
+        self.admission = AdmissionControl(
+            max_pending=int(settings.get("transport.shed_pending", 0)),
+            max_loop_lag=float(settings.get("transport.shed_loop_lag", 0)),
+            retry_after=int(settings.get("transport.shed_retry_after", 5)),
+            dispatch_pending=self.dispatch_pending,
+        )
+
         inbound_transports = (
             self.context.settings.get("transport.inbound_configs") or []
         )
@@ -112,6 +124,7 @@ class InboundTransportManager:
             transport_id: The transport ID to register
 
         """
+        transport.admission = self.admission
         self.registered_transports[transport_id] = transport
 
     async def start_transport(self, transport_id: str):
@@ -132,11 +145,15 @@ class InboundTransportManager:
 
     async def start(self):
         """Start all registered transports."""
+        if self.admission:
+            self.admission.start()
         for transport_id in self.registered_transports:
             self.task_queue.run(self.start_transport(transport_id))
 
     async def stop(self, wait: bool = True):
         """Stop all registered transports."""
+        if self.admission:
+            self.admission.stop()
         await self.task_queue.complete(None if wait else 0)
         for transport in self.running_transports.values():
             await transport.stop()
@@ -178,6 +195,13 @@ class InboundTransportManager:
         self.sessions[session.session_id] = session
         return session
 
+    def get_stats(self) -> dict:
+        """Get the current load and shedding state of the inbound transports."""
+        stats = {"in_sessions": len(self.sessions)}
+        if self.admission:
+            stats.update(self.admission.get_stats())
+        return stats
+
     def dispatch_complete(self, message: InboundMessage, completed: CompletedTask):
         """Handle completion of message dispatch."""
         session: InboundSession = self.sessions.get(message.session_id)
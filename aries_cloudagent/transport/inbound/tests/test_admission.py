@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..admission import AdmissionControl
+
+
+class TestAdmissionControl(AsyncTestCase):
+    async def test_disabled(self):
+        admission = AdmissionControl(dispatch_pending=lambda: 1000)
+        assert not admission.enabled
+        assert admission.admit()
+        admission.start()
+        assert not admission._monitor
+
+    async def test_pending(self):
+        pending = [0]
+        admission = AdmissionControl(
+            max_pending=10, dispatch_pending=lambda: pending[0]
+        )
+        assert admission.admit()
+        pending[0] = 10
+        assert not admission.admit()
+        # resume only once below the lower threshold
+        pending[0] = 9
+        assert admission.shedding
+        pending[0] = 7
+        assert admission.admit()
+        assert admission.get_stats() == {
+            "in_shedding": False,
+            "in_shed": 1,
+            "in_loop_lag": 0.0,
+            "in_dispatch_pending": 7,
+        }
+
+    async def test_wait_admitted(self):
+        pending = [10]
+        admission = AdmissionControl(
+            max_pending=10, dispatch_pending=lambda: pending[0], interval=0.01
+        )
+        admission.start()
+        waiter = asyncio.ensure_future(admission.wait_admitted())
+        await asyncio.sleep(0.03)
+        assert not waiter.done()
+        pending[0] = 0
+        await asyncio.wait_for(waiter, 1)
+        assert admission.total_shed == 1
+        admission.stop()
+
+    async def test_loop_lag(self):
+        admission = AdmissionControl(max_loop_lag=0.05, interval=0.01)
+        admission.start()
+        await asyncio.sleep(0.02)
+        # block the event loop
+        asyncio.get_event_loop().call_soon(time.sleep, 0.1)
+        await asyncio.sleep(0.05)
+        assert admission.loop_lag >= 0.05
+        assert admission.shedding
+        admission.stop()
+        assert not admission.shedding
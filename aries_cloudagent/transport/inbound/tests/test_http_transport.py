@@ -5,9 +5,12 @@ from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop, unused_port
 from aiohttp import web
 from asynctest import mock as async_mock
 
+from ....utils.task_lanes import TaskLaneFullError
+
 from ...outbound.message import OutboundMessage
 from ...wire_format import JsonWireFormat
 
+from ..admission import AdmissionControl
 from ..http import HttpTransport
 from ..message import InboundMessage
 from ..session import InboundSession
@@ -87,3 +90,40 @@ class TestHttpTransport(AioHTTPTestCase):
             assert await resp.json() == {"response": "ok"}
 
         await self.transport.stop()
+
+    @unittest_run_loop
+    async def test_shed_load(self):
+        await self.transport.start()
+        pending = [0]
+        self.transport.admission = AdmissionControl(
+            max_pending=10, retry_after=3, dispatch_pending=lambda: pending[0]
+        )
+
+        test_message = {"test": "message"}
+        pending[0] = 10
+        async with self.client.post("/", json=test_message) as resp:
+            assert resp.status == 503
+            assert resp.headers["Retry-After"] == "3"
+        assert not self.message_results
+        assert self.transport.admission.get_stats()["in_shedding"]
+
+        pending[0] = 0
+        async with self.client.post("/", json=test_message) as resp:
+            assert resp.status == 200
+        assert len(self.message_results) == 1
+
+        await self.transport.stop()
+
+    @unittest_run_loop
+    async def test_lane_full(self):
+        await self.transport.start()
+
+        test_message = {"test": "message"}
+        with async_mock.patch.object(
+            self, "receive_message", side_effect=TaskLaneFullError()
+        ):
+            async with self.client.post("/", json=test_message) as resp:
+                assert resp.status == 429
+                assert resp.headers["Retry-After"] == "5"
+
+        await self.transport.stop()
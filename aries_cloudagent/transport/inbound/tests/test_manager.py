@@ -48,6 +48,34 @@ class TestInboundTransportManager(AsyncTestCase):
             )
 
         assert mgr.undelivered_queue
+        assert not mgr.admission.enabled
+        assert mgr.get_stats() == {
+            "in_sessions": 0,
+            "in_shedding": False,
+            "in_shed": 0,
+            "in_loop_lag": 0.0,
+            "in_dispatch_pending": 0,
+        }
+
+    async def test_setup_admission(self):
+        context = InjectionContext()
+        context.update_settings(
+            {
+                "transport.shed_pending": 100,
+                "transport.shed_loop_lag": 0.5,
+                "transport.shed_retry_after": 2,
+            }
+        )
+        mgr = InboundTransportManager(context, None, dispatch_pending=lambda: 5)
+        await mgr.setup()
+        assert mgr.admission.max_pending == 100
+        assert mgr.admission.max_loop_lag == 0.5
+        assert mgr.admission.retry_after == 2
+        assert mgr.get_stats()["in_dispatch_pending"] == 5
+
+        transport = async_mock.MagicMock()
+        mgr.register_transport(transport, "transport_cls")
+        assert transport.admission is mgr.admission
 
     async def test_start_stop(self):
         transport = async_mock.MagicMock()
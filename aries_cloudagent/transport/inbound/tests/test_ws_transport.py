@@ -2,12 +2,15 @@ import asyncio
 import json
 
 from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop, unused_port
-from aiohttp import web
+from aiohttp import web, WSMsgType
 from asynctest import mock as async_mock
 
+from ....utils.task_lanes import TaskLaneFullError
+
 from ...outbound.message import OutboundMessage
 from ...wire_format import JsonWireFormat
 
+from ..admission import AdmissionControl
 from ..message import InboundMessage
 from ..session import InboundSession
 from ..ws import WsTransport
@@ -82,3 +85,40 @@ class TestWsTransport(AioHTTPTestCase):
             assert result == {"response": "ok"}
 
         await self.transport.stop()
+
+    @unittest_run_loop
+    async def test_shed_load(self):
+        await self.transport.start()
+        pending = [10]
+        self.transport.admission = AdmissionControl(
+            max_pending=10, dispatch_pending=lambda: pending[0], interval=0.01
+        )
+        self.transport.admission.start()
+
+        async with self.client.ws_connect("/") as ws:
+            self.result_event = asyncio.Event()
+            await ws.send_json({"test": "message"})
+            await asyncio.wait((self.result_event.wait(),), timeout=0.1)
+            assert not self.message_results
+
+            pending[0] = 0
+            await asyncio.wait((self.result_event.wait(),), timeout=1.0)
+            assert len(self.message_results) == 1
+
+        self.transport.admission.stop()
+        await self.transport.stop()
+
+    @unittest_run_loop
+    async def test_lane_full(self):
+        await self.transport.start()
+
+        with async_mock.patch.object(
+            self, "receive_message", side_effect=TaskLaneFullError()
+        ):
+            async with self.client.ws_connect("/") as ws:
+                await ws.send_json({"test": "message"})
+                msg = await asyncio.wait_for(ws.receive(), 1.0)
+                assert msg.type in (WSMsgType.CLOSE, WSMsgType.CLOSED)
+                assert ws.close_code == 1013
+
+        await self.transport.stop()
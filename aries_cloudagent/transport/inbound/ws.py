@@ -6,6 +6,7 @@ import logging
 from aiohttp import web, WSMessage, WSMsgType
 
 from ...messaging.error import MessageParseError
+from ...utils.task_lanes import TaskLaneFullError
 
 from .base import BaseInboundTransport, InboundTransportSetupError
 
@@ -92,7 +93,7 @@ class WsTransport(BaseInboundTransport):
         )
 
         async with session:
-            inbound = loop.create_task(ws.receive())
+            inbound = loop.create_task(self.receive(ws))
             outbound = loop.create_task(session.wait_response())
 
             while not ws.closed:
@@ -107,14 +108,16 @@ class WsTransport(BaseInboundTransport):
                         try:
                             await session.receive(msg.data)
                         except MessageParseError:
-                            await ws.close(1003)  # unsupported data error
+                            await ws.close(code=1003)  # unsupported data error
+                        except TaskLaneFullError:
+                            await ws.close(code=1013)  # try again later
                     elif msg.type == WSMsgType.ERROR:
                         LOGGER.error(
                             "Websocket connection closed with exception: %s",
                             ws.exception(),
                         )
                     if not ws.closed:
-                        inbound = loop.create_task(ws.receive())
+                        inbound = loop.create_task(self.receive(ws))
 
                 if outbound.done() and not ws.closed:
                     # response would be None if session was closed
@@ -136,3 +139,9 @@ class WsTransport(BaseInboundTransport):
         LOGGER.info("Websocket connection closed")
 
         return ws
+
+    async def receive(self, ws: web.WebSocketResponse) -> WSMessage:
+        """Receive the next message, waiting first while messages are shed."""
+        if self.admission:
+            await self.admission.wait_admitted()
+        return await ws.receive()
@@ -2,9 +2,11 @@
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Union
+from typing import Sequence, Union
 
+from ...config.base import BaseSettings
 from ...config.injection_context import InjectionContext
+from ...config.settings import Settings
 from ...utils.stats import Collector
 
 from ..error import TransportError
@@ -14,9 +16,13 @@ from ..wire_format import BaseWireFormat
 class BaseOutboundTransport(ABC):
     """Base outbound transport class."""
 
+    # whether messages to one endpoint may be sent together by `handle_messages`
+    supports_batches = False
+
     def __init__(self, wire_format: BaseWireFormat = None) -> None:
         """Initialize a `BaseOutboundTransport` instance."""
         self._collector = None
+        self._settings: BaseSettings = Settings()
         self._wire_format = wire_format
 
     @property
@@ -29,6 +35,20 @@ class BaseOutboundTransport(ABC):
         """Assign a new stats collector instance."""
         self._collector = coll
 
+    @property
+    def settings(self) -> BaseSettings:
+        """Accessor for the application settings."""
+        return self._settings
+
+    @settings.setter
+    def settings(self, settings: BaseSettings):
+        """Assign the application settings."""
+        self._settings = settings
+
+    def get_stats(self) -> dict:
+        """Get any statistics gauges maintained by the transport."""
+        return {}
+
     async def __aenter__(self):
         """Async context manager enter."""
         await self.start()
@@ -70,6 +90,21 @@ class BaseOutboundTransport(ABC):
             endpoint: URI endpoint for delivery
         """
 
+    async def handle_messages(
+        self, payloads: Sequence[Union[str, bytes]], endpoint: str
+    ):
+        """
+        Send several messages to the same endpoint in one operation.
+
+        Only used for transports which set `supports_batches`. If an error is
+        raised, none of the messages are considered delivered.
+
+        Args:
+            payloads: message payloads in string or byte format
+            endpoint: URI endpoint for delivery
+        """
+        raise NotImplementedError()
+
 
 class OutboundTransportError(TransportError):
     """Generic outbound transport error."""
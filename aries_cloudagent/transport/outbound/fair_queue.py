@@ -0,0 +1,161 @@
+"""Fair queuing of outbound deliveries across lanes and endpoints."""
+
+from collections import deque
+from typing import Any, Mapping
+
+
+class FairQueueLane:
+    """A lane of the fair queue, holding a queue of items per endpoint."""
+
+    def __init__(self, name: str, weight: int = 1):
+        """Initialize the lane."""
+        self.name = name
+        self.weight = weight
+        self.current = 0
+        self.queues = {}
+        # endpoints with queued items, in round-robin order
+        self.ready = deque()
+        self.in_ready = set()
+
+    def __len__(self) -> int:
+        """Get the number of queued items."""
+        return sum(len(queue) for queue in self.queues.values())
+
+
+class FairQueue:
+    """
+    Queue items for delivery with fair sharing between endpoints.
+
+    Items are taken from the lanes by smooth weighted round-robin, and from the
+    endpoints within a lane by round-robin, so that a busy endpoint or lane
+    cannot hold up the others. The number of items in flight is limited both
+    overall and for each endpoint.
+    """
+
+    def __init__(
+        self,
+        lane_weights: Mapping[str, int],
+        max_active: int = 200,
+        max_active_endpoint: int = 0,
+    ):
+        """
+        Initialize a `FairQueue` instance.
+
+        Args:
+            lane_weights: the relative share of deliveries for each lane name
+            max_active: the maximum number of items in flight, or 0 for no limit
+            max_active_endpoint: the maximum number of items in flight for one
+                endpoint, or 0 for no limit
+
+        """
+        self.lanes = {
+            name: FairQueueLane(name, weight) for name, weight in lane_weights.items()
+        }
+        self.max_active = max_active
+        self.max_active_endpoint = max_active_endpoint
+        self.active = {}
+        self.total_active = 0
+        self.total_queued = 0
+
+    def __len__(self) -> int:
+        """Get the number of queued items."""
+        return self.total_queued
+
+    def endpoint_full(self, endpoint: str) -> bool:
+        """Check whether an endpoint has as many items in flight as allowed."""
+        return bool(
+            self.max_active_endpoint
+            and self.active.get(endpoint, 0) >= self.max_active_endpoint
+        )
+
+    def push(self, item: Any, endpoint: str, lane: str):
+        """
+        Add an item to the queue.
+
+        Args:
+            item: the item to queue
+            endpoint: the destination endpoint of the item
+            lane: the name of the lane to queue the item in
+
+        """
+        lane = self.lanes[lane]
+        queue = lane.queues.get(endpoint)
+        if queue is None:
+            queue = lane.queues[endpoint] = deque()
+        queue.append(item)
+        self.total_queued += 1
+        if endpoint not in lane.in_ready and not self.endpoint_full(endpoint):
+            lane.ready.append(endpoint)
+            lane.in_ready.add(endpoint)
+
+    def _select_lane(self) -> FairQueueLane:
+        """Select the next lane to take an item from, if any."""
+        selected = None
+        total = 0
+        for lane in self.lanes.values():
+            # drop endpoints which reached their limit since they were queued
+            while lane.ready and self.endpoint_full(lane.ready[0]):
+                lane.in_ready.discard(lane.ready.popleft())
+            if lane.ready:
+                lane.current += lane.weight
+                total += lane.weight
+                if not selected or lane.current > selected.current:
+                    selected = lane
+        if selected:
+            selected.current -= total
+        return selected
+
+    def pop(self) -> Any:
+        """
+        Take the next item to be delivered and mark it as in flight.
+
+        Returns:
+            The next item, or None if no item can be delivered yet
+
+        """
+        if self.max_active and self.total_active >= self.max_active:
+            return None
+        lane = self._select_lane()
+        if not lane:
+            return None
+        endpoint = lane.ready.popleft()
+        queue = lane.queues[endpoint]
+        item = queue.popleft()
+        self.total_queued -= 1
+        self.active[endpoint] = self.active.get(endpoint, 0) + 1
+        self.total_active += 1
+        if not queue:
+            del lane.queues[endpoint]
+            lane.in_ready.discard(endpoint)
+        elif self.endpoint_full(endpoint):
+            lane.in_ready.discard(endpoint)
+        else:
+            lane.ready.append(endpoint)
+        return item
+
+    def release(self, endpoint: str):
+        """
+        Mark an item taken from the queue as no longer in flight.
+
+        Args:
+            endpoint: the destination endpoint of the item
+
+        """
+        was_full = self.endpoint_full(endpoint)
+        count = self.active[endpoint] - 1
+        if count:
+            self.active[endpoint] = count
+        else:
+            del self.active[endpoint]
+        self.total_active -= 1
+        if was_full:
+            for lane in self.lanes.values():
+                if endpoint in lane.queues and endpoint not in lane.in_ready:
+                    lane.ready.append(endpoint)
+                    lane.in_ready.add(endpoint)
+
+    def get_stats(self) -> dict:
+        """Get the number of queued items per lane and the number in flight."""
+        stats = {f"queued_{name}": len(lane) for name, lane in self.lanes.items()}
+        stats["active"] = self.total_active
+        return stats
@@ -0,0 +1,220 @@
+"""Endpoint health tracking and circuit breaking for outbound delivery."""
+
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from ...utils.tracing import get_timer
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PORTS = {"http": 80, "ws": 80, "https": 443, "wss": 443}
+
+
+@lru_cache(maxsize=1024)
+def endpoint_origin(endpoint: str) -> str:
+    """
+    Get the scheme, host and port of an endpoint URL.
+
+    Endpoints on the same origin share their health, so that one webhook
+    server or agent is not tracked separately for each path.
+    """
+    try:
+        parts = urlsplit(endpoint)
+        port = parts.port or DEFAULT_PORTS.get(parts.scheme)
+    except ValueError:
+        return endpoint
+    if not parts.hostname:
+        return endpoint
+    host = f"[{parts.hostname}]" if ":" in parts.hostname else parts.hostname
+    return f"{parts.scheme}://{host}:{port}" if port else f"{parts.scheme}://{host}"
+
+
+class EndpointHealth:
+    """
+    Delivery health of the outbound endpoints on a single origin.
+
+    The circuit opens after a run of consecutive failures. While it is open
+    no messages are delivered to the endpoint, until the reset timeout passes
+    and a single probe message is let through. A successful probe closes the
+    circuit, while a failed probe opens it again for twice as long.
+    """
+
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half-open"
+
+    def __init__(self, origin: str):
+        """Initialize the endpoint health."""
+        self.origin = origin
+        self.state = self.STATE_CLOSED
+        self.failures = 0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.latency: float = None
+        self.last_error: str = None
+        self.probe_at: float = None
+        self.reset_timeout: float = None
+
+    @property
+    def available(self) -> bool:
+        """Check whether messages may be delivered to the endpoint."""
+        return self.state == self.STATE_CLOSED
+
+    def serialize(self) -> dict:
+        """Get a dictionary representation for status reporting."""
+        result = {
+            "state": self.state,
+            "failures": self.failures,
+            "total_failures": self.total_failures,
+            "total_successes": self.total_successes,
+        }
+        if self.latency is not None:
+            result["latency"] = round(self.latency, 6)
+        if self.last_error:
+            result["last_error"] = self.last_error
+        if self.probe_at is not None:
+            result["probe_in"] = round(max(self.probe_at - get_timer(), 0), 3)
+        return result
+
+
+class EndpointHealthTracker:
+    """
+    Track the health of outbound endpoints and open circuits when they fail.
+
+    Health is kept for each origin (scheme, host and port) rather than each
+    endpoint URL, and the methods accept any endpoint on the origin.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        reset_timeout_max: float = 300,
+        latency_weight: float = 0.2,
+        max_endpoints: int = 1000,
+    ):
+        """
+        Initialize an `EndpointHealthTracker` instance.
+
+        Args:
+            failure_threshold: the number of consecutive failures which opens
+                the circuit of an endpoint, or 0 to disable circuit breaking
+            reset_timeout: the initial number of seconds before an open circuit
+                is probed
+            reset_timeout_max: the maximum number of seconds between probes
+            latency_weight: the weight of each new sample in the moving average
+                of delivery latency
+            max_endpoints: the number of healthy origins to keep track of
+
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.reset_timeout_max = reset_timeout_max
+        self.latency_weight = latency_weight
+        self.max_endpoints = max_endpoints
+        self.endpoints = OrderedDict()
+
+    def get(self, endpoint: str) -> EndpointHealth:
+        """Get the health of an endpoint's origin, adding it if necessary."""
+        origin = endpoint_origin(endpoint)
+        health = self.endpoints.get(origin)
+        if health:
+            self.endpoints.move_to_end(origin)
+        else:
+            health = self.endpoints[origin] = EndpointHealth(origin)
+            self._prune()
+        return health
+
+    def _prune(self):
+        """Forget the least recently used healthy origins beyond the limit."""
+        excess = len(self.endpoints) - self.max_endpoints
+        if excess > 0:
+            for origin in list(self.endpoints):
+                if self.endpoints[origin].state == EndpointHealth.STATE_CLOSED:
+                    del self.endpoints[origin]
+                    excess -= 1
+                    if not excess:
+                        break
+
+    def start_probe(self, endpoint: str, now: float = None) -> bool:
+        """
+        Check whether an open circuit is due to be probed.
+
+        Args:
+            endpoint: the endpoint of the open circuit
+            now: the current timer value
+
+        Returns:
+            True if the circuit is now half-open and a probe should be sent
+
+        """
+        health = self.get(endpoint)
+        if health.state != EndpointHealth.STATE_OPEN:
+            return False
+        if (get_timer() if now is None else now) < health.probe_at:
+            return False
+        health.state = EndpointHealth.STATE_HALF_OPEN
+        health.probe_at = None
+        return True
+
+    def record_success(self, endpoint: str, latency: float = None):
+        """Record a successful delivery to an endpoint, closing its circuit."""
+        health = self.get(endpoint)
+        if health.state != EndpointHealth.STATE_CLOSED:
+            LOGGER.info("Endpoint is reachable again: %s", health.origin)
+        health.state = EndpointHealth.STATE_CLOSED
+        health.failures = 0
+        health.total_successes += 1
+        health.probe_at = None
+        health.reset_timeout = None
+        if latency is not None:
+            if health.latency is None:
+                health.latency = latency
+            else:
+                health.latency += self.latency_weight * (latency - health.latency)
+
+    def record_failure(self, endpoint: str, error: str = None):
+        """Record a failed delivery to an endpoint, opening its circuit if needed."""
+        health = self.get(endpoint)
+        health.failures += 1
+        health.total_failures += 1
+        if error:
+            health.last_error = error
+        if health.state == EndpointHealth.STATE_HALF_OPEN:
+            health.reset_timeout = min(
+                health.reset_timeout * 2, self.reset_timeout_max
+            )
+        elif (
+            health.state == EndpointHealth.STATE_CLOSED
+            and self.failure_threshold
+            and health.failures >= self.failure_threshold
+        ):
+            LOGGER.warning(
+                "Suspending delivery to endpoint after %d failures: %s",
+                health.failures,
+                health.origin,
+            )
+            health.reset_timeout = self.reset_timeout
+        else:
+            return
+        health.state = EndpointHealth.STATE_OPEN
+        health.probe_at = get_timer() + health.reset_timeout
+
+    def next_probe(self, endpoints) -> float:
+        """Get the earliest probe time among the given endpoints, if any."""
+        times = [
+            health.probe_at
+            for health in (
+                self.endpoints.get(endpoint_origin(endpoint)) for endpoint in endpoints
+            )
+            if health and health.probe_at is not None
+        ]
+        return min(times) if times else None
+
+    def get_stats(self) -> dict:
+        """Get the health of each tracked origin."""
+        return {
+            origin: health.serialize() for origin, health in self.endpoints.items()
+        }
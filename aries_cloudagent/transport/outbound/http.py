@@ -3,11 +3,11 @@
 import logging
 from typing import Union
 
-from aiohttp import ClientSession, DummyCookieJar, TCPConnector
+from aiohttp import ClientSession, ClientTimeout, DummyCookieJar, TCPConnector
 
 from ...config.injection_context import InjectionContext
 
-from ..stats import StatsTracer
+from ..stats import PoolTracer, StatsTracer
 
 from .base import BaseOutboundTransport, OutboundTransportError
 
@@ -22,18 +22,38 @@ class HttpTransport(BaseOutboundTransport):
         super(HttpTransport, self).__init__()
         self.client_session: ClientSession = None
         self.connector: TCPConnector = None
+        self.pool_tracer: PoolTracer = None
         self.logger = logging.getLogger(__name__)
 
     async def start(self):
         """Start the transport."""
+        settings = self.settings
         session_args = {}
-        self.connector = TCPConnector(limit=200, limit_per_host=50)
+        dns_ttl = float(settings.get("transport.http_dns_ttl", 10))
+        keepalive = float(settings.get("transport.http_keepalive", 15))
+        self.connector = TCPConnector(
+            limit=int(settings.get("transport.http_pool_size", 200)),
+            limit_per_host=int(settings.get("transport.http_pool_size_host", 50)),
+            use_dns_cache=dns_ttl > 0,
+            ttl_dns_cache=dns_ttl or None,
+            # a keep-alive timeout of zero closes each connection after use
+            keepalive_timeout=keepalive or None,
+            force_close=not keepalive,
+        )
+        self.pool_tracer = PoolTracer()
+        session_args["trace_configs"] = [self.pool_tracer]
         if self.collector:
-            session_args["trace_configs"] = [
+            session_args["trace_configs"].append(
                 StatsTracer(self.collector, "outbound-http:")
-            ]
+            )
         session_args["cookie_jar"] = DummyCookieJar()
         session_args["connector"] = self.connector
+        session_args["timeout"] = ClientTimeout(
+            # the total limit stops a slow peer holding a connection indefinitely
+            total=float(settings.get("transport.http_total_timeout", 300)),
+            sock_connect=float(settings.get("transport.http_connect_timeout", 10)),
+            sock_read=float(settings.get("transport.http_read_timeout", 30)),
+        )
         self.client_session = ClientSession(**session_args)
         return self
 
@@ -42,6 +62,10 @@ class HttpTransport(BaseOutboundTransport):
         await self.client_session.close()
         self.client_session = None
 
+    def get_stats(self) -> dict:
+        """Get the connection pool usage of the transport."""
+        return self.pool_tracer.get_stats() if self.pool_tracer else {}
+
     async def handle_message(
         self, context: InjectionContext, payload: Union[str, bytes], endpoint: str
     ):
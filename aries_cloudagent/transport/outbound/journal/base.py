@@ -0,0 +1,191 @@
+"""Abstract durable journal of outbound messages."""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Mapping, Sequence, Tuple, Union
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BaseOutboundJournal(ABC):
+    """
+    Durable journal of the outbound messages awaiting delivery.
+
+    Changes are buffered and written in batches, so that the cost of syncing
+    to disk is shared between all of the messages queued within the flush
+    interval. A message may be delivered more than once if the agent stops
+    before the removal of its entry has been written. A batch which fails to
+    be written is kept and written again with the next batch.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.01,
+        max_batch: int = 500,
+        retry_interval: float = 1.0,
+    ):
+        """
+        Initialize a `BaseOutboundJournal` instance.
+
+        Args:
+            flush_interval: the number of seconds to collect changes before
+                writing them
+            max_batch: the number of changes which triggers an immediate write
+            retry_interval: the number of seconds to wait before writing again
+                after a failed write
+
+        """
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.retry_interval = retry_interval
+        self.total_failures = 0
+        self.total_flushes = 0
+        self.total_writes = 0
+        self._flush_handle: asyncio.Handle = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task = None
+        self._failed = False
+        # entry id -> (entry, payload), or None for a removed entry
+        self._pending = OrderedDict()
+
+    def put(self, entry_id: str, entry: Mapping, payload: Union[str, bytes] = None):
+        """
+        Add or replace a journal entry.
+
+        Args:
+            entry_id: the unique identifier of the entry
+            entry: the JSON-compatible properties of the queued message
+            payload: the message payload, if any
+
+        """
+        self._pending[entry_id] = (entry, payload)
+        self._pending.move_to_end(entry_id)
+        self._schedule_flush()
+
+    def remove(self, entry_id: str):
+        """
+        Remove a journal entry.
+
+        Args:
+            entry_id: the unique identifier of the entry
+
+        """
+        self._pending[entry_id] = None
+        self._pending.move_to_end(entry_id)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Arrange for the pending changes to be written."""
+        if self._failed:
+            # wait for the scheduled retry after a failed write
+            return
+        if len(self._pending) >= self.max_batch:
+            if self._flush_handle:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            self._start_flush()
+        elif not self._flush_handle:
+            self._flush_handle = asyncio.get_event_loop().call_later(
+                self.flush_interval, self._start_flush
+            )
+
+    def _start_flush(self):
+        """Start a task to write the pending changes."""
+        self._flush_handle = None
+        self._flush_task = asyncio.get_event_loop().create_task(self.flush())
+        self._flush_task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task):
+        """Log any failure to write the pending changes."""
+        if not task.cancelled() and task.exception():
+            LOGGER.error(
+                "Error writing outbound message journal", exc_info=task.exception()
+            )
+
+    async def flush(self):
+        """Write the pending changes to the journal."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch = self._pending
+            self._pending = OrderedDict()
+            puts = []
+            removes = []
+            for entry_id, change in batch.items():
+                if change is None:
+                    removes.append(entry_id)
+                else:
+                    puts.append((entry_id, change[0], change[1]))
+            try:
+                await self.write_batch(puts, removes)
+            except Exception:
+                self._restore(batch)
+                raise
+            self._failed = False
+            self.total_flushes += 1
+            self.total_writes += len(batch)
+
+    def _restore(self, batch: OrderedDict):
+        """Keep a batch which failed to be written, and retry it later."""
+        # changes made since the batch was taken replace those in the batch
+        for entry_id, change in reversed(batch.items()):
+            if entry_id not in self._pending:
+                self._pending[entry_id] = change
+                self._pending.move_to_end(entry_id, last=False)
+        self.total_failures += 1
+        self._failed = True
+        if self._flush_handle:
+            self._flush_handle.cancel()
+        self._flush_handle = asyncio.get_event_loop().call_later(
+            self.retry_interval, self._start_flush
+        )
+
+    @abstractmethod
+    async def open(self):
+        """Open the journal, creating it if necessary."""
+
+    @abstractmethod
+    async def load(self) -> Sequence[Tuple[str, dict, Union[str, bytes]]]:
+        """
+        Load the journal entries.
+
+        Returns:
+            A list of (entry id, entry, payload) tuples in the order written
+
+        """
+
+    @abstractmethod
+    async def write_batch(
+        self,
+        puts: Sequence[Tuple[str, Mapping, Union[str, bytes]]],
+        removes: Sequence[str],
+    ):
+        """
+        Durably write a batch of changes to the journal.
+
+        Args:
+            puts: the (entry id, entry, payload) tuples to add or replace
+            removes: the identifiers of entries to remove
+
+        """
+
+    async def close(self):
+        """Write any pending changes and close the journal."""
+        try:
+            await self.flush()
+        finally:
+            # no retry is made after the journal is closed
+            if self._flush_handle:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+
+    def get_stats(self) -> dict:
+        """Get the current journal statistics."""
+        return {
+            "pending": len(self._pending),
+            "flushes": self.total_flushes,
+            "writes": self.total_writes,
+            "failures": self.total_failures,
+        }
@@ -0,0 +1,118 @@
+"""SQLite-backed journal of outbound messages."""
+
+import json
+import os
+import sqlite3
+from typing import Mapping, Sequence, Tuple, Union
+
+from ....wallet.sqlite import SqliteConnectionPool
+
+from .base import BaseOutboundJournal
+
+
+class SqliteOutboundJournal(BaseOutboundJournal):
+    """Outbound message journal persisted to a SQLite database file."""
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.01,
+        max_batch: int = 500,
+        retry_interval: float = 1.0,
+    ):
+        """
+        Initialize a `SqliteOutboundJournal` instance.
+
+        Args:
+            path: the path of the database file
+            flush_interval: the number of seconds to collect changes before
+                writing them
+            max_batch: the number of changes which triggers an immediate write
+            retry_interval: the number of seconds to wait before writing again
+                after a failed write
+
+        """
+        super().__init__(flush_interval, max_batch, retry_interval)
+        self.path = path
+        self.pool: SqliteConnectionPool = None
+
+    @staticmethod
+    def _init_db(conn: sqlite3.Connection):
+        # each batch is committed with a single sync of the write-ahead log
+        conn.execute("PRAGMA synchronous = FULL")
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS outbound (
+                id TEXT PRIMARY KEY,
+                entry TEXT NOT NULL,
+                payload BLOB
+            )"""
+        )
+
+    async def open(self):
+        """Open the journal, creating it if necessary."""
+        if not self.pool:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # webhook payloads are journaled as they are sent, so only the
+            # agent may read the journal
+            os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+            os.chmod(self.path, 0o600)
+            # a single connection keeps the batches in order
+            self.pool = SqliteConnectionPool(self.path, 1)
+            await self.pool.run(self._init_db)
+
+    async def load(self) -> Sequence[Tuple[str, dict, Union[str, bytes]]]:
+        """
+        Load the journal entries.
+
+        Returns:
+            A list of (entry id, entry, payload) tuples in the order written
+
+        """
+        rows = await self.pool.run(
+            lambda conn: conn.execute(
+                "SELECT id, entry, payload FROM outbound ORDER BY rowid"
+            ).fetchall()
+        )
+        return [
+            (entry_id, json.loads(entry), payload) for entry_id, entry, payload in rows
+        ]
+
+    async def write_batch(
+        self,
+        puts: Sequence[Tuple[str, Mapping, Union[str, bytes]]],
+        removes: Sequence[str],
+    ):
+        """
+        Durably write a batch of changes to the journal in one transaction.
+
+        Args:
+            puts: the (entry id, entry, payload) tuples to add or replace
+            removes: the identifiers of entries to remove
+
+        """
+
+        def write(conn: sqlite3.Connection):
+            if removes:
+                conn.executemany(
+                    "DELETE FROM outbound WHERE id = ?", ((rid,) for rid in removes)
+                )
+            if puts:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO outbound (id, entry, payload) "
+                    "VALUES (?, ?, ?)",
+                    (
+                        (entry_id, json.dumps(entry), payload)
+                        for entry_id, entry, payload in puts
+                    ),
+                )
+
+        await self.pool.transaction(write)
+
+    async def close(self):
+        """Write any pending changes and close the journal."""
+        if self.pool:
+            await super().close()
+            await self.pool.close()
+            self.pool = None
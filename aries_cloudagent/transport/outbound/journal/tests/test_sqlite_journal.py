@@ -0,0 +1,84 @@
+import asyncio
+import os
+import stat
+
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from ..sqlite import SqliteOutboundJournal
+
+
+class TestSqliteOutboundJournal(AsyncTestCase):
+    async def setUp(self):
+        self.path = self.id().replace(".", "_") + ".db"
+        self.journal = SqliteOutboundJournal(self.path, flush_interval=0.01)
+        await self.journal.open()
+
+    async def tearDown(self):
+        await self.journal.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    async def test_put_remove_reopen(self):
+        self.journal.put("a", {"endpoint": "http://a"}, b"payload-a")
+        self.journal.put("b", {"endpoint": "http://b"}, "payload-b")
+        self.journal.put("c", {"endpoint": "http://c"})
+        self.journal.remove("b")
+        assert self.journal.get_stats()["pending"] == 3
+
+        await asyncio.sleep(0.05)
+        assert self.journal.get_stats() == {
+            "pending": 0,
+            "flushes": 1,
+            "writes": 3,
+            "failures": 0,
+        }
+        assert stat.S_IMODE(os.stat(self.path).st_mode) == 0o600
+        assert await self.journal.load() == [
+            ("a", {"endpoint": "http://a"}, b"payload-a"),
+            ("c", {"endpoint": "http://c"}, None),
+        ]
+
+        self.journal.put("c", {"endpoint": "http://c", "attempts": 1}, "payload-c")
+        await self.journal.close()
+        self.journal = SqliteOutboundJournal(self.path)
+        await self.journal.open()
+        assert await self.journal.load() == [
+            ("a", {"endpoint": "http://a"}, b"payload-a"),
+            ("c", {"endpoint": "http://c", "attempts": 1}, "payload-c"),
+        ]
+
+    async def test_max_batch(self):
+        self.journal.flush_interval = 60
+        self.journal.max_batch = 3
+        for entry_id in ("a", "b", "c"):
+            self.journal.put(entry_id, {})
+        await asyncio.sleep(0.05)
+        assert self.journal.get_stats()["flushes"] == 1
+        assert len(await self.journal.load()) == 3
+
+    async def test_write_failure(self):
+        self.journal.retry_interval = 0.05
+        self.journal.put("a", {"attempts": 0}, "payload-a")
+        self.journal.put("b", {}, "payload-b")
+        write_batch = self.journal.write_batch
+        with async_mock.patch.object(
+            self.journal,
+            "write_batch",
+            async_mock.CoroutineMock(side_effect=OSError("disk full")),
+        ):
+            await asyncio.sleep(0.03)
+            # newer changes are kept in place of the failed ones
+            self.journal.put("a", {"attempts": 1}, "payload-a")
+            self.journal.remove("b")
+            self.journal.put("c", {}, "payload-c")
+        assert self.journal.get_stats()["failures"] == 1
+        assert list(self.journal._pending) == ["a", "b", "c"]
+        assert self.journal.write_batch == write_batch
+
+        await asyncio.sleep(0.1)
+        assert self.journal.get_stats()["pending"] == 0
+        assert await self.journal.load() == [
+            ("a", {"attempts": 1}, "payload-a"),
+            ("c", {}, "payload-c"),
+        ]
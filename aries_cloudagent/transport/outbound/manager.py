@@ -1,12 +1,16 @@
 """Outbound transport manager."""
 
 import asyncio
+import heapq
 import json
 import logging
+import random
 import time
 
-from typing import Callable, Type, Union
+from collections import deque
+from typing import Callable, Sequence, Type, Union
 from urllib.parse import urlparse
+from uuid import uuid4
 
 from ...connections.models.connection_target import ConnectionTarget
 from ...config.injection_context import InjectionContext
@@ -23,11 +27,18 @@ from .base import (
     OutboundDeliveryError,
     OutboundTransportRegistrationError,
 )
+from .fair_queue import FairQueue
+from .health import EndpointHealthTracker
+from .journal.base import BaseOutboundJournal
 from .message import OutboundMessage
 
 LOGGER = logging.getLogger(__name__)
 MODULE_BASE_PATH = "aries_cloudagent.transport.outbound"
 
+JOURNAL_TYPES = {
+    "sqlite": "aries_cloudagent.transport.outbound.journal.sqlite.SqliteOutboundJournal"
+}
+
 
 class QueuedOutboundMessage:
     """Class representing an outbound message pending delivery."""
@@ -37,6 +48,10 @@ class QueuedOutboundMessage:
     STATE_ENCODE = "encode"
     STATE_DELIVER = "deliver"
     STATE_RETRY = "retry"
+    STATE_PARKED = "parked"
+
+    LANE_MESSAGE = "message"
+    LANE_WEBHOOK = "webhook"
     STATE_DONE = "done"
 
     def __init__(
@@ -50,8 +65,12 @@ class QueuedOutboundMessage:
         self.context = context
         self.endpoint = target and target.endpoint
         self.error: Exception = None
+        self.journal_id: str = None
+        self.lane = self.LANE_MESSAGE
         self.message = message
         self.payload: Union[str, bytes] = None
+        self.attempts = 0
+        self.probe = False
         self.retries = None
         self.retry_at: float = None
         self.state = self.STATE_NEW
@@ -77,13 +96,50 @@ class OutboundTransportManager:
         self.context = context
         self.loop = asyncio.get_event_loop()
         self.handle_not_delivered = handle_not_delivered
-        self.outbound_buffer = []
         self.outbound_event = asyncio.Event()
+        # messages to be picked up by the processing loop, by state
         self.outbound_new = []
+        self.outbound_pending = deque()
+        self.outbound_done = deque()
+        # heap of (retry_at, sequence, message) for messages awaiting a retry
+        self.outbound_retry = []
+        # messages held back from endpoints with an open circuit, by endpoint
+        self.outbound_parked = {}
+        # messages ready for delivery, shared fairly between lanes and endpoints
+        self.outbound_deliver = FairQueue(
+            {
+                QueuedOutboundMessage.LANE_MESSAGE: 1,
+                QueuedOutboundMessage.LANE_WEBHOOK: int(
+                    context.settings.get("transport.webhook_weight", 1)
+                ),
+            },
+            int(context.settings.get("transport.max_deliveries", 200)),
+            int(context.settings.get("transport.max_endpoint_deliveries", 0)),
+        )
+        self.outbound_active = {
+            QueuedOutboundMessage.STATE_ENCODE: 0,
+            QueuedOutboundMessage.STATE_DELIVER: 0,
+        }
+        self._retry_sequence = 0
+        settings = context.settings
+        self.max_retries = int(settings.get("transport.max_retries", 4))
+        self.retry_backoff = float(settings.get("transport.retry_backoff", 10))
+        self.retry_backoff_max = float(settings.get("transport.retry_backoff_max", 300))
+        self.retry_jitter = float(settings.get("transport.retry_jitter", 0.2))
+        # messages waiting to be delivered together, by endpoint
+        self.outbound_batches = {}
+        self.batch_size = int(settings.get("transport.batch_size", 1))
+        self.batch_linger = float(settings.get("transport.batch_linger", 0.005))
+        self.endpoint_health = EndpointHealthTracker(
+            int(settings.get("transport.circuit_failures", 5)),
+            float(settings.get("transport.circuit_reset", 30)),
+            float(settings.get("transport.circuit_reset_max", 300)),
+        )
         self.registered_schemes = {}
         self.registered_transports = {}
         self.running_transports = {}
-        self.task_queue = TaskQueue(max_active=200)
+        self.task_queue = TaskQueue(max_active=200, timed=True)
+        self.journal: BaseOutboundJournal = None
         self._process_task: asyncio.Task = None
 
     async def setup(self):
@@ -94,6 +150,16 @@ class OutboundTransportManager:
         for outbound_transport in outbound_transports:
             self.register(outbound_transport)
 
+        journal_path = self.context.settings.get("transport.outbound_queue")
+        if journal_path:
+            journal_type = self.context.settings.get(
+                "transport.outbound_queue_type", "sqlite"
+            )
+            journal_class = ClassLoader.load_class(
+                JOURNAL_TYPES.get(journal_type, journal_type)
+            )
+            self.journal = journal_class(journal_path)
+
     def register(self, module: str) -> str:
         """
         Register a new outbound transport by module path.
@@ -167,22 +233,111 @@ class OutboundTransportManager:
         """Start a registered transport."""
         transport = self.registered_transports[transport_id]()
         transport.collector = await self.context.inject(Collector, required=False)
+        transport.settings = self.context.settings
         await transport.start()
         self.running_transports[transport_id] = transport
 
     async def start(self):
         """Start all transports and feed messages from the queue."""
-        for transport_id in self.registered_transports:
+        started = [
             self.task_queue.run(self.start_transport(transport_id))
+            for transport_id in self.registered_transports
+        ]
+        if self.journal:
+            await self.journal.open()
+            self.task_queue.run(self.replay_journal(started))
 
     async def stop(self, wait: bool = True):
         """Stop all running transports."""
         if self._process_task and not self._process_task.done():
             self._process_task.cancel()
+        for _batch, timer in self.outbound_batches.values():
+            timer.cancel()
+        self.outbound_batches = {}
         await self.task_queue.complete(None if wait else 0)
         for transport in self.running_transports.values():
             await transport.stop()
         self.running_transports = {}
+        if self.journal:
+            await self.journal.close()
+
+    async def replay_journal(self, started: Sequence[asyncio.Task] = ()):
+        """
+        Queue the messages left in the journal when the agent last stopped.
+
+        Args:
+            started: the tasks starting the outbound transports, which must
+                complete before messages can be delivered
+
+        """
+        if started:
+            await asyncio.wait(started)
+        now = time.time()
+        timer = time.perf_counter()
+        replayed = 0
+        for entry_id, entry, payload in await self.journal.load():
+            try:
+                transport_id = self.get_running_transport_for_endpoint(
+                    entry["endpoint"]
+                )
+            except OutboundDeliveryError:
+                LOGGER.warning(
+                    "Dropping journaled message for unsupported endpoint: %s",
+                    entry["endpoint"],
+                )
+                self.journal.remove(entry_id)
+                continue
+            if payload is None:
+                LOGGER.warning("Dropping journaled message without a payload")
+                self.journal.remove(entry_id)
+                continue
+            queued = QueuedOutboundMessage(self.context, None, None, transport_id)
+            queued.journal_id = entry_id
+            queued.endpoint = entry["endpoint"]
+            queued.lane = entry.get("lane", QueuedOutboundMessage.LANE_MESSAGE)
+            queued.attempts = entry.get("attempts", 0)
+            queued.retries = entry.get("retries", 0)
+            queued.payload = payload
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            if entry.get("retry_at") and entry["retry_at"] > now:
+                queued.retry_at = timer + entry["retry_at"] - now
+                self._push_retry(queued)
+            else:
+                self.outbound_new.append(queued)
+            replayed += 1
+        if replayed:
+            LOGGER.info("Replaying %d journaled outbound messages", replayed)
+            self.process_queued()
+
+    def journal_put(self, queued: QueuedOutboundMessage):
+        """
+        Record the current state of a queued message in the journal.
+
+        Messages are only journaled once encoded, so that their plaintext is
+        never written to disk.
+        """
+        payload = queued.payload
+        if queued.message:
+            payload = payload or queued.message.enc_payload
+        if not self.journal or payload is None:
+            return
+        if not queued.journal_id:
+            queued.journal_id = uuid4().hex
+        entry = {
+            "endpoint": queued.endpoint,
+            "lane": queued.lane,
+            "attempts": queued.attempts,
+            "retries": queued.retries,
+        }
+        if queued.retry_at:
+            # retry times are stored as wall clock time to survive a restart
+            entry["retry_at"] = time.time() + queued.retry_at - time.perf_counter()
+        self.journal.put(queued.journal_id, entry, payload)
+
+    def journal_remove(self, queued: QueuedOutboundMessage):
+        """Remove a delivered or failed message from the journal."""
+        if self.journal and queued.journal_id:
+            self.journal.remove(queued.journal_id)
 
     def get_registered_transport_for_scheme(self, scheme: str) -> str:
         """Find the registered transport ID for a given scheme."""
@@ -249,7 +404,8 @@ class OutboundTransportManager:
             raise OutboundDeliveryError("No supported transport for outbound message")
 
         queued = QueuedOutboundMessage(context, outbound, target, transport_id)
-        queued.retries = 4
+        queued.retries = self.max_retries
+        self.journal_put(queued)
         self.outbound_new.append(queued)
         self.process_queued()
 
@@ -272,9 +428,13 @@ class OutboundTransportManager:
         transport_id = self.get_running_transport_for_endpoint(endpoint)
         queued = QueuedOutboundMessage(None, None, None, transport_id)
         queued.endpoint = f"{endpoint}/topic/{topic}/"
+        queued.lane = QueuedOutboundMessage.LANE_WEBHOOK
         queued.payload = json.dumps(payload)
         queued.state = QueuedOutboundMessage.STATE_PENDING
-        queued.retries = 4 if max_attempts is None else max_attempts - 1
+        queued.retries = (
+            self.max_retries if max_attempts is None else max_attempts - 1
+        )
+        self.journal_put(queued)
         self.outbound_new.append(queued)
         self.process_queued()
 
@@ -287,7 +447,13 @@ class OutboundTransportManager:
         """
         if self._process_task and not self._process_task.done():
             self.outbound_event.set()
-        elif self.outbound_new or self.outbound_buffer:
+        elif (
+            self.outbound_new
+            or self.outbound_pending
+            or self.outbound_done
+            or self.outbound_retry
+            or self.outbound_parked
+        ):
             self._process_task = self.loop.create_task(self._process_loop())
             self._process_task.add_done_callback(lambda task: self._process_done(task))
         return self._process_task
@@ -309,51 +475,35 @@ class OutboundTransportManager:
 
         while True:
             self.outbound_event.clear()
-            loop_time = get_timer()
-            upd_buffer = []
-
-            for queued in self.outbound_buffer:
-                if queued.state == QueuedOutboundMessage.STATE_DONE:
-                    if queued.error:
-                        LOGGER.exception(
-                            "Outbound message could not be delivered to %s",
-                            queued.endpoint,
-                            exc_info=queued.error,
-                        )
-                        if self.handle_not_delivered:
-                            self.handle_not_delivered(queued.context, queued.message)
-                    continue  # remove from buffer
-
-                deliver = False
-
-                if queued.state == QueuedOutboundMessage.STATE_PENDING:
-                    deliver = True
-                elif queued.state == QueuedOutboundMessage.STATE_RETRY:
-                    if queued.retry_at < loop_time:
-                        queued.retry_at = None
-                        deliver = True
-
-                if deliver:
-                    queued.state = QueuedOutboundMessage.STATE_DELIVER
-                    trace_event(
-                        self.context.settings,
-                        queued.message,
-                        outcome="OutboundTransportManager._process_loop.DELIVER",
+
+            while self.outbound_done:
+                queued = self.outbound_done.popleft()
+                if queued.error:
+                    LOGGER.exception(
+                        "Outbound message could not be delivered to %s",
+                        queued.endpoint,
+                        exc_info=queued.error,
                     )
-                    self.deliver_queued_message(queued)
+                    if self.handle_not_delivered:
+                        self.handle_not_delivered(queued.context, queued.message)
 
-                upd_buffer.append(queued)
+            # only the messages which are due are taken from the retry heap
+            loop_time = get_timer()
+            retry = self.outbound_retry
+            while retry and retry[0][0] <= loop_time:
+                queued = heapq.heappop(retry)[2]
+                queued.retry_at = None
+                queued.state = QueuedOutboundMessage.STATE_PENDING
+                self.outbound_pending.append(queued)
 
-            new_pending = 0
             new_messages = self.outbound_new
             self.outbound_new = []
-
             for queued in new_messages:
                 if queued.state == QueuedOutboundMessage.STATE_NEW:
                     if queued.message and queued.message.enc_payload:
                         queued.payload = queued.message.enc_payload
                         queued.state = QueuedOutboundMessage.STATE_PENDING
-                        new_pending += 1
+                        self.outbound_pending.append(queued)
                     else:
                         queued.state = QueuedOutboundMessage.STATE_ENCODE
                         trace_event(
@@ -363,19 +513,79 @@ class OutboundTransportManager:
                         )
                         self.encode_queued_message(queued)
                 else:
-                    new_pending += 1
-
-                upd_buffer.append(queued)
-
-            self.outbound_buffer = upd_buffer
-            if self.outbound_buffer:
-                if not new_pending:
-                    await self.outbound_event.wait()
+                    self.outbound_pending.append(queued)
+
+            # release the messages parked for endpoints which have recovered,
+            # and send a single probe to each open circuit which is due
+            for endpoint in list(self.outbound_parked):
+                parked = self.outbound_parked[endpoint]
+                if self.endpoint_health.get(endpoint).available:
+                    self.outbound_pending.extend(parked)
+                    del self.outbound_parked[endpoint]
+                elif self.endpoint_health.start_probe(endpoint, loop_time):
+                    queued = parked.popleft()
+                    queued.probe = True
+                    self.outbound_deliver.push(queued, endpoint, queued.lane)
+                    if not parked:
+                        del self.outbound_parked[endpoint]
+
+            while self.outbound_pending:
+                queued = self.outbound_pending.popleft()
+                queued.state = QueuedOutboundMessage.STATE_PENDING
+                self.outbound_deliver.push(queued, queued.endpoint, queued.lane)
+
+            while True:
+                queued = self.outbound_deliver.pop()
+                if not queued:
+                    break
+                if queued.probe or self.endpoint_health.get(queued.endpoint).available:
+                    self._deliver(queued)
+                else:
+                    self.outbound_deliver.release(queued.endpoint)
+                    self.park(queued)
+
+            wake_at = self.endpoint_health.next_probe(self.outbound_parked)
+            if retry:
+                wake_at = min(retry[0][0], wake_at or retry[0][0])
+            if wake_at:
+                try:
+                    await asyncio.wait_for(
+                        self.outbound_event.wait(), max(wake_at - get_timer(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            elif any(self.outbound_active.values()) or self.outbound_batches:
+                await self.outbound_event.wait()
             else:
                 break
 
+    def _deliver(self, queued: QueuedOutboundMessage):
+        """Move a queued message to the delivery state and start delivery."""
+        queued.state = QueuedOutboundMessage.STATE_DELIVER
+        trace_event(
+            self.context.settings,
+            queued.message,
+            outcome="OutboundTransportManager._process_loop.DELIVER",
+        )
+        if (
+            self.batch_size > 1
+            and self.get_transport_instance(queued.transport_id).supports_batches
+        ):
+            self.batch_queued_message(queued)
+        else:
+            self.deliver_queued_message(queued)
+
+    def park(self, queued: QueuedOutboundMessage):
+        """Hold back a message until the circuit of its endpoint closes."""
+        queued.state = QueuedOutboundMessage.STATE_PARKED
+        parked = self.outbound_parked.get(queued.endpoint)
+        if parked is None:
+            parked = self.outbound_parked[queued.endpoint] = deque()
+        parked.append(queued)
+
     def encode_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
         """Kick off encoding of a queued message."""
+        self.outbound_active[QueuedOutboundMessage.STATE_ENCODE] += 1
         queued.task = self.task_queue.run(
             self.perform_encode(queued),
             lambda completed: self.finished_encode(queued, completed),
@@ -398,27 +608,103 @@ class OutboundTransportManager:
 
     def finished_encode(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message encoding."""
+        self.outbound_active[QueuedOutboundMessage.STATE_ENCODE] -= 1
         if completed.exc_info:
             queued.error = completed.exc_info
             queued.state = QueuedOutboundMessage.STATE_DONE
+            self.journal_remove(queued)
+            self.outbound_done.append(queued)
         else:
             queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.journal_put(queued)
+            self.outbound_pending.append(queued)
         queued.task = None
         self.process_queued()
 
     def deliver_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
         """Kick off delivery of a queued message."""
         transport = self.get_transport_instance(queued.transport_id)
+        self.outbound_active[QueuedOutboundMessage.STATE_DELIVER] += 1
         queued.task = self.task_queue.run(
             transport.handle_message(queued.context, queued.payload, queued.endpoint),
             lambda completed: self.finished_deliver(queued, completed),
         )
         return queued.task
 
-    def finished_deliver(self, queued: QueuedOutboundMessage, completed: CompletedTask):
+    def batch_queued_message(self, queued: QueuedOutboundMessage):
+        """
+        Add a message to the batch for its endpoint.
+
+        The batch is delivered when it is full, when no more messages to the
+        endpoint can be taken from the delivery queue, or when the linger time
+        has passed since its first message was added.
+        """
+        endpoint = queued.endpoint
+        if endpoint in self.outbound_batches:
+            batch, timer = self.outbound_batches[endpoint]
+        else:
+            batch = []
+            timer = self.loop.call_later(
+                self.batch_linger, self.deliver_batch, endpoint
+            )
+            self.outbound_batches[endpoint] = (batch, timer)
+        batch.append(queued)
+        if len(batch) >= self.batch_size or self.outbound_deliver.endpoint_full(
+            endpoint
+        ):
+            timer.cancel()
+            self.deliver_batch(endpoint)
+
+    def deliver_batch(self, endpoint: str) -> asyncio.Task:
+        """Kick off delivery of the batch of messages for an endpoint."""
+        batch, _timer = self.outbound_batches.pop(endpoint)
+        transport = self.get_transport_instance(batch[0].transport_id)
+        self.outbound_active[QueuedOutboundMessage.STATE_DELIVER] += len(batch)
+        task = self.task_queue.run(
+            transport.handle_messages([queued.payload for queued in batch], endpoint),
+            lambda completed: self.finished_deliver_batch(batch, completed),
+        )
+        for queued in batch:
+            queued.task = task
+        return task
+
+    def finished_deliver_batch(
+        self, batch: Sequence[QueuedOutboundMessage], completed: CompletedTask
+    ):
+        """Handle completion of the delivery of a batch of messages."""
+        # the batch was a single operation, so it counts once for the endpoint
+        self.record_health(batch[0].endpoint, completed)
+        for queued in batch:
+            self.finished_deliver(queued, completed, record_health=False)
+
+    def record_health(self, endpoint: str, completed: CompletedTask):
+        """Record the outcome of a delivery to an endpoint."""
+        if completed.exc_info:
+            self.endpoint_health.record_failure(
+                endpoint, repr(completed.exc_info[1])
+            )
+        else:
+            timing = completed.timing
+            self.endpoint_health.record_success(
+                endpoint, timing and timing["ended"] - timing["started"],
+            )
+
+    def finished_deliver(
+        self,
+        queued: QueuedOutboundMessage,
+        completed: CompletedTask,
+        record_health: bool = True,
+    ):
         """Handle completion of queued message delivery."""
+        self.outbound_active[QueuedOutboundMessage.STATE_DELIVER] -= 1
+        self.outbound_deliver.release(queued.endpoint)
+        queued.probe = False
+        if record_health:
+            self.record_health(queued.endpoint, completed)
         if completed.exc_info:
             queued.error = completed.exc_info
+            queued.attempts += 1
+            health = self.endpoint_health.get(queued.endpoint)
 
             if queued.retries:
                 LOGGER.error(
@@ -426,20 +712,82 @@ class OutboundTransportManager:
                     queued.endpoint,
                 )
                 queued.retries -= 1
-                queued.state = QueuedOutboundMessage.STATE_RETRY
-                queued.retry_at = time.perf_counter() + 10
+                if health.available:
+                    self.schedule_retry(queued)
+                else:
+                    # sent again when a probe finds the endpoint has recovered
+                    self.journal_put(queued)
+                    self.park(queued)
             else:
                 LOGGER.exception(
                     "Outbound message could not be delivered", exc_info=queued.error,
                 )
                 LOGGER.error(">>> NOT Re-queued, state is DONE, failed to deliver msg.")
                 queued.state = QueuedOutboundMessage.STATE_DONE
+                self.journal_remove(queued)
+                self.outbound_done.append(queued)
         else:
             queued.error = None
             queued.state = QueuedOutboundMessage.STATE_DONE
+            self.journal_remove(queued)
         queued.task = None
         self.process_queued()
 
+    def retry_delay(self, attempts: int) -> float:
+        """
+        Get the delay before the next delivery attempt of a message.
+
+        The delay doubles with each failed attempt up to the configured maximum,
+        and is randomized by the jitter fraction to spread out retries.
+
+        Args:
+            attempts: The number of failed delivery attempts
+
+        """
+        delay = min(
+            self.retry_backoff * (2 ** max(attempts - 1, 0)), self.retry_backoff_max
+        )
+        if self.retry_jitter:
+            delay *= 1 + random.uniform(-self.retry_jitter, self.retry_jitter)
+        return delay
+
+    def schedule_retry(self, queued: QueuedOutboundMessage):
+        """Schedule another delivery attempt for a queued message."""
+        queued.retry_at = time.perf_counter() + self.retry_delay(queued.attempts)
+        self.journal_put(queued)
+        self._push_retry(queued)
+
+    def _push_retry(self, queued: QueuedOutboundMessage):
+        """Add a queued message to the retry heap."""
+        queued.state = QueuedOutboundMessage.STATE_RETRY
+        self._retry_sequence += 1
+        heapq.heappush(
+            self.outbound_retry, (queued.retry_at, self._retry_sequence, queued)
+        )
+
+    def get_stats(self) -> dict:
+        """Get the current counts of queued messages by state."""
+        stats = {
+            "out_encode": self.outbound_active[QueuedOutboundMessage.STATE_ENCODE],
+            "out_deliver": self.outbound_active[QueuedOutboundMessage.STATE_DELIVER],
+            "out_pending": (
+                len(self.outbound_new)
+                + len(self.outbound_pending)
+                + len(self.outbound_deliver)
+                + sum(len(batch) for batch, _timer in self.outbound_batches.values())
+            ),
+            "out_retry": len(self.outbound_retry),
+            "out_parked": sum(len(parked) for parked in self.outbound_parked.values()),
+            "out_endpoints": self.endpoint_health.get_stats(),
+        }
+        for transport_id, transport in self.running_transports.items():
+            transport_stats = transport.get_stats()
+            if transport_stats:
+                stats.setdefault("out_transports", {})[transport_id] = transport_stats
+        if self.journal:
+            stats["out_journal"] = self.journal.get_stats()
+        return stats
+
     async def flush(self):
         """Wait for any queued messages to be delivered."""
         proc_task = self.process_queued()
@@ -0,0 +1,50 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ..fair_queue import FairQueue
+
+
+class TestFairQueue(AsyncTestCase):
+    def test_round_robin_endpoints(self):
+        queue = FairQueue({"message": 1}, max_active=0, max_active_endpoint=0)
+        for n in range(4):
+            queue.push(f"busy{n}", "http://busy", "message")
+        queue.push("quiet0", "http://quiet", "message")
+        queue.push("quiet1", "http://quiet", "message")
+        assert len(queue) == 6
+        assert [queue.pop() for _ in range(7)] == [
+            "busy0",
+            "quiet0",
+            "busy1",
+            "quiet1",
+            "busy2",
+            "busy3",
+            None,
+        ]
+        assert queue.get_stats() == {"queued_message": 0, "active": 6}
+
+    def test_lane_weights(self):
+        queue = FairQueue({"message": 1, "webhook": 2}, max_active=0)
+        for n in range(4):
+            queue.push(f"m{n}", f"http://peer{n}", "message")
+            queue.push(f"w{n}", "http://controller", "webhook")
+        popped = [queue.pop() for _ in range(6)]
+        assert sorted(popped[:3]) == ["m0", "w0", "w1"]
+        assert sorted(popped[3:]) == ["m1", "w2", "w3"]
+
+    def test_limits(self):
+        queue = FairQueue({"message": 1}, max_active=3, max_active_endpoint=2)
+        for n in range(3):
+            queue.push(f"a{n}", "http://a", "message")
+        queue.push("b0", "http://b", "message")
+        queue.push("c0", "http://c", "message")
+        assert [queue.pop() for _ in range(4)] == ["a0", "b0", "c0", None]
+
+        queue.release("http://b")
+        assert queue.pop() == "a1"
+        assert queue.pop() is None
+        queue.release("http://c")
+        assert queue.pop() is None
+        queue.release("http://a")
+        assert queue.pop() == "a2"
+        assert len(queue) == 0
+        assert queue.active == {"http://a": 2}
@@ -0,0 +1,72 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ..health import EndpointHealth, EndpointHealthTracker, endpoint_origin
+
+
+class TestEndpointHealthTracker(AsyncTestCase):
+    def test_circuit(self):
+        tracker = EndpointHealthTracker(
+            failure_threshold=2, reset_timeout=10, reset_timeout_max=15
+        )
+        endpoint = "http://example"
+        health = tracker.get(endpoint)
+        assert health.available
+
+        tracker.record_failure(endpoint, "error")
+        assert health.available
+        tracker.record_failure(endpoint)
+        assert health.state == EndpointHealth.STATE_OPEN
+        assert not health.available
+        assert health.last_error == "error"
+        assert not tracker.start_probe(endpoint, health.probe_at - 1)
+        assert tracker.next_probe([endpoint, "other"]) == health.probe_at
+
+        assert tracker.start_probe(endpoint, health.probe_at)
+        assert health.state == EndpointHealth.STATE_HALF_OPEN
+        assert not tracker.start_probe(endpoint)
+        tracker.record_failure(endpoint)
+        assert health.state == EndpointHealth.STATE_OPEN
+        assert health.reset_timeout == 15
+
+        assert tracker.start_probe(endpoint, health.probe_at)
+        tracker.record_success(endpoint, 0.5)
+        tracker.record_success(endpoint, 1.5)
+        assert health.available
+        assert health.failures == 0
+        assert health.latency == 0.7
+        assert tracker.get_stats() == {
+            "http://example:80": {
+                "state": "closed",
+                "failures": 0,
+                "total_failures": 3,
+                "total_successes": 2,
+                "latency": 0.7,
+                "last_error": "error",
+            }
+        }
+
+    def test_disabled(self):
+        tracker = EndpointHealthTracker(failure_threshold=0)
+        for _ in range(10):
+            tracker.record_failure("http://example")
+        assert tracker.get("http://example").available
+
+    def test_prune(self):
+        tracker = EndpointHealthTracker(failure_threshold=1, max_endpoints=2)
+        tracker.record_failure("http://down")
+        tracker.get("http://a")
+        tracker.get("http://b")
+        assert list(tracker.endpoints) == ["http://down:80", "http://b:80"]
+
+    def test_origin(self):
+        tracker = EndpointHealthTracker(failure_threshold=2)
+        # paths on the same origin share one circuit
+        tracker.record_failure("http://hooks:8020/topic/connections/")
+        tracker.record_failure("http://hooks:8020/topic/issue_credential/")
+        assert not tracker.get("http://hooks:8020/topic/present_proof/").available
+        assert tracker.get("http://hooks:8021/topic/connections/").available
+        assert list(tracker.endpoints) == ["http://hooks:8020", "http://hooks:8021"]
+
+        assert endpoint_origin("https://Agent.example/path") == "https://agent.example:443"
+        assert endpoint_origin("ws://[::1]:8000/ws") == "ws://[::1]:8000"
+        assert endpoint_origin("not a url") == "not a url"
@@ -4,6 +4,7 @@ from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
 from aiohttp import web
 
 from ....config.injection_context import InjectionContext
+from ....config.settings import Settings
 from ....utils.stats import Collector
 
 from ...outbound.message import OutboundMessage
@@ -61,3 +62,39 @@ class TestHttpTransport(AioHTTPTestCase):
             "outbound-http:connect": 1,
             "outbound-http:POST": 1,
         }
+        assert transport.get_stats() == {
+            "pool_in_flight": 0,
+            "pool_in_flight_max": 1,
+            "pool_queued": 0,
+            "pool_queued_max": 0,
+        }
+
+    @unittest_run_loop
+    async def test_settings(self):
+        server_addr = f"http://localhost:{self.server.port}"
+
+        transport = HttpTransport()
+        transport.settings = Settings(
+            {
+                "transport.http_pool_size": 10,
+                "transport.http_pool_size_host": 2,
+                "transport.http_dns_ttl": 0,
+                "transport.http_keepalive": 0,
+                "transport.http_connect_timeout": 1,
+                "transport.http_read_timeout": 5,
+                "transport.http_total_timeout": 20,
+            }
+        )
+        async with transport:
+            connector = transport.connector
+            assert (connector.limit, connector.limit_per_host) == (10, 2)
+            assert not connector.use_dns_cache
+            assert connector.force_close
+            timeout = transport.client_session._timeout
+            assert (timeout.total, timeout.sock_connect, timeout.sock_read) == (
+                20,
+                1,
+                5,
+            )
+            await transport.handle_message(self.context, "{}", server_addr)
+        assert self.message_results == [{}]
@@ -1,11 +1,13 @@
 import asyncio
 import json
+import time
 
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
 from ....config.injection_context import InjectionContext
 from ....connections.models.connection_target import ConnectionTarget
 
+from .. import manager as test_module
 from ..manager import (
     OutboundDeliveryError,
     OutboundTransportManager,
@@ -31,6 +33,9 @@ class TestOutboundTransportManager(AsyncTestCase):
         with async_mock.patch.object(mgr, "register") as mock_register:
             await mgr.setup()
             mock_register.assert_called_once_with("http")
+        # deliveries to one endpoint are not limited by default
+        assert mgr.outbound_deliver.max_active == 200
+        assert mgr.outbound_deliver.max_active_endpoint == 0
 
     async def test_send_message(self):
         context = InjectionContext()
@@ -118,3 +123,328 @@ class TestOutboundTransportManager(AsyncTestCase):
             assert json.loads(queued.payload) == test_payload
             assert queued.retries == test_attempts - 1
             assert queued.state == QueuedOutboundMessage.STATE_PENDING
+
+    async def test_retry_backoff(self):
+        context = InjectionContext(
+            settings={"transport.retry_backoff": 2, "transport.retry_backoff_max": 5}
+        )
+        mgr = OutboundTransportManager(context)
+        assert mgr.max_retries == 4
+        with async_mock.patch.object(
+            test_module.random, "uniform", async_mock.MagicMock(return_value=0.1)
+        ) as mock_uniform:
+            assert [round(mgr.retry_delay(n), 6) for n in (1, 2, 3)] == [2.2, 4.4, 5.5]
+            mock_uniform.assert_called_with(-0.2, 0.2)
+
+    async def test_retry_scheduled(self):
+        context = InjectionContext(
+            settings={
+                "transport.max_retries": 2,
+                "transport.retry_backoff": 0.01,
+                "transport.retry_jitter": 0,
+            }
+        )
+        not_delivered = async_mock.MagicMock()
+        mgr = OutboundTransportManager(context, not_delivered)
+
+        transport_cls = async_mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport = transport_cls.return_value
+        transport.schemes = ["http"]
+        transport.start = async_mock.CoroutineMock()
+        transport.handle_message = async_mock.CoroutineMock(
+            side_effect=[OutboundDeliveryError(), None, OutboundDeliveryError()] * 3
+        )
+        transport.get_stats.return_value = {"pool_in_flight": 0}
+        await mgr.start_transport(mgr.register_class(transport_cls, "transport_cls"))
+
+        mgr.enqueue_webhook("topic", {}, "http://example")
+        await mgr.flush()
+        assert transport.handle_message.await_count == 2
+        assert not mgr.outbound_retry
+        not_delivered.assert_not_called()
+
+        mgr.enqueue_webhook("topic", {}, "http://example")
+        mgr.enqueue_webhook("topic", {}, "http://example")
+        await mgr.flush()
+        assert transport.handle_message.await_count == 7
+        not_delivered.assert_called_once()
+        stats = mgr.get_stats()
+        assert stats["out_endpoints"]["http://example:80"]["failures"] == 2
+        del stats["out_endpoints"]
+        assert stats == {
+            "out_encode": 0,
+            "out_deliver": 0,
+            "out_pending": 0,
+            "out_retry": 0,
+            "out_parked": 0,
+            "out_transports": {"transport_cls": {"pool_in_flight": 0}},
+        }
+
+    async def test_journal_replay(self):
+        context = InjectionContext(
+            settings={
+                "transport.outbound_queue": "outbound.db",
+                "transport.retry_jitter": 0,
+            }
+        )
+        mgr = OutboundTransportManager(context)
+        journal_cls = async_mock.MagicMock()
+        with async_mock.patch.object(
+            test_module.ClassLoader,
+            "load_class",
+            async_mock.MagicMock(return_value=journal_cls),
+        ) as mock_load:
+            await mgr.setup()
+            mock_load.assert_called_once_with(test_module.JOURNAL_TYPES["sqlite"])
+        journal = journal_cls.return_value
+        assert mgr.journal is journal
+
+        transport_cls = async_mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport = transport_cls.return_value
+        transport.schemes = ["http"]
+        transport.start = async_mock.CoroutineMock()
+        await mgr.start_transport(mgr.register_class(transport_cls, "transport_cls"))
+
+        target = ConnectionTarget(endpoint="http://localhost", recipient_keys=["3Dn1SJNPaCXcvvJvSbsFWP2xaCjMom3can8CQNhWrTRx"])
+        journal.load = async_mock.CoroutineMock(
+            return_value=[
+                ("a", {"endpoint": "http://a", "retries": 2}, "payload"),
+                ("b", {"endpoint": "ftp://b"}, "payload"),
+                ("c", {"endpoint": "http://localhost"}, None),
+                (
+                    "d",
+                    {"endpoint": "http://d", "attempts": 1, "retry_at": time.time() + 60},
+                    b"payload",
+                ),
+            ]
+        )
+        with async_mock.patch.object(mgr, "process_queued") as mock_process:
+            await mgr.replay_journal()
+            mock_process.assert_called_once_with()
+        assert [args[0][0] for args in journal.remove.call_args_list] == ["b", "c"]
+
+        pending, = mgr.outbound_new
+        assert pending.journal_id == "a"
+        assert pending.state == QueuedOutboundMessage.STATE_PENDING
+        assert (pending.payload, pending.retries) == ("payload", 2)
+
+        (retry_at, _, retry), = mgr.outbound_retry
+        assert retry.journal_id == "d" and retry.attempts == 1
+        assert 59 < retry_at - time.perf_counter() <= 60
+
+        pending.attempts = 1
+        mgr.schedule_retry(pending)
+        entry_id, entry, payload = journal.put.call_args[0]
+        assert entry_id == "a" and payload == "payload"
+        assert entry["attempts"] == 1
+        assert 9 < entry["retry_at"] - time.time() <= 10
+
+        # messages are not journaled before they are encoded
+        journal.put.reset_mock()
+        message = OutboundMessage(payload="{}", target=target)
+        with async_mock.patch.object(mgr, "process_queued"):
+            mgr.enqueue_message(context, message)
+        journal.put.assert_not_called()
+        queued = mgr.outbound_new[-1]
+        queued.payload = b"encoded"
+        mgr.journal_put(queued)
+        assert journal.put.call_args[0][2] == b"encoded"
+
+    async def test_circuit_breaker(self):
+        context = InjectionContext(
+            settings={"transport.circuit_failures": 1, "transport.circuit_reset": 0.02}
+        )
+        mgr = OutboundTransportManager(context)
+
+        transport_cls = async_mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport = transport_cls.return_value
+        transport.schemes = ["http"]
+        transport.start = async_mock.CoroutineMock()
+        transport.handle_message = async_mock.CoroutineMock(
+            side_effect=[OutboundDeliveryError(), None, None, None]
+        )
+        await mgr.start_transport(mgr.register_class(transport_cls, "transport_cls"))
+        endpoint = "http://example/topic/topic/"
+
+        mgr.enqueue_webhook("topic", {}, "http://example")
+        while not mgr.outbound_parked:
+            await asyncio.sleep(0.001)
+        assert mgr.endpoint_health.get(endpoint).state == "open"
+
+        mgr.enqueue_webhook("topic", {}, "http://example")
+        mgr.enqueue_webhook("topic", {}, "http://example")
+        await asyncio.sleep(0.005)
+        assert transport.handle_message.await_count == 1
+        assert mgr.get_stats()["out_parked"] == 3
+
+        await mgr.flush()
+        assert transport.handle_message.await_count == 4
+        health = mgr.get_stats()["out_endpoints"]["http://example:80"]
+        assert health["state"] == "closed"
+        assert (health["total_failures"], health["total_successes"]) == (1, 3)
+        assert "latency" in health
+
+    async def test_endpoint_delivery_limit(self):
+        context = InjectionContext(settings={"transport.max_endpoint_deliveries": 1})
+        mgr = OutboundTransportManager(context)
+        release = asyncio.Event()
+
+        async def handle_message(context, payload, endpoint):
+            await release.wait()
+
+        transport_cls = async_mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport = transport_cls.return_value
+        transport.schemes = ["http"]
+        transport.start = async_mock.CoroutineMock()
+        transport.handle_message = async_mock.CoroutineMock(side_effect=handle_message)
+        await mgr.start_transport(mgr.register_class(transport_cls, "transport_cls"))
+
+        for _ in range(3):
+            mgr.enqueue_webhook("topic", {}, "http://busy")
+        mgr.enqueue_webhook("topic", {}, "http://quiet")
+        await asyncio.sleep(0.01)
+        stats = mgr.get_stats()
+        assert (stats["out_deliver"], stats["out_pending"]) == (2, 2)
+        assert mgr.outbound_deliver.get_stats() == {
+            "queued_message": 0,
+            "queued_webhook": 2,
+            "active": 2,
+        }
+
+        release.set()
+        await mgr.flush()
+        assert transport.handle_message.await_count == 4
+
+    async def test_batch_delivery(self):
+        context = InjectionContext(
+            settings={
+                "transport.batch_size": 3,
+                "transport.batch_linger": 0.01,
+                "transport.max_retries": 0,
+            }
+        )
+        not_delivered = async_mock.MagicMock()
+        mgr = OutboundTransportManager(context, not_delivered)
+
+        transport_cls = async_mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport = transport_cls.return_value
+        transport.schemes = ["http"]
+        transport.supports_batches = True
+        transport.start = async_mock.CoroutineMock()
+        transport.handle_messages = async_mock.CoroutineMock(
+            side_effect=[None, OutboundDeliveryError()]
+        )
+        await mgr.start_transport(mgr.register_class(transport_cls, "transport_cls"))
+
+        with async_mock.patch.object(
+            mgr, "deliver_batch", wraps=mgr.deliver_batch
+        ) as mock_deliver_batch:
+            for index in range(4):
+                mgr.enqueue_webhook("topic", {"index": index}, "http://example")
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert mock_deliver_batch.call_count == 1
+            assert mgr.get_stats()["out_pending"] == 1
+            await mgr.flush()
+            assert mock_deliver_batch.call_count == 2
+
+        transport.handle_message.assert_not_called()
+        assert [
+            [json.loads(payload)["index"] for payload in call[0][0]]
+            for call in transport.handle_messages.call_args_list
+        ] == [[0, 1, 2], [3]]
+        not_delivered.assert_called_once()
+        stats = mgr.get_stats()
+        assert stats["out_endpoints"]["http://example:80"]["failures"] == 1
+        assert stats["out_deliver"] == 0
+        assert not mgr.outbound_batches
+        assert not mgr.outbound_deliver.total_active
+
+    async def test_batch_endpoint_full(self):
+        context = InjectionContext(
+            settings={
+                "transport.batch_size": 5,
+                "transport.batch_linger": 0.05,
+                "transport.max_endpoint_deliveries": 2,
+            }
+        )
+        mgr = OutboundTransportManager(context)
+
+        transport_cls = async_mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport = transport_cls.return_value
+        transport.schemes = ["http"]
+        transport.supports_batches = True
+        transport.start = async_mock.CoroutineMock()
+        transport.handle_messages = async_mock.CoroutineMock()
+        await mgr.start_transport(mgr.register_class(transport_cls, "transport_cls"))
+
+        # no more messages can join a batch once the endpoint limit is reached,
+        # so the batch does not wait for the linger time
+        for _ in range(3):
+            mgr.enqueue_webhook("topic", {}, "http://example")
+        await asyncio.sleep(0.01)
+        assert transport.handle_messages.await_count == 1
+        await asyncio.wait_for(mgr.flush(), 1)
+        assert [
+            len(call[0][0]) for call in transport.handle_messages.call_args_list
+        ] == [2, 1]
+
+    async def test_batch_unsupported(self):
+        context = InjectionContext(settings={"transport.batch_size": 3})
+        mgr = OutboundTransportManager(context)
+
+        transport_cls = async_mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport = transport_cls.return_value
+        transport.schemes = ["http"]
+        transport.supports_batches = False
+        transport.start = async_mock.CoroutineMock()
+        transport.handle_message = async_mock.CoroutineMock()
+        await mgr.start_transport(mgr.register_class(transport_cls, "transport_cls"))
+
+        for _ in range(3):
+            mgr.enqueue_webhook("topic", {}, "http://example")
+        await mgr.flush()
+        assert transport.handle_message.await_count == 3
+        transport.handle_messages.assert_not_called()
+        assert not mgr.outbound_batches
+
+    async def test_batch_cancelled(self):
+        context = InjectionContext(
+            settings={"transport.batch_size": 2, "transport.max_retries": 0}
+        )
+        not_delivered = async_mock.MagicMock()
+        mgr = OutboundTransportManager(context, not_delivered)
+
+        transport_cls = async_mock.MagicMock()
+        transport_cls.schemes = ["http"]
+        transport = transport_cls.return_value
+        transport.schemes = ["http"]
+        transport.supports_batches = True
+        transport.start = async_mock.CoroutineMock()
+        transport.stop = async_mock.CoroutineMock()
+        started = asyncio.Event()
+
+        async def handle_messages(payloads, endpoint):
+            started.set()
+            await asyncio.sleep(10)
+
+        transport.handle_messages = handle_messages
+        await mgr.start_transport(mgr.register_class(transport_cls, "transport_cls"))
+
+        mgr.enqueue_webhook("topic", {}, "http://example")
+        mgr.enqueue_webhook("topic", {}, "http://example")
+        await asyncio.wait_for(started.wait(), 1)
+        assert mgr.get_stats()["out_deliver"] == 2
+        await mgr.stop(wait=False)
+        await asyncio.sleep(0.01)
+        # every message of the cancelled batch is completed
+        assert mgr.outbound_active[QueuedOutboundMessage.STATE_DELIVER] == 0
+        assert not mgr.outbound_deliver.total_active
+        assert not_delivered.call_count == 2
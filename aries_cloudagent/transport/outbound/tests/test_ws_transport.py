@@ -5,6 +5,7 @@ from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
 from aiohttp import web, WSMsgType
 
 from ....config.injection_context import InjectionContext
+from ....config.settings import Settings
 
 from ..ws import WsTransport
 
@@ -13,14 +14,19 @@ class TestWsTransport(AioHTTPTestCase):
     async def setUpAsync(self):
         self.context = InjectionContext()
         self.message_results = []
+        self.socket_count = 0
+        self.close_after = None
 
     async def receive_message(self, request):
         ws = web.WebSocketResponse()
         await ws.prepare(request)
+        self.socket_count += 1
 
         async for msg in ws:
             if msg.type in (WSMsgType.TEXT, WSMsgType.BINARY):
                 self.message_results.append(json.loads(msg.data))
+                if len(self.message_results) == self.close_after:
+                    await ws.close()
 
             elif msg.type == WSMsgType.ERROR:
                 raise Exception(ws.exception())
@@ -46,3 +52,73 @@ class TestWsTransport(AioHTTPTestCase):
         transport = WsTransport()
         await asyncio.wait_for(send_message(transport, "{}", endpoint=server_addr), 5.0)
         assert self.message_results == [{}]
+
+    @unittest_run_loop
+    async def test_pooled_connections(self):
+        server_addr = f"ws://localhost:{self.server.port}"
+        transport = WsTransport()
+        transport.settings = Settings({"transport.ws_pool_size_host": 2})
+
+        async with transport:
+            await transport.handle_message(self.context, "{}", server_addr)
+            await transport.handle_message(self.context, b"{}", server_addr)
+            assert len(transport.connections[server_addr]) == 1
+            await asyncio.gather(
+                *(
+                    transport.handle_message(self.context, "{}", server_addr)
+                    for _ in range(10)
+                )
+            )
+            assert len(transport.connections[server_addr]) <= 2
+            while len(self.message_results) < 12:
+                await asyncio.sleep(0.01)
+        assert self.message_results == [{}] * 12
+        assert self.socket_count <= 2
+        assert not transport.connections
+
+    @unittest_run_loop
+    async def test_handle_messages(self):
+        server_addr = f"ws://localhost:{self.server.port}"
+        transport = WsTransport()
+        assert transport.supports_batches
+
+        async with transport:
+            await transport.handle_messages(
+                ['{"a": 1}', b'{"b": 2}', '{"c": 3}'], server_addr
+            )
+            assert len(transport.connections[server_addr]) == 1
+            assert not transport.connections[server_addr][0].pending
+            while len(self.message_results) < 3:
+                await asyncio.sleep(0.01)
+        assert self.message_results == [{"a": 1}, {"b": 2}, {"c": 3}]
+        assert self.socket_count == 1
+
+    @unittest_run_loop
+    async def test_reconnect(self):
+        server_addr = f"ws://localhost:{self.server.port}"
+        transport = WsTransport()
+        self.close_after = 1
+
+        async with transport:
+            await transport.handle_message(self.context, "{}", server_addr)
+            while server_addr in transport.connections:
+                await asyncio.sleep(0.01)
+            await transport.handle_message(self.context, "{}", server_addr)
+            while len(self.message_results) < 2:
+                await asyncio.sleep(0.01)
+        assert self.socket_count == 2
+
+    @unittest_run_loop
+    async def test_idle_eviction(self):
+        server_addr = f"ws://localhost:{self.server.port}"
+        transport = WsTransport()
+        transport.settings = Settings({"transport.ws_idle_timeout": 0.05})
+
+        async with transport:
+            await transport.handle_message(self.context, "{}", server_addr)
+            assert transport.connections
+            await asyncio.wait_for(self._wait_evicted(transport), 1.0)
+
+    async def _wait_evicted(self, transport):
+        while transport.connections:
+            await asyncio.sleep(0.01)
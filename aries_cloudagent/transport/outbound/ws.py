@@ -1,32 +1,103 @@
 """Websockets outbound transport."""
 
+import asyncio
 import logging
-from typing import Union
+import time
+from typing import Sequence, Union
 
-from aiohttp import ClientSession, DummyCookieJar
+from aiohttp import ClientSession, ClientWebSocketResponse, DummyCookieJar, WSMsgType
 
 from ...config.injection_context import InjectionContext
 
 from .base import BaseOutboundTransport
 
 
+class WsConnection:
+    """A pooled websocket connection to an endpoint."""
+
+    def __init__(self, endpoint: str, ws: ClientWebSocketResponse):
+        """Initialize a `WsConnection` instance."""
+        self.endpoint = endpoint
+        self.ws = ws
+        self.last_used = time.perf_counter()
+        self.pending = 0
+        self.reader: asyncio.Task = None
+        self._send_lock = asyncio.Lock()
+
+    @property
+    def closed(self) -> bool:
+        """Check whether the websocket is closed or closing."""
+        return self.ws.closed
+
+    async def send(self, payload: Union[str, bytes]):
+        """Send a message over the websocket."""
+        await self.send_many((payload,))
+
+    async def send_many(self, payloads: Sequence[Union[str, bytes]]):
+        """
+        Send several messages over the websocket as a burst of frames.
+
+        The frames are written back to back while holding the send lock, so
+        the writer only waits to drain once its buffer is full.
+        """
+        self.pending += len(payloads)
+        try:
+            # frames are written whole, but only one sender may wait to drain
+            async with self._send_lock:
+                for payload in payloads:
+                    if isinstance(payload, bytes):
+                        await self.ws.send_bytes(payload)
+                    else:
+                        await self.ws.send_str(payload)
+        finally:
+            self.pending -= len(payloads)
+            self.last_used = time.perf_counter()
+
+    async def close(self):
+        """Close the websocket."""
+        await self.ws.close()
+
+
 class WsTransport(BaseOutboundTransport):
     """Websockets outbound transport class."""
 
     schemes = ("ws", "wss")
+    supports_batches = True
 
     def __init__(self) -> None:
         """Initialize an `WsTransport` instance."""
         super(WsTransport, self).__init__()
+        self.client_session: ClientSession = None
+        self.connections = {}
+        self.heartbeat: float = None
+        self.idle_timeout: float = None
+        self.pool_size_host: int = None
         self.logger = logging.getLogger(__name__)
+        self._connecting = {}
+        self._evict_task: asyncio.Task = None
 
     async def start(self):
         """Start the outbound transport."""
+        settings = self.settings
+        self.heartbeat = float(settings.get("transport.ws_heartbeat", 30))
+        self.idle_timeout = float(settings.get("transport.ws_idle_timeout", 60))
+        self.pool_size_host = int(settings.get("transport.ws_pool_size_host", 2))
         self.client_session = ClientSession(cookie_jar=DummyCookieJar())
+        if self.idle_timeout:
+            self._evict_task = asyncio.get_event_loop().create_task(
+                self.evict_idle()
+            )
         return self
 
     async def stop(self):
         """Stop the outbound transport."""
+        if self._evict_task:
+            self._evict_task.cancel()
+            self._evict_task = None
+        for pool in list(self.connections.values()):
+            for conn in list(pool):
+                await conn.close()
+        self.connections = {}
         await self.client_session.close()
         self.client_session = None
 
@@ -41,9 +112,95 @@ class WsTransport(BaseOutboundTransport):
             payload: message payload in string or byte format
             endpoint: URI endpoint for delivery
         """
-        # aiohttp should automatically handle websocket sessions
-        async with self.client_session.ws_connect(endpoint) as ws:
-            if isinstance(payload, bytes):
-                await ws.send_bytes(payload)
-            else:
-                await ws.send_str(payload)
+        await self.handle_messages((payload,), endpoint)
+
+    async def handle_messages(
+        self, payloads: Sequence[Union[str, bytes]], endpoint: str
+    ):
+        """
+        Send several messages to an endpoint as a burst over one connection.
+
+        Args:
+            payloads: message payloads in string or byte format
+            endpoint: URI endpoint for delivery
+        """
+        conn = await self.get_connection(endpoint)
+        try:
+            await conn.send_many(payloads)
+        except ConnectionError:
+            # the peer may have dropped an idle connection: reconnect once
+            self.logger.debug("Reconnecting websocket to %s", endpoint)
+            self.discard(conn)
+            conn = await self.get_connection(endpoint)
+            await conn.send_many(payloads)
+
+    async def get_connection(self, endpoint: str) -> WsConnection:
+        """
+        Get an open connection to an endpoint, connecting if necessary.
+
+        Messages share the least busy connection, and another connection is
+        only opened when every connection is busy and the pool is not full.
+        """
+        pool = [conn for conn in self.connections.get(endpoint, ()) if not conn.closed]
+        conn = min(pool, key=lambda conn: conn.pending, default=None)
+        if conn and (
+            not conn.pending
+            or len(pool) >= self.pool_size_host
+            or endpoint in self._connecting
+        ):
+            return conn
+        connecting = self._connecting.get(endpoint)
+        if not connecting:
+            connecting = asyncio.ensure_future(self.connect(endpoint))
+            self._connecting[endpoint] = connecting
+            connecting.add_done_callback(
+                lambda _task: self._connecting.pop(endpoint, None)
+            )
+        # a cancelled message must not cancel the connection shared by others
+        return await asyncio.shield(connecting)
+
+    async def connect(self, endpoint: str) -> WsConnection:
+        """Open a new pooled connection to an endpoint."""
+        ws = await self.client_session.ws_connect(
+            endpoint, heartbeat=self.heartbeat or None
+        )
+        conn = WsConnection(endpoint, ws)
+        self.connections.setdefault(endpoint, []).append(conn)
+        conn.reader = asyncio.get_event_loop().create_task(self.read(conn))
+        return conn
+
+    async def read(self, conn: WsConnection):
+        """Process incoming frames, including heartbeats, until the socket closes."""
+        try:
+            async for msg in conn.ws:
+                if msg.type == WSMsgType.ERROR:
+                    self.logger.warning(
+                        "Websocket error from %s: %s",
+                        conn.endpoint,
+                        conn.ws.exception(),
+                    )
+                    break
+                # replies are not expected on outbound connections
+                self.logger.debug("Ignoring websocket message from %s", conn.endpoint)
+        finally:
+            self.discard(conn)
+
+    def discard(self, conn: WsConnection):
+        """Remove a connection from the pool."""
+        pool = self.connections.get(conn.endpoint)
+        if pool and conn in pool:
+            pool.remove(conn)
+            if not pool:
+                del self.connections[conn.endpoint]
+        if not conn.closed:
+            asyncio.ensure_future(conn.close())
+
+    async def evict_idle(self):
+        """Periodically close connections which have not been used recently."""
+        while True:
+            await asyncio.sleep(self.idle_timeout / 2)
+            now = time.perf_counter()
+            for pool in list(self.connections.values()):
+                for conn in list(pool):
+                    if not conn.pending and now - conn.last_used > self.idle_timeout:
+                        self.discard(conn)
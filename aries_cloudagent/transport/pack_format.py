@@ -1,7 +1,9 @@
 """Standard packed message format classes."""
 
+import hashlib
 import json
 import logging
+from collections import OrderedDict
 from typing import Sequence, Tuple, Union
 
 from ..config.base import InjectorError
@@ -22,10 +24,16 @@ LOGGER = logging.getLogger(__name__)
 class PackWireFormat(BaseWireFormat):
     """Standard DIDComm message parser and serializer."""
 
+    # the number and total size of recently packed messages kept for reuse
+    PACK_CACHE_SIZE = 32
+    PACK_CACHE_BYTES = 4 * 1024 * 1024
+
     def __init__(self):
         """Initialize the pack wire format instance."""
         super().__init__()
         self.task_queue: TaskQueue = None
+        self.pack_cache = OrderedDict()
+        self.pack_cache_bytes = 0
 
     async def parse_message(
         self, context: InjectionContext, message_body: Union[str, bytes],
@@ -167,22 +175,75 @@ class PackWireFormat(BaseWireFormat):
         if not wallet:
             raise MessageEncodeError("No wallet instance")
 
-        try:
-            message = await wallet.pack_message(
-                message_json, recipient_keys, sender_key
-            )
-        except WalletError as e:
-            raise MessageEncodeError("Message pack failed") from e
+        # the same message may be sent to several targets with the same keys,
+        # and is identified by its digest so that the plaintext is not kept
+        recipient_keys = tuple(recipient_keys)
+        routing_keys = tuple(routing_keys or ())
+        digest = hashlib.sha256(
+            message_json.encode() if isinstance(message_json, str) else message_json
+        ).digest()
+        cache_key = (wallet, digest, recipient_keys, sender_key)
+        message = self.pack_cache.get(cache_key + (routing_keys,))
+        if message:
+            self.pack_cache.move_to_end(cache_key + (routing_keys,))
+            return message
+
+        message = self.pack_cache.get(cache_key + ((),))
+        if not message:
+            try:
+                message = await wallet.pack_message(
+                    message_json, recipient_keys, sender_key
+                )
+            except WalletError as e:
+                raise MessageEncodeError("Message pack failed") from e
+            self.cache_packed(cache_key + ((),), message)
 
         if routing_keys:
             recip_keys = recipient_keys
             for router_key in routing_keys:
-                message = json.loads(message.decode("utf-8"))
-                fwd_msg = Forward(to=recip_keys[0], msg=message)
+                fwd_msg = self.forward_json(recip_keys[0], message)
                 # Forwards are anon packed
                 recip_keys = [router_key]
                 try:
-                    message = await wallet.pack_message(fwd_msg.to_json(), recip_keys)
+                    message = await wallet.pack_message(fwd_msg, recip_keys)
                 except WalletError as e:
                     raise MessageEncodeError("Forward message pack failed") from e
+            self.cache_packed(cache_key + (routing_keys,), message)
         return message
+
+    def cache_packed(self, cache_key: tuple, message: bytes):
+        """Keep a packed message for reuse, evicting the least recently used."""
+        if len(message) > self.PACK_CACHE_BYTES:
+            return
+        previous = self.pack_cache.pop(cache_key, None)
+        if previous:
+            self.pack_cache_bytes -= len(previous)
+        self.pack_cache[cache_key] = message
+        self.pack_cache_bytes += len(message)
+        while (
+            len(self.pack_cache) > self.PACK_CACHE_SIZE
+            or self.pack_cache_bytes > self.PACK_CACHE_BYTES
+        ):
+            _, evicted = self.pack_cache.popitem(last=False)
+            self.pack_cache_bytes -= len(evicted)
+
+    @staticmethod
+    def forward_json(to: str, packed: bytes) -> bytes:
+        """
+        Wrap a packed message in a forward message.
+
+        The packed message is embedded as it is, without parsing and serializing
+        it again.
+
+        Args:
+            to: the recipient key of the packed message
+            packed: the packed message
+
+        Returns:
+            The serialized forward message
+
+        """
+        fwd_msg = Forward(to=to, msg={}).serialize()
+        del fwd_msg["msg"]
+        prefix = json.dumps(fwd_msg)[:-1].encode("ascii")
+        return prefix + b', "msg": ' + packed + b"}"
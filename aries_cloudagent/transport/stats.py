@@ -60,3 +60,60 @@ class StatsTracer(aiohttp.TraceConfig):
     async def request_end(self, session, context, params):
         """Handle the end of request."""
         context.fetch_timer.stop()
+
+
+class PoolTracer(aiohttp.TraceConfig):
+    """
+    Attach hooks to client session events and track connection pool usage.
+
+    The number of requests in flight and waiting for the pool are kept as
+    gauges, along with their peak values, rather than being logged as timings.
+    A request is in flight from acquiring a connection until its response
+    headers arrive or it fails. aiohttp reports no event when a connection
+    is returned to the pool, so connections still reading a response body
+    are not counted.
+    """
+
+    def __init__(self):
+        """Initialize the `PoolTracer` instance."""
+        super().__init__()
+        self.in_flight = 0
+        self.in_flight_max = 0
+        self.queued = 0
+        self.queued_max = 0
+        self.on_connection_queued_start.append(self.connection_queued_start)
+        self.on_connection_queued_end.append(self.connection_queued_end)
+        self.on_connection_reuseconn.append(self.connection_ready)
+        self.on_connection_create_end.append(self.connection_ready)
+        self.on_request_end.append(self.request_end)
+        self.on_request_exception.append(self.request_end)
+
+    async def connection_queued_start(self, session, context, params):
+        """Handle the start of a queued connection."""
+        self.queued += 1
+        self.queued_max = max(self.queued_max, self.queued)
+
+    async def connection_queued_end(self, session, context, params):
+        """Handle the end of a queued connection."""
+        self.queued -= 1
+
+    async def connection_ready(self, session, context, params):
+        """Handle the end of connection acquisition."""
+        context.in_flight = True
+        self.in_flight += 1
+        self.in_flight_max = max(self.in_flight_max, self.in_flight)
+
+    async def request_end(self, session, context, params):
+        """Handle the end of a request, successful or not."""
+        if getattr(context, "in_flight", False):
+            context.in_flight = False
+            self.in_flight -= 1
+
+    def get_stats(self) -> dict:
+        """Get the current and peak connection pool usage."""
+        return {
+            "pool_in_flight": self.in_flight,
+            "pool_in_flight_max": self.in_flight_max,
+            "pool_queued": self.queued,
+            "pool_queued_max": self.queued_max,
+        }
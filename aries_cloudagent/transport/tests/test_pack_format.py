@@ -111,3 +111,87 @@ class TestPackWireFormat(AsyncTestCase):
         assert message_dict["@type"] == FORWARD
         assert delivery.recipient_verkey == router_did.verkey
         assert delivery.sender_verkey is None
+
+    async def test_forward_nested(self):
+        local_did = await self.wallet.create_local_did(self.test_seed)
+        router_did = await self.wallet.create_local_did(self.test_routing_seed)
+        serializer = PackWireFormat()
+        message_json = json.dumps(self.test_message)
+
+        packed_json = await serializer.encode_message(
+            self.context,
+            message_json,
+            (local_did.verkey,),
+            (router_did.verkey, router_did.verkey),
+            local_did.verkey,
+        )
+        for _ in range(2):
+            message_dict, delivery = await serializer.parse_message(
+                self.context, packed_json
+            )
+            assert message_dict["@type"] == FORWARD
+            assert delivery.recipient_verkey == router_did.verkey
+            packed_json = json.dumps(message_dict["msg"]).encode("ascii")
+        assert message_dict["to"] == local_did.verkey
+
+        message_dict, delivery = await serializer.parse_message(
+            self.context, packed_json
+        )
+        assert message_dict == self.test_message
+        assert delivery.sender_verkey == local_did.verkey
+
+    async def test_pack_cache(self):
+        local_did = await self.wallet.create_local_did(self.test_seed)
+        router_did = await self.wallet.create_local_did(self.test_routing_seed)
+        serializer = PackWireFormat()
+        message_json = json.dumps(self.test_message)
+        recipient_keys = [local_did.verkey]
+
+        with async_mock.patch.object(
+            self.wallet, "pack_message", wraps=self.wallet.pack_message
+        ) as mock_pack:
+            direct = await serializer.encode_message(
+                self.context, message_json, recipient_keys, (), local_did.verkey
+            )
+            routed = await serializer.encode_message(
+                self.context,
+                message_json,
+                recipient_keys,
+                [router_did.verkey],
+                local_did.verkey,
+            )
+            assert mock_pack.call_count == 2
+            assert (
+                await serializer.encode_message(
+                    self.context,
+                    message_json,
+                    recipient_keys,
+                    [router_did.verkey],
+                    local_did.verkey,
+                )
+                == routed
+            )
+            assert mock_pack.call_count == 2
+
+        message_dict, _ = await serializer.parse_message(self.context, routed)
+        assert message_dict["msg"] == json.loads(direct)
+
+        # the plaintext is not kept in the cache keys
+        for cache_key in serializer.pack_cache:
+            assert message_json not in cache_key
+
+        serializer.PACK_CACHE_SIZE = 1
+        serializer.cache_packed(("other",), b"{}")
+        assert list(serializer.pack_cache) == [("other",)]
+        assert serializer.pack_cache_bytes == 2
+
+        # entries are also evicted to keep the total size bounded
+        serializer.PACK_CACHE_SIZE = 10
+        serializer.PACK_CACHE_BYTES = 5
+        serializer.cache_packed(("a",), b"abc")
+        serializer.cache_packed(("b",), b"abc")
+        assert list(serializer.pack_cache) == [("b",)]
+        serializer.cache_packed(("b",), b"abcd")
+        serializer.cache_packed(("large",), b"abcdef")
+        assert list(serializer.pack_cache) == [("b",)]
+        assert serializer.pack_cache_bytes == 4
@@ -0,0 +1,170 @@
+"""Ordered execution of related tasks on top of a task queue."""
+
+import time
+from collections import deque
+from typing import Callable, Coroutine
+
+from ..core.error import BaseError
+
+from .task_queue import CompletedTask, PendingTask, TaskQueue
+
+
+class TaskLaneFullError(BaseError):
+    """The lane for a task has reached its maximum number of waiting tasks."""
+
+
+class TaskLane:
+    """A lane running one task at a time, in the order they were added."""
+
+    def __init__(self, key: str):
+        """Initialize the lane."""
+        self.key = key
+        self.active: PendingTask = None
+        self.waiting = deque()
+
+    @property
+    def busy(self) -> bool:
+        """Check whether the lane has a task in the queue."""
+        return bool(self.active)
+
+
+class TaskLanes:
+    """
+    Run related tasks one at a time while unrelated tasks run in parallel.
+
+    Each task is added with a key, and tasks with the same key share a lane.
+    A lane passes a single task at a time to the task queue, so tasks with the
+    same key run in order, while tasks with other keys are only limited by the
+    number of lanes which may be busy at once and by the task queue itself.
+    Lanes waiting for their turn are started in the order they became ready.
+    Tasks without a key are passed straight on.
+    """
+
+    def __init__(self, task_queue: TaskQueue, lane_count: int, max_depth: int = 0):
+        """
+        Initialize a `TaskLanes` instance.
+
+        Args:
+            task_queue: the task queue to run the tasks
+            lane_count: the maximum number of keys with a task in the queue at
+                once, or 0 to run every task unordered
+            max_depth: the maximum number of tasks waiting for a single key,
+                or 0 for no limit
+
+        """
+        self.task_queue = task_queue
+        self.lane_count = lane_count
+        self.max_depth = max_depth
+        # lanes are only kept while they have tasks
+        self.lanes = {}
+        # idle lanes with waiting tasks, in the order they became ready
+        self.ready = deque()
+        self.total_busy = 0
+        self.total_waiting = 0
+        self.total_rejected = 0
+
+    def put(
+        self,
+        coro: Coroutine,
+        task_complete: Callable = None,
+        ident: str = None,
+        key: str = None,
+    ) -> PendingTask:
+        """
+        Add a new task, delaying execution until earlier tasks in its lane are done.
+
+        Args:
+            coro: The coroutine to run
+            task_complete: A callback to run on completion
+            ident: A string identifier for the task
+            key: The key relating the task to others which must run before it
+
+        Returns: a future resolving to the asyncio task instance once queued
+
+        Raises:
+            TaskLaneFullError: If the lane already has too many waiting tasks
+
+        """
+        if not key or not self.lane_count:
+            return self.task_queue.put(coro, task_complete, ident)
+
+        lane = self.lanes.get(key)
+        if not lane:
+            lane = self.lanes[key] = TaskLane(key)
+        elif self.max_depth and len(lane.waiting) >= self.max_depth:
+            self.total_rejected += 1
+            coro.close()
+            raise TaskLaneFullError(f"Task lane {key} is full")
+
+        pending = PendingTask(
+            coro,
+            lambda completed: self._completed(lane, task_complete, completed),
+            ident,
+        )
+        if self.task_queue.timed:
+            pending.queued_time = time.perf_counter()
+        if not lane.busy and not lane.waiting:
+            self.ready.append(lane)
+        lane.waiting.append(pending)
+        self.total_waiting += 1
+        self._fill()
+        return pending
+
+    def _fill(self):
+        """Start the next task of the ready lanes while fewer lanes are busy."""
+        while self.ready and self.total_busy < self.lane_count:
+            lane = self.ready.popleft()
+            self.total_waiting -= 1
+            self._start(lane, lane.waiting.popleft())
+
+    def _start(self, lane: TaskLane, pending: PendingTask):
+        """Pass a task on to the task queue."""
+        lane.active = pending
+        self.total_busy += 1
+        self.task_queue.put_pending(pending)
+        if pending.cancelled:
+            self._advance(lane)
+
+    def _completed(
+        self, lane: TaskLane, task_complete: Callable, completed: CompletedTask
+    ):
+        """Handle completion of the active task in a lane."""
+        try:
+            if task_complete:
+                task_complete(completed)
+        finally:
+            self._advance(lane)
+
+    def _advance(self, lane: TaskLane):
+        """Release the lane of a finished task and start the next ready lane."""
+        lane.active = None
+        self.total_busy -= 1
+        if lane.waiting:
+            # queue behind the other ready lanes, so no key can hold a lane
+            self.ready.append(lane)
+        elif self.lanes.get(lane.key) is lane:
+            del self.lanes[lane.key]
+        self._fill()
+
+    def cancel_pending(self):
+        """Cancel the tasks waiting in every lane."""
+        for lane in self.lanes.values():
+            for pending in lane.waiting:
+                pending.cancel()
+            lane.waiting.clear()
+        self.lanes = {}
+        self.ready.clear()
+        self.total_waiting = 0
+
+    def get_stats(self) -> dict:
+        """Get the occupancy of the lanes."""
+        return {
+            "lanes": self.lane_count,
+            "lanes_busy": self.total_busy,
+            "lanes_ready": len(self.ready),
+            "lane_waiting": self.total_waiting,
+            "lane_waiting_max": max(
+                (len(lane.waiting) for lane in self.lanes.values()), default=0
+            ),
+            "lane_rejected": self.total_rejected,
+        }
@@ -322,11 +322,32 @@ class TaskQueue:
         Returns: a future resolving to the asyncio task instance once queued
 
         """
-        pending = PendingTask(coro, task_complete, ident)
+        return self.put_pending(PendingTask(coro, task_complete, ident))
+
+    def put_pending(self, pending: PendingTask) -> PendingTask:
+        """
+        Add a pending task to the queue, delaying execution if busy.
+
+        Args:
+            pending: The `PendingTask` to run
+
+        Returns: the pending task
+
+        """
         if self._cancelled:
             pending.cancel()
         elif self.ready:
-            pending.task = self.run(coro, task_complete, pending.ident)
+            timing = None
+            if self.timed and pending.queued_time:
+                # the task was held back before it was added to the queue
+                pending.unqueued_time = time.perf_counter()
+                timing = {
+                    "queued": pending.queued_time,
+                    "unqueued": pending.unqueued_time,
+                }
+            pending.task = self.run(
+                pending.coro, pending.complete_hook, pending.ident, timing
+            )
         else:
             self.add_pending(pending)
         return pending
@@ -0,0 +1,120 @@
+import asyncio
+from asynctest import TestCase
+
+from ..task_lanes import TaskLaneFullError, TaskLanes
+from ..task_queue import CompletedTask, TaskQueue
+
+
+async def retval(val, events: list, *, delay=0.01):
+    events.append(("start", val))
+    await asyncio.sleep(delay)
+    events.append(("end", val))
+    return val
+
+
+class TestTaskLanes(TestCase):
+    async def test_ordered_by_key(self):
+        queue = TaskQueue()
+        lanes = TaskLanes(queue, 8)
+        events = []
+        completed = []
+
+        def done(complete: CompletedTask):
+            completed.append(complete.task.result())
+
+        lanes.put(retval(1, events), done, key="a")
+        lanes.put(retval(2, events), done, key="a")
+        lanes.put(retval(3, events), done, key="b")
+        lanes.put(retval(4, events), done)
+        assert queue.current_active == 3
+        assert lanes.get_stats() == {
+            "lanes": 8,
+            "lanes_busy": 2,
+            "lanes_ready": 0,
+            "lane_waiting": 1,
+            "lane_waiting_max": 1,
+            "lane_rejected": 0,
+        }
+
+        while lanes.lanes:
+            await queue.flush()
+        assert sorted(completed) == [1, 2, 3, 4]
+        assert events.index(("end", 1)) < events.index(("start", 2))
+        assert events.index(("start", 3)) < events.index(("end", 1))
+        assert not lanes.get_stats()["lanes_busy"]
+
+    async def test_no_lanes(self):
+        queue = TaskQueue()
+        lanes = TaskLanes(queue, 0)
+        events = []
+        lanes.put(retval(1, events), key="a")
+        lanes.put(retval(2, events), key="a")
+        assert queue.current_active == 2
+        assert not lanes.lanes
+        await queue.flush()
+
+    async def test_max_depth(self):
+        queue = TaskQueue()
+        lanes = TaskLanes(queue, 1, 1)
+        events = []
+        lanes.put(retval(1, events), key="a")
+        pending = lanes.put(retval(2, events), key="b")
+        # the depth limit applies to each key
+        lanes.put(retval(3, events), key="a")
+        with self.assertRaises(TaskLaneFullError):
+            lanes.put(retval(4, events), key="b")
+        assert lanes.get_stats()["lane_rejected"] == 1
+
+        lanes.cancel_pending()
+        assert pending.cancelled
+        await queue.flush()
+        assert events == [("start", 1), ("end", 1)]
+        assert not lanes.lanes
+
+    async def test_lane_count(self):
+        queue = TaskQueue()
+        lanes = TaskLanes(queue, 2)
+        events = []
+        for key in ("a", "b", "c", "a", "d"):
+            lanes.put(retval(key, events), key=key)
+        # only two keys run at once, and unrelated keys never share a lane
+        assert queue.current_active == 2
+        assert set(lanes.lanes) == {"a", "b", "c", "d"}
+        stats = lanes.get_stats()
+        assert (stats["lanes_busy"], stats["lanes_ready"]) == (2, 2)
+        assert stats["lane_waiting"] == 3
+
+        while lanes.lanes:
+            await queue.flush()
+        starts = [val for (evt, val) in events if evt == "start"]
+        # a lane with more tasks waits behind the other ready lanes
+        assert starts == ["a", "b", "c", "d", "a"]
+        assert events.index(("end", "a")) < events.index(("start", "c"))
+        assert not lanes.get_stats()["lanes_busy"]
+
+    async def test_queue_limit(self):
+        queue = TaskQueue(1, timed=True)
+        lanes = TaskLanes(queue, 4)
+        events = []
+        lanes.put(retval(1, events), key="a")
+        lanes.put(retval(2, events), key="b")
+        lanes.put(retval(3, events), key="b")
+        assert queue.current_active == 1
+        assert queue.current_pending == 1
+        while lanes.lanes:
+            await queue.flush()
+        assert [val for (evt, val) in events if evt == "start"] == [1, 2, 3]
+
+    async def test_failed_task(self):
+        queue = TaskQueue()
+        lanes = TaskLanes(queue, 4)
+        completed = []
+
+        async def fail():
+            raise ValueError("failed")
+
+        lanes.put(fail(), completed.append, key="a")
+        lanes.put(retval(1, []), completed.append, key="a")
+        while lanes.lanes:
+            await queue.flush()
+        assert completed[0].exc_info and not completed[1].exc_info
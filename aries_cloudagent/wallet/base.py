@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from collections import namedtuple
-from typing import Sequence
+from typing import Sequence, Union
 
 
 KeyInfo = namedtuple("KeyInfo", "verkey metadata")
@@ -269,7 +269,10 @@ class BaseWallet(ABC):
 
     @abstractmethod
     async def pack_message(
-        self, message: str, to_verkeys: Sequence[str], from_verkey: str = None
+        self,
+        message: Union[str, bytes],
+        to_verkeys: Sequence[str],
+        from_verkey: str = None,
     ) -> bytes:
         """
         Pack a message for one or more recipients.
@@ -1,7 +1,8 @@
 """In-memory implementation of BaseWallet interface."""
 
 import asyncio
-from typing import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Sequence, Union
 
 from .base import BaseWallet, KeyInfo, DIDInfo
 from .crypto import (
@@ -11,7 +12,9 @@ from .crypto import (
     sign_message,
     verify_signed_message,
     encode_pack_message,
-    decode_pack_message,
+    decode_pack_message_with_keys,
+    pack_message_recipients,
+    PackKeyCache,
 )
 from .error import WalletError, WalletDuplicateError, WalletNotFoundError
 from .util import b58_to_bytes, bytes_to_b58
@@ -22,12 +25,16 @@ class BasicWallet(BaseWallet):
 
     WALLET_TYPE = "basic"
 
+    CRYPTO_EXECUTOR_PROCESS = "process"
+    CRYPTO_EXECUTOR_THREAD = "thread"
+
     def __init__(self, config: dict = None):
         """
         Initialize a `BasicWallet` instance.
 
         Args:
-            config: {name, key, seed, did, auto-create, auto-remove}
+            config: {name, key, seed, did, auto-create, auto-remove,
+                crypto_workers, crypto_executor}
 
         """
         if not config:
@@ -37,6 +44,19 @@ class BasicWallet(BaseWallet):
         self._keys = {}
         self._local_dids = {}
         self._pair_dids = {}
+        self._crypto_workers = int(config.get("crypto_workers") or 0)
+        self._crypto_executor_type = (
+            config.get("crypto_executor") or self.CRYPTO_EXECUTOR_THREAD
+        )
+        if self._crypto_executor_type not in (
+            self.CRYPTO_EXECUTOR_PROCESS,
+            self.CRYPTO_EXECUTOR_THREAD,
+        ):
+            raise WalletError(
+                f"Unsupported crypto executor type: {self._crypto_executor_type}"
+            )
+        self._crypto_executor: Executor = None
+        self._key_cache = PackKeyCache()
 
     @property
     def name(self) -> str:
@@ -69,8 +89,42 @@ class BasicWallet(BaseWallet):
         pass
 
     async def close(self):
-        """Not applicable to in-memory wallet."""
-        pass
+        """Shut down the crypto executor, if any, and drop the cached keys."""
+        if self._crypto_executor:
+            self._crypto_executor.shutdown()
+            self._crypto_executor = None
+        self._key_cache.clear()
+
+    @property
+    def key_cache(self) -> PackKeyCache:
+        """
+        Accessor for the cache of keys derived to pack and unpack messages.
+
+        Worker processes cannot share the cache, so it is not used with a
+        process executor.
+        """
+        if self._crypto_workers and (
+            self._crypto_executor_type == self.CRYPTO_EXECUTOR_PROCESS
+        ):
+            return None
+        return self._key_cache
+
+    @property
+    def crypto_executor(self) -> Executor:
+        """
+        Accessor for the executor used to pack and unpack messages.
+
+        Without configured crypto workers this is `None`, meaning the default
+        executor of the event loop.
+        """
+        if self._crypto_workers and not self._crypto_executor:
+            if self._crypto_executor_type == self.CRYPTO_EXECUTOR_PROCESS:
+                self._crypto_executor = ProcessPoolExecutor(self._crypto_workers)
+            else:
+                self._crypto_executor = ThreadPoolExecutor(
+                    self._crypto_workers, thread_name_prefix="crypto"
+                )
+        return self._crypto_executor
 
     async def create_signing_key(
         self, seed: str = None, metadata: dict = None
@@ -327,7 +381,10 @@ class BasicWallet(BaseWallet):
         return verified
 
     async def pack_message(
-        self, message: str, to_verkeys: Sequence[str], from_verkey: str = None
+        self,
+        message: Union[str, bytes],
+        to_verkeys: Sequence[str],
+        from_verkey: str = None,
     ) -> bytes:
         """
         Pack a message for one or more recipients.
@@ -350,7 +407,12 @@ class BasicWallet(BaseWallet):
         keys_bin = [b58_to_bytes(key) for key in to_verkeys]
         secret = self._get_private_key(from_verkey) if from_verkey else None
         result = await asyncio.get_event_loop().run_in_executor(
-            None, lambda: encode_pack_message(message, keys_bin, secret)
+            self.crypto_executor,
+            encode_pack_message,
+            message,
+            keys_bin,
+            secret,
+            self.key_cache,
         )
         return result
 
@@ -371,13 +433,24 @@ class BasicWallet(BaseWallet):
         """
         if not enc_message:
             raise WalletError("Message not provided")
+        # workers receive only the secrets of the recipients, not the wallet
+        secrets = {}
+        for verkey in pack_message_recipients(enc_message):
+            try:
+                secrets[verkey] = self._get_private_key(verkey)
+            except WalletError:
+                pass
         try:
             (
                 message,
                 from_verkey,
                 to_verkey,
             ) = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: decode_pack_message(enc_message, self._get_private_key)
+                self.crypto_executor,
+                decode_pack_message_with_keys,
+                enc_message,
+                secrets,
+                self.key_cache,
             )
         except ValueError as e:
             raise WalletError("Message could not be unpacked: {}".format(str(e)))
@@ -1,8 +1,10 @@
 """Cryptography functions used by BasicWallet."""
 
 from collections import OrderedDict
+from functools import lru_cache
 import json
-from typing import Callable, Optional, Sequence, Tuple
+from threading import Lock
+from typing import Callable, Mapping, Optional, Sequence, Tuple, Union
 
 from marshmallow import fields, Schema, ValidationError
 import nacl.bindings
@@ -12,6 +14,10 @@ import nacl.utils
 from .error import WalletError
 from .util import bytes_to_b58, bytes_to_b64, b64_to_bytes, b58_to_bytes
 
+# the number of converted public keys, and the default number of secret
+# and shared box keys a wallet keeps for reuse
+KEY_CACHE_SIZE = 1024
+
 
 class PackMessageSchema(Schema):
     """Packed message schema."""
@@ -97,6 +103,100 @@ def sign_pk_from_sk(secret: bytes) -> bytes:
     return secret[seed_len:]
 
 
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def curve25519_public_key(verkey: bytes) -> bytes:
+    """Convert an ed25519 verkey to a curve25519 public key."""
+    return nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(verkey)
+
+
+def curve25519_secret_keys(secret: bytes) -> Tuple[bytes, bytes, bytes]:
+    """
+    Derive the keys used for packing from an ed25519 secret signing key.
+
+    Returns:
+        A tuple of the base58-encoded verkey, and the curve25519 public
+        and secret keys
+
+    """
+    verkey = sign_pk_from_sk(secret)
+    return (
+        bytes_to_b58(verkey).encode("ascii"),
+        curve25519_public_key(verkey),
+        nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(secret),
+    )
+
+
+def box_shared_key(public_key: bytes, secret_key: bytes) -> bytes:
+    """Precompute the shared key for boxes between a pair of curve25519 keys."""
+    return nacl.bindings.crypto_box_beforenm(public_key, secret_key)
+
+
+class PackKeyCache:
+    """
+    Bounded cache of the secret keys derived to pack and unpack messages.
+
+    The cache belongs to a wallet, so that the derived secrets are dropped
+    along with the wallet keys when it is closed. Entries are keyed by the
+    verkey of the wallet key, and by the pair of verkeys for shared box keys.
+    """
+
+    def __init__(self, size: int = KEY_CACHE_SIZE):
+        """Initialize a `PackKeyCache` instance."""
+        self.size = size
+        self._lock = Lock()
+        self._secret_keys = OrderedDict()
+        self._shared_keys = OrderedDict()
+
+    def __len__(self) -> int:
+        """Get the number of cached keys."""
+        return len(self._secret_keys) + len(self._shared_keys)
+
+    def _get(self, cache: OrderedDict, key, derive: Callable):
+        """Look up a cached value, deriving and adding it if necessary."""
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        value = derive()
+        with self._lock:
+            cache[key] = value
+            if len(cache) > self.size:
+                cache.popitem(last=False)
+        return value
+
+    def secret_keys(self, secret: bytes) -> Tuple[bytes, bytes, bytes]:
+        """Get the result of `curve25519_secret_keys` for a secret signing key."""
+        return self._get(
+            self._secret_keys,
+            sign_pk_from_sk(secret),
+            lambda: curve25519_secret_keys(secret),
+        )
+
+    def shared_key(
+        self, verkey: bytes, secret_key: bytes, other_verkey: bytes
+    ) -> bytes:
+        """
+        Get the shared box key between a wallet key and another verkey.
+
+        Args:
+            verkey: The verkey of the wallet key
+            secret_key: The curve25519 secret key of the wallet key
+            other_verkey: The verkey of the other party
+
+        """
+        return self._get(
+            self._shared_keys,
+            (verkey, other_verkey),
+            lambda: box_shared_key(curve25519_public_key(other_verkey), secret_key),
+        )
+
+    def clear(self):
+        """Remove all cached keys."""
+        with self._lock:
+            self._secret_keys.clear()
+            self._shared_keys.clear()
+
+
 def validate_seed(seed: (str, bytes)) -> bytes:
     """
     Convert a seed parameter to standard format and check length.
@@ -159,7 +259,9 @@ def verify_signed_message(signed: bytes, verkey: bytes) -> bool:
 
 
 def prepare_pack_recipient_keys(
-    to_verkeys: Sequence[bytes], from_secret: bytes = None
+    to_verkeys: Sequence[bytes],
+    from_secret: bytes = None,
+    key_cache: PackKeyCache = None,
 ) -> Tuple[str, bytes]:
     """
     Assemble the recipients block of a packed message.
@@ -167,6 +269,7 @@ def prepare_pack_recipient_keys(
     Args:
         to_verkeys: Verkeys of recipients
         from_secret: Secret to use for signing keys
+        key_cache: Optional cache of the derived sender keys
 
     Returns:
         A tuple of (json result, key)
@@ -175,16 +278,24 @@ def prepare_pack_recipient_keys(
     cek = nacl.bindings.crypto_secretstream_xchacha20poly1305_keygen()
     recips = []
 
+    if from_secret:
+        if key_cache is not None:
+            sender_vk, _sender_pk, sk = key_cache.secret_keys(from_secret)
+        else:
+            sender_vk, _sender_pk, sk = curve25519_secret_keys(from_secret)
+
     for target_vk in to_verkeys:
-        target_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(target_vk)
+        target_pk = curve25519_public_key(target_vk)
         if from_secret:
-            sender_pk = sign_pk_from_sk(from_secret)
-            sender_vk = bytes_to_b58(sender_pk).encode("ascii")
             enc_sender = nacl.bindings.crypto_box_seal(sender_vk, target_pk)
-            sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(from_secret)
-
             nonce = nacl.utils.random(nacl.bindings.crypto_box_NONCEBYTES)
-            enc_cek = nacl.bindings.crypto_box(cek, nonce, target_pk, sk)
+            if key_cache is not None:
+                shared_key = key_cache.shared_key(
+                    sign_pk_from_sk(from_secret), sk, target_vk
+                )
+            else:
+                shared_key = box_shared_key(target_pk, sk)
+            enc_cek = nacl.bindings.crypto_box_afternm(cek, nonce, shared_key)
         else:
             enc_sender = None
             nonce = None
@@ -285,7 +396,7 @@ def prepare_pack_recipient_keys(
 
 
 def encrypt_plaintext(
-    message: str, add_data: bytes, key: bytes
+    message: Union[str, bytes], add_data: bytes, key: bytes
 ) -> Tuple[bytes, bytes, bytes]:
     """
     Encrypt the payload of a packed message.
@@ -300,11 +411,11 @@ def encrypt_plaintext(
 
     """
     nonce = nacl.utils.random(nacl.bindings.crypto_aead_chacha20poly1305_ietf_NPUBBYTES)
-    message_bin = message.encode("ascii")
+    message_bin = message if isinstance(message, bytes) else message.encode("ascii")
     output = nacl.bindings.crypto_aead_chacha20poly1305_ietf_encrypt(
         message_bin, add_data, nonce, key
     )
-    mlen = len(message)
+    mlen = len(message_bin)
     ciphertext = output[:mlen]
     tag = output[mlen:]
     return ciphertext, nonce, tag
@@ -333,7 +444,10 @@ def decrypt_plaintext(
 
 
 def encode_pack_message(
-    message: str, to_verkeys: Sequence[bytes], from_secret: bytes = None
+    message: Union[str, bytes],
+    to_verkeys: Sequence[bytes],
+    from_secret: bytes = None,
+    key_cache: PackKeyCache = None,
 ) -> bytes:
     """
     Assemble a packed message for a set of recipients, optionally including the sender.
@@ -342,12 +456,13 @@ def encode_pack_message(
         message: The message to pack
         to_verkeys: The verkeys to pack the message for
         from_secret: The sender secret
+        key_cache: Optional cache of the derived sender keys
 
     Returns:
         The encoded message
 
     """
-    recips_json, cek = prepare_pack_recipient_keys(to_verkeys, from_secret)
+    recips_json, cek = prepare_pack_recipient_keys(to_verkeys, from_secret, key_cache)
     recips_b64 = bytes_to_b64(recips_json.encode("ascii"), urlsafe=True)
 
     ciphertext, nonce, tag = encrypt_plaintext(message, recips_b64.encode("ascii"), cek)
@@ -364,7 +479,7 @@ def encode_pack_message(
 
 
 def decode_pack_message(
-    enc_message: bytes, find_key: Callable
+    enc_message: bytes, find_key: Callable, key_cache: PackKeyCache = None
 ) -> Tuple[str, Optional[str], str]:
     """
     Decode a packed message.
@@ -376,6 +491,7 @@ def decode_pack_message(
     Args:
         enc_message: The encrypted message
         find_key: Function to retrieve private key
+        key_cache: Optional cache of the derived recipient keys
 
     Returns:
         A tuple of (message, sender_vk, recip_vk)
@@ -392,7 +508,9 @@ def decode_pack_message(
     for recip_vk in recips:
         recip_secret = find_key(recip_vk)
         if recip_secret:
-            payload_key, sender_vk = extract_payload_key(recips[recip_vk], recip_secret)
+            payload_key, sender_vk = extract_payload_key(
+                recips[recip_vk], recip_secret, key_cache
+            )
             break
 
     if not payload_key:
@@ -406,6 +524,33 @@ def decode_pack_message(
     return message, sender_vk, recip_vk
 
 
+def decode_pack_message_with_keys(
+    enc_message: bytes, secrets: Mapping[str, bytes], key_cache: PackKeyCache = None
+) -> Tuple[str, Optional[str], str]:
+    """
+    Decode a packed message using a mapping of recipient verkeys to secrets.
+
+    Unlike a key lookup function, the mapping can be passed to a worker process.
+    """
+    return decode_pack_message(enc_message, secrets.get, key_cache)
+
+
+def pack_message_recipients(enc_message: bytes) -> Sequence[str]:
+    """
+    Get the recipient verkeys of a packed message, without validating it.
+
+    Returns:
+        The recipient verkeys, or an empty list if they cannot be read
+
+    """
+    try:
+        protected = json.loads(enc_message)["protected"]
+        recips = json.loads(b64_to_bytes(protected, urlsafe=True))["recipients"]
+        return [recip["header"]["kid"] for recip in recips]
+    except (KeyError, TypeError, ValueError):
+        return []
+
+
 def decode_pack_message_outer(enc_message: bytes) -> Tuple[dict, dict, bool]:
     """
     Decode the outer wrapper of a packed message and extract the recipients.
@@ -497,26 +642,33 @@ def extract_pack_recipients(recipients: Sequence[dict]) -> dict:
     return result
 
 
-def extract_payload_key(sender_cek: dict, recip_secret: bytes) -> Tuple[bytes, str]:
+def extract_payload_key(
+    sender_cek: dict, recip_secret: bytes, key_cache: PackKeyCache = None
+) -> Tuple[bytes, str]:
     """
     Extract the payload key from pack recipient details.
 
     Returns: A tuple of the CEK and sender verkey
     """
-    recip_vk = sign_pk_from_sk(recip_secret)
-    recip_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(recip_vk)
-    recip_sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(recip_secret)
+    if key_cache is not None:
+        _recip_vk, recip_pk, recip_sk = key_cache.secret_keys(recip_secret)
+    else:
+        _recip_vk, recip_pk, recip_sk = curve25519_secret_keys(recip_secret)
 
     if sender_cek["nonce"] and sender_cek["sender"]:
         sender_vk_bin = nacl.bindings.crypto_box_seal_open(
             sender_cek["sender"], recip_pk, recip_sk
         )
         sender_vk = sender_vk_bin.decode("ascii")
-        sender_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(
-            b58_to_bytes(sender_vk_bin)
-        )
-        cek = nacl.bindings.crypto_box_open(
-            sender_cek["key"], sender_cek["nonce"], sender_pk, recip_sk
+        sender_verkey = b58_to_bytes(sender_vk_bin)
+        if key_cache is not None:
+            shared_key = key_cache.shared_key(
+                sign_pk_from_sk(recip_secret), recip_sk, sender_verkey
+            )
+        else:
+            shared_key = box_shared_key(curve25519_public_key(sender_verkey), recip_sk)
+        cek = nacl.bindings.crypto_box_open_afternm(
+            sender_cek["key"], sender_cek["nonce"], shared_key
         )
     else:
         sender_vk = None
@@ -2,7 +2,7 @@
 
 import json
 import logging
-from typing import Sequence
+from typing import Sequence, Union
 
 import indy.anoncreds
 import indy.did
@@ -566,7 +566,10 @@ class IndyWallet(BaseWallet):
         return result
 
     async def pack_message(
-        self, message: str, to_verkeys: Sequence[str], from_verkey: str = None
+        self,
+        message: Union[str, bytes],
+        to_verkeys: Sequence[str],
+        from_verkey: str = None,
     ) -> bytes:
         """
         Pack a message for one or more recipients.
@@ -586,6 +589,8 @@ class IndyWallet(BaseWallet):
         """
         if message is None:
             raise WalletError("Message not provided")
+        if isinstance(message, bytes):
+            message = message.decode("utf-8")
         try:
             result = await indy.crypto.pack_message(
                 self.handle, message, to_verkeys, from_verkey
@@ -14,6 +14,7 @@ class WalletProvider(BaseProvider):
     WALLET_TYPES = {
         "basic": "aries_cloudagent.wallet.basic.BasicWallet",
         "indy": "aries_cloudagent.wallet.indy.IndyWallet",
+        "sqlite": "aries_cloudagent.wallet.sqlite.SqliteWallet",
     }
 
     async def provide(self, settings: BaseSettings, injector: BaseInjector):
@@ -36,6 +37,10 @@ class WalletProvider(BaseProvider):
             wallet_cfg["storage_config"] = settings["wallet.storage_config"]
         if "wallet.storage_creds" in settings:
             wallet_cfg["storage_creds"] = settings["wallet.storage_creds"]
+        if "wallet.crypto_workers" in settings:
+            wallet_cfg["crypto_workers"] = settings["wallet.crypto_workers"]
+        if "wallet.crypto_executor" in settings:
+            wallet_cfg["crypto_executor"] = settings["wallet.crypto_executor"]
         wallet = ClassLoader.load_class(wallet_class)(wallet_cfg)
         await wallet.open()
         return wallet
@@ -0,0 +1,450 @@
+"""SQLite-backed implementation of BaseWallet interface."""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import nacl.exceptions
+import nacl.pwhash
+import nacl.secret
+import nacl.utils
+
+from .base import DIDInfo, KeyInfo
+from .basic import BasicWallet
+from .error import WalletError
+from .util import b58_to_bytes, bytes_to_b58
+
+LOGGER = logging.getLogger(__name__)
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS config (name TEXT PRIMARY KEY, value BLOB NOT NULL)",
+    """CREATE TABLE IF NOT EXISTS keys (
+        verkey TEXT PRIMARY KEY,
+        secret BLOB NOT NULL,
+        metadata TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS dids (
+        did TEXT PRIMARY KEY,
+        verkey TEXT NOT NULL,
+        secret BLOB NOT NULL,
+        metadata TEXT NOT NULL
+    )""",
+    # non-secrets storage records, used by SqliteStorage
+    """CREATE TABLE IF NOT EXISTS items (
+        seq INTEGER PRIMARY KEY,
+        type TEXT NOT NULL,
+        id TEXT NOT NULL,
+        value TEXT NOT NULL,
+        UNIQUE (type, id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS tags (
+        item INTEGER NOT NULL REFERENCES items (seq) ON DELETE CASCADE,
+        name TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (item, name)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS ix_tags_name_value ON tags (name, value, item)",
+)
+
+KEY_CHECK = b"aries-cloudagent-sqlite-wallet"
+
+
+class SqliteConnectionPool:
+    """
+    A pool of SQLite connections used from a dedicated thread executor.
+
+    Each worker thread takes a connection from the pool for the duration of a
+    call, so database access never blocks the event loop.
+    """
+
+    def __init__(self, path: str, size: int = 4):
+        """
+        Initialize the connection pool.
+
+        Args:
+            path: the path of the database file
+            size: the maximum number of connections and worker threads
+
+        """
+        self.path = path
+        self.size = size
+        self._connections = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="sqlite"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection in autocommit mode."""
+        conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _call(self, fn: Callable, args: tuple, transaction: bool):
+        """Run a function with a pooled connection on a worker thread."""
+        try:
+            conn = self._connections.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            if not transaction:
+                return fn(conn, *args)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(conn, *args)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+        finally:
+            self._connections.put(conn)
+
+    async def run(self, fn: Callable, *args):
+        """Run `fn(connection, *args)` on a worker thread."""
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, self._call, fn, args, False
+        )
+
+    async def transaction(self, fn: Callable, *args):
+        """Run `fn(connection, *args)` within a transaction on a worker thread."""
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, self._call, fn, args, True
+        )
+
+    def _shutdown(self):
+        """Wait for the worker threads to finish and close the connections."""
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+
+    async def close(self):
+        """Close the pooled connections and stop the worker threads."""
+        # waiting for in-flight calls would otherwise block the event loop
+        await asyncio.get_event_loop().run_in_executor(None, self._shutdown)
+
+
+class SqliteWallet(BasicWallet):
+    """
+    Wallet implementation persisted to a SQLite database.
+
+    Keys and DIDs are held in memory once the wallet is opened, and written
+    through to the database with their secrets encrypted by the wallet key.
+    The database also holds the non-secrets records of `SqliteStorage`.
+    """
+
+    DEFAULT_NAME = "default"
+    WALLET_TYPE = "sqlite"
+
+    KEY_DERIVATION_RAW = "RAW"
+    KEY_DERIVATION_ARGON2I_INT = "ARGON2I_INT"
+    KEY_DERIVATION_ARGON2I_MOD = "ARGON2I_MOD"
+
+    def __init__(self, config: dict = None):
+        """
+        Initialize a `SqliteWallet` instance.
+
+        Args:
+            config: {name, key, key_derivation_method, auto_remove, storage_config}
+                where storage_config may be a JSON object with the database
+                `path` and connection `pool_size`
+
+        """
+        if not config:
+            config = {}
+        super(SqliteWallet, self).__init__(config)
+        self._name = config.get("name") or self.DEFAULT_NAME
+        self._key = config.get("key")
+        self._key_derivation_method = (
+            config.get("key_derivation_method") or self.KEY_DERIVATION_ARGON2I_MOD
+        )
+        self._auto_remove = config.get("auto_remove", False)
+        storage_config = config.get("storage_config") or {}
+        if isinstance(storage_config, str):
+            storage_config = json.loads(storage_config)
+        self._path = storage_config.get("path") or os.path.join(
+            os.path.expanduser("~"), ".aries_cloudagent", "wallet", f"{self._name}.db"
+        )
+        self._pool_size = int(storage_config.get("pool_size", 4))
+        self._box: nacl.secret.SecretBox = None
+        self._created = False
+        self.pool: SqliteConnectionPool = None
+
+    @property
+    def type(self) -> str:
+        """Accessor for the wallet type."""
+        return SqliteWallet.WALLET_TYPE
+
+    @property
+    def created(self) -> bool:
+        """Check whether the wallet was created on the last open call."""
+        return self._created
+
+    @property
+    def opened(self) -> bool:
+        """Check whether the wallet is currently open."""
+        return bool(self.pool)
+
+    @property
+    def path(self) -> str:
+        """Accessor for the database file path."""
+        return self._path
+
+    @staticmethod
+    def generate_wallet_key() -> str:
+        """Generate a raw wallet key."""
+        return bytes_to_b58(nacl.utils.random(nacl.secret.SecretBox.KEY_SIZE))
+
+    def _derive_key(self, salt: bytes) -> bytes:
+        """Derive the secret encryption key from the wallet key."""
+        if self._key_derivation_method == self.KEY_DERIVATION_RAW:
+            key = b58_to_bytes(self._key)
+            if len(key) != nacl.secret.SecretBox.KEY_SIZE:
+                raise WalletError("Invalid raw wallet key")
+            return key
+        if self._key_derivation_method == self.KEY_DERIVATION_ARGON2I_INT:
+            ops, mem = nacl.pwhash.argon2i.OPSLIMIT_INTERACTIVE, (
+                nacl.pwhash.argon2i.MEMLIMIT_INTERACTIVE
+            )
+        elif self._key_derivation_method == self.KEY_DERIVATION_ARGON2I_MOD:
+            ops, mem = nacl.pwhash.argon2i.OPSLIMIT_MODERATE, (
+                nacl.pwhash.argon2i.MEMLIMIT_MODERATE
+            )
+        else:
+            raise WalletError(
+                f"Unsupported key derivation method: {self._key_derivation_method}"
+            )
+        return nacl.pwhash.argon2i.kdf(
+            nacl.secret.SecretBox.KEY_SIZE,
+            self._key.encode("utf-8"),
+            salt,
+            opslimit=ops,
+            memlimit=mem,
+        )
+
+    @staticmethod
+    def _init_db(conn: sqlite3.Connection) -> dict:
+        """Create the schema and load the wallet configuration."""
+        for statement in SCHEMA:
+            conn.execute(statement)
+        return dict(conn.execute("SELECT name, value FROM config"))
+
+    @staticmethod
+    def _load_rows(conn: sqlite3.Connection):
+        """Load the stored keys and DIDs."""
+        keys = conn.execute("SELECT verkey, secret, metadata FROM keys").fetchall()
+        dids = conn.execute(
+            "SELECT did, verkey, secret, metadata FROM dids ORDER BY rowid"
+        ).fetchall()
+        return keys, dids
+
+    async def open(self):
+        """
+        Open the wallet database, creating it if necessary.
+
+        Raises:
+            WalletError: If the wallet key is missing or incorrect
+
+        """
+        if self.opened:
+            return
+        if not self._key:
+            raise WalletError("Wallet key not provided")
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._created = not os.path.exists(self._path)
+        self.pool = SqliteConnectionPool(self._path, self._pool_size)
+        try:
+            config = await self.pool.transaction(self._init_db)
+            salt = config.get("salt")
+            if not salt:
+                salt = nacl.utils.random(nacl.pwhash.argon2i.SALTBYTES)
+            # key derivation is slow, so keep it off the event loop
+            key = await asyncio.get_event_loop().run_in_executor(
+                None, self._derive_key, salt
+            )
+            box = nacl.secret.SecretBox(key)
+            if "key_check" in config:
+                try:
+                    box.decrypt(config["key_check"])
+                except nacl.exceptions.CryptoError:
+                    raise WalletError("Invalid wallet key")
+            else:
+                await self.pool.run(
+                    lambda conn: conn.executemany(
+                        "INSERT INTO config (name, value) VALUES (?, ?)",
+                        (("salt", salt), ("key_check", box.encrypt(KEY_CHECK))),
+                    )
+                )
+            self._box = box
+
+            keys, dids = await self.pool.run(self._load_rows)
+            for verkey, secret, metadata in keys:
+                self._keys[verkey] = {
+                    "seed": None,
+                    "secret": box.decrypt(secret),
+                    "verkey": verkey,
+                    "metadata": json.loads(metadata),
+                }
+            for did, verkey, secret, metadata in dids:
+                self._local_dids[did] = {
+                    "seed": None,
+                    "secret": box.decrypt(secret),
+                    "verkey": verkey,
+                    "metadata": json.loads(metadata),
+                }
+        except Exception:
+            await self.pool.close()
+            self.pool = None
+            raise
+
+    async def close(self):
+        """Close the wallet database, removing it if configured to."""
+        await super(SqliteWallet, self).close()
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+        self._box = None
+        self._keys = {}
+        self._local_dids = {}
+        if self._auto_remove:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self._path + suffix):
+                    os.remove(self._path + suffix)
+
+    def _check_open(self):
+        if not self.opened:
+            raise WalletError("Wallet is not open")
+
+    async def create_signing_key(
+        self, seed: str = None, metadata: dict = None
+    ) -> KeyInfo:
+        """
+        Create a new public/private signing keypair.
+
+        Args:
+            seed: Seed to use for signing key
+            metadata: Optional metadata to store with the keypair
+
+        Returns:
+            A `KeyInfo` representing the new record
+
+        Raises:
+            WalletDuplicateError: If the resulting verkey already exists in the wallet
+
+        """
+        self._check_open()
+        info = await super(SqliteWallet, self).create_signing_key(seed, metadata)
+        key = self._keys[info.verkey]
+        try:
+            await self.pool.run(
+                lambda conn: conn.execute(
+                    "INSERT INTO keys (verkey, secret, metadata) VALUES (?, ?, ?)",
+                    (
+                        info.verkey,
+                        self._box.encrypt(key["secret"]),
+                        json.dumps(key["metadata"]),
+                    ),
+                )
+            )
+        except sqlite3.Error as err:
+            del self._keys[info.verkey]
+            raise WalletError(str(err)) from err
+        return info
+
+    async def replace_signing_key_metadata(self, verkey: str, metadata: dict):
+        """
+        Replace the metadata associated with a signing keypair.
+
+        Args:
+            verkey: The verification key of the keypair
+            metadata: The new metadata to store
+
+        Raises:
+            WalletNotFoundError: if no keypair is associated with the verification key
+
+        """
+        self._check_open()
+        await super(SqliteWallet, self).replace_signing_key_metadata(verkey, metadata)
+        await self.pool.run(
+            lambda conn: conn.execute(
+                "UPDATE keys SET metadata = ? WHERE verkey = ?",
+                (json.dumps(self._keys[verkey]["metadata"]), verkey),
+            )
+        )
+
+    async def create_local_did(
+        self, seed: str = None, did: str = None, metadata: dict = None
+    ) -> DIDInfo:
+        """
+        Create and store a new local DID.
+
+        Args:
+            seed: Optional seed to use for did
+            did: The DID to use
+            metadata: Metadata to store with DID
+
+        Returns:
+            A `DIDInfo` instance representing the created DID
+
+        Raises:
+            WalletDuplicateError: If the DID already exists in the wallet
+
+        """
+        self._check_open()
+        previous = self._local_dids.get(did) if did else None
+        info = await super(SqliteWallet, self).create_local_did(seed, did, metadata)
+        entry = self._local_dids[info.did]
+        try:
+            await self.pool.run(
+                lambda conn: conn.execute(
+                    "INSERT OR REPLACE INTO dids (did, verkey, secret, metadata) "
+                    "VALUES (?, ?, ?, ?)",
+                    (
+                        info.did,
+                        info.verkey,
+                        self._box.encrypt(entry["secret"]),
+                        json.dumps(entry["metadata"]),
+                    ),
+                )
+            )
+        except sqlite3.Error as err:
+            if previous:
+                self._local_dids[info.did] = previous
+            else:
+                del self._local_dids[info.did]
+            raise WalletError(str(err)) from err
+        return info
+
+    async def replace_local_did_metadata(self, did: str, metadata: dict):
+        """
+        Replace metadata for a local DID.
+
+        Args:
+            did: The DID to replace metadata for
+            metadata: The new metadata
+
+        Raises:
+            WalletNotFoundError: If the DID doesn't exist
+
+        """
+        self._check_open()
+        await super(SqliteWallet, self).replace_local_did_metadata(did, metadata)
+        await self.pool.run(
+            lambda conn: conn.execute(
+                "UPDATE dids SET metadata = ? WHERE did = ?",
+                (json.dumps(self._local_dids[did]["metadata"]), did),
+            )
+        )
@@ -266,6 +266,49 @@ class TestBasicWallet:
         with pytest.raises(WalletError):
             await wallet.unpack_message(None)
 
+    @pytest.mark.asyncio
+    async def test_pack_key_cache(self, wallet):
+        await wallet.create_local_did(self.test_seed, self.test_did)
+        await wallet.create_local_did(self.test_target_seed, self.test_target_did)
+        packed = await wallet.pack_message(
+            self.test_message, [self.test_target_verkey], self.test_verkey
+        )
+        await wallet.unpack_message(packed)
+        # the sender and recipient secrets, and the shared key in each direction
+        assert len(wallet.key_cache) == 4
+
+        await wallet.close()
+        assert not wallet.key_cache
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    async def test_pack_unpack_executor(self, executor):
+        wallet = BasicWallet({"crypto_workers": 2, "crypto_executor": executor})
+        await wallet.create_local_did(self.test_seed, self.test_did)
+        await wallet.create_local_did(self.test_target_seed, self.test_target_did)
+
+        packed = await wallet.pack_message(
+            self.test_message_bytes,
+            [self.missing_verkey, self.test_target_verkey],
+            self.test_verkey,
+        )
+        assert await wallet.unpack_message(packed) == (
+            self.test_message_bytes.decode("ascii"),
+            self.test_verkey,
+            self.test_target_verkey,
+        )
+        assert wallet.crypto_executor
+        assert (wallet.key_cache is None) == (executor == "process")
+        with pytest.raises(WalletError):
+            await wallet.unpack_message(b"{}")
+
+        await wallet.close()
+        assert wallet._crypto_executor is None
+
+    def test_executor_type_x(self):
+        with pytest.raises(WalletError):
+            BasicWallet({"crypto_executor": "fiber"})
+
     @pytest.mark.asyncio
     async def test_signature_round_trip(self, wallet):
         key_info = await wallet.create_signing_key()
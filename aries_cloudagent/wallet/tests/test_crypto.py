@@ -35,6 +35,45 @@ class TestUtil(TestCase):
 
         assert test_module.sign_pk_from_sk(secret_key) in secret_key
 
+    def test_key_cache(self):
+        (sender_vk, sender_sk) = test_module.create_keypair()
+        (recip_vk, recip_sk) = test_module.create_keypair()
+        sender_cache = test_module.PackKeyCache()
+        recip_cache = test_module.PackKeyCache()
+
+        with mock.patch.object(
+            test_module, "box_shared_key", wraps=test_module.box_shared_key
+        ) as mock_shared_key:
+            for _ in range(2):
+                packed = test_module.encode_pack_message(
+                    MESSAGE, [recip_vk], sender_sk, sender_cache
+                )
+                assert test_module.decode_pack_message(
+                    packed, lambda vk: recip_sk, recip_cache
+                ) == (
+                    MESSAGE.decode("ascii"),
+                    test_module.bytes_to_b58(sender_vk),
+                    test_module.bytes_to_b58(recip_vk),
+                )
+            assert mock_shared_key.call_count == 2
+
+            # without a cache the keys are derived each time
+            packed = test_module.encode_pack_message(MESSAGE, [recip_vk], sender_sk)
+            test_module.decode_pack_message(packed, lambda vk: recip_sk)
+            assert mock_shared_key.call_count == 4
+
+        assert len(sender_cache) == len(recip_cache) == 2
+        assert sender_cache.secret_keys(sender_sk)[0] == (
+            test_module.bytes_to_b58(sender_vk).encode("ascii")
+        )
+        sender_cache.clear()
+        assert not sender_cache
+
+        small_cache = test_module.PackKeyCache(1)
+        small_cache.secret_keys(sender_sk)
+        small_cache.secret_keys(recip_sk)
+        assert len(small_cache) == 1
+
     def test_decode_pack_message_x(self):
         with mock.patch.object(
             test_module, 'decode_pack_message_outer', mock.MagicMock()
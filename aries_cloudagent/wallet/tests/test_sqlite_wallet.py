@@ -0,0 +1,117 @@
+import os
+import threading
+
+import pytest
+from asynctest import mock as async_mock
+
+from aries_cloudagent.wallet.error import WalletError
+from aries_cloudagent.wallet.sqlite import SqliteWallet
+
+from . import test_basic_wallet
+
+
+def make_wallet(path, key, **config):
+    return SqliteWallet(
+        {
+            "name": "test-wallet",
+            "key": key,
+            "key_derivation_method": "RAW",  # much slower tests with argon-hashed keys
+            "storage_config": {"path": str(path), "pool_size": 2},
+            **config,
+        }
+    )
+
+
+@pytest.fixture()
+async def wallet(tmp_path):
+    wallet = make_wallet(
+        tmp_path / "wallet.db", SqliteWallet.generate_wallet_key(), auto_remove=True
+    )
+    await wallet.open()
+    yield wallet
+    await wallet.close()
+
+
+class TestSqliteWallet(test_basic_wallet.TestBasicWallet):
+    @pytest.mark.asyncio
+    async def test_properties(self, wallet):
+        assert wallet.name == "test-wallet"
+        assert wallet.type == "sqlite"
+        assert wallet.opened
+        assert wallet.created
+        assert "SqliteWallet" in str(wallet)
+
+    @pytest.mark.asyncio
+    async def test_persistence(self, tmp_path):
+        key = SqliteWallet.generate_wallet_key()
+        wallet = make_wallet(tmp_path / "wallet.db", key)
+        await wallet.open()
+        signing = await wallet.create_signing_key(self.test_seed, self.test_metadata)
+        await wallet.create_public_did(self.test_target_seed)
+        await wallet.replace_signing_key_metadata(
+            signing.verkey, self.test_update_metadata
+        )
+        await wallet.close()
+        assert not wallet.opened
+
+        wallet = make_wallet(tmp_path / "wallet.db", key, auto_remove=True)
+        await wallet.open()
+        assert not wallet.created
+        info = await wallet.get_signing_key(signing.verkey)
+        assert info.metadata == self.test_update_metadata
+        public = await wallet.get_public_did()
+        assert public.did == self.test_target_did
+        assert public.verkey == self.test_target_verkey
+
+        signature = await wallet.sign_message(self.test_message_bytes, signing.verkey)
+        assert await wallet.verify_message(
+            self.test_message_bytes, signature, signing.verkey
+        )
+        await wallet.close()
+        assert not os.path.exists(tmp_path / "wallet.db")
+
+    @pytest.mark.asyncio
+    async def test_invalid_key(self, tmp_path):
+        wallet = make_wallet(tmp_path / "wallet.db", SqliteWallet.generate_wallet_key())
+        await wallet.open()
+        await wallet.close()
+
+        other = make_wallet(tmp_path / "wallet.db", SqliteWallet.generate_wallet_key())
+        with pytest.raises(WalletError):
+            await other.open()
+        assert not other.opened
+
+        with pytest.raises(WalletError):
+            await make_wallet(tmp_path / "other.db", None).open()
+
+    @pytest.mark.asyncio
+    async def test_derive_key_in_executor(self, tmp_path):
+        wallet = make_wallet(
+            tmp_path / "wallet.db", "test key", key_derivation_method="ARGON2I_INT"
+        )
+        derive = wallet._derive_key
+        threads = []
+
+        def derive_key(salt):
+            threads.append(threading.current_thread())
+            return derive(salt)
+
+        with async_mock.patch.object(wallet, "_derive_key", derive_key):
+            await wallet.open()
+        await wallet.close()
+        assert threads and threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_close_in_executor(self, tmp_path):
+        wallet = make_wallet(tmp_path / "wallet.db", SqliteWallet.generate_wallet_key())
+        await wallet.open()
+        shutdown = wallet.pool._shutdown
+        threads = []
+
+        def shutdown_pool():
+            threads.append(threading.current_thread())
+            shutdown()
+
+        with async_mock.patch.object(wallet.pool, "_shutdown", shutdown_pool):
+            await wallet.close()
+        assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)  # noqa
+
+from aries_cloudagent.wallet.basic import BasicWallet  # noqa: E402
+
+
+async def run_benchmark(
+    count: int, workers: int, executor: str, size: int, anoncrypt: bool
+) -> float:
+    wallet = BasicWallet({"crypto_workers": workers, "crypto_executor": executor})
+    sender = await wallet.create_local_did()
+    recipient = await wallet.create_local_did()
+    message = json.dumps({"@type": "benchmark", "content": "x" * size})
+    from_verkey = None if anoncrypt else sender.verkey
+
+    async def round_trip():
+        packed = await wallet.pack_message(message, [recipient.verkey], from_verkey)
+        await wallet.unpack_message(packed)
+
+    # start the workers before timing
+    await round_trip()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(round_trip() for _ in range(count)))
+    duration = time.perf_counter() - start
+    await wallet.close()
+    return count / duration
+
+
+async def main(count: int, workers: list, executor: str, size: int, anoncrypt: bool):
+    print(f"Packing and unpacking {count} messages of {size} bytes ({executor})")
+    baseline = None
+    for worker_count in workers:
+        rate = await run_benchmark(count, worker_count, executor, size, anoncrypt)
+        if baseline is None:
+            baseline = rate
+        label = f"{worker_count} workers" if worker_count else "default executor"
+        print(f"{label:>20}: {rate:10.1f} msg/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measures message pack and unpack throughput by crypto workers."
+    )
+    parser.add_argument(
+        "-c",
+        "--count",
+        type=int,
+        default=2000,
+        help="Set the number of messages to pack and unpack for each run",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="Set the numbers of crypto workers to compare",
+    )
+    parser.add_argument(
+        "-e",
+        "--executor",
+        choices=("thread", "process"),
+        default="thread",
+        help="Choose the type of crypto workers",
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        type=int,
+        default=1024,
+        help="Set the size of the message content in bytes",
+    )
+    parser.add_argument(
+        "--anoncrypt",
+        action="store_true",
+        help="Pack messages without a sender key",
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.get_event_loop().run_until_complete(
+            main(args.count, args.workers, args.executor, args.size, args.anoncrypt)
+        )
+    except KeyboardInterrupt:
+        os._exit(1)
@@ -0,0 +1,151 @@
+import os
+import sys
+import time
+
+sys.path.append(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+)  # noqa
+
+from aries_cloudagent.connections.models.connection_record import ConnectionRecord
+from aries_cloudagent.messaging.models import compiled
+from aries_cloudagent.messaging.models.base import SCHEMA_POOLS
+from aries_cloudagent.protocols.connections.messages.connection_invitation import (
+    ConnectionInvitation,
+)
+from aries_cloudagent.protocols.issue_credential.v1_0.messages.credential_offer import (
+    CredentialOffer,
+)
+from aries_cloudagent.protocols.issue_credential.v1_0.messages.inner import (
+    credential_preview,
+)
+from aries_cloudagent.protocols.issue_credential.v1_0.models import (
+    credential_exchange,
+)
+
+CredAttrSpec = credential_preview.CredAttrSpec
+CredentialPreview = credential_preview.CredentialPreview
+V10CredentialExchange = credential_exchange.V10CredentialExchange
+
+VERKEY = "3Dn1SJNPaCXcvvJvSbsFWP2xaCjMom3can8CQNhWrTRx"
+CRED_DEF_ID = "WgWxqztrNooG92RXvxSTWv:3:CL:20:tag"
+SCHEMA_ID = "WgWxqztrNooG92RXvxSTWv:2:schema_name:1.0"
+
+
+def indy_offer(attr_count: int) -> dict:
+    digits = "1234567890" * 60
+    return {
+        "schema_id": SCHEMA_ID,
+        "cred_def_id": CRED_DEF_ID,
+        "nonce": "1234567890",
+        "key_correctness_proof": {
+            "c": digits[:77],
+            "xz_cap": digits,
+            "xr_cap": [[f"attr{i}", digits] for i in range(attr_count)],
+        },
+    }
+
+
+def samples(attr_count: int) -> dict:
+    preview = CredentialPreview(
+        attributes=CredAttrSpec.list_plain(
+            {f"attr{i}": f"value {i}" for i in range(attr_count)}
+        )
+    )
+    offer = CredentialOffer(
+        comment="benchmark",
+        credential_preview=preview,
+        offers_attach=[CredentialOffer.wrap_indy_offer(indy_offer(attr_count))],
+    )
+    return {
+        "ConnectionInvitation": ConnectionInvitation(
+            label="benchmark", recipient_keys=[VERKEY], endpoint="http://localhost"
+        ),
+        "CredentialOffer": offer,
+        "ConnectionRecord": ConnectionRecord(
+            my_did="WgWxqztrNooG92RXvxSTWv",
+            their_did="55GkHamhTU1ZbTbV2ab9DE",
+            their_label="benchmark",
+            state=ConnectionRecord.STATE_ACTIVE,
+        ),
+        "V10CredentialExchange": V10CredentialExchange(
+            connection_id="conn-id",
+            thread_id="thread-id",
+            state=V10CredentialExchange.STATE_OFFER_SENT,
+            credential_definition_id=CRED_DEF_ID,
+            schema_id=SCHEMA_ID,
+            credential_offer=indy_offer(attr_count),
+        ),
+    }
+
+
+def rate(fn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - start)
+
+
+def run_benchmark(count: int, attr_count: int, fresh: bool):
+    print(
+        f"{'':>24} {'serialize/s':>14} {'compiled/s':>14}"
+        f" {'deserialize/s':>14} {'compiled/s':>14}"
+    )
+    for name, model in samples(attr_count).items():
+        serial = model.serialize()
+        model_cls = type(model)
+
+        def serialize():
+            if fresh:
+                SCHEMA_POOLS.clear()
+            model.serialize()
+
+        def deserialize():
+            if fresh:
+                SCHEMA_POOLS.clear()
+            model_cls.deserialize(serial)
+
+        compiled.set_mode(compiled.MODE_OFF)
+        plain_rate = rate(serialize, count)
+        plain_load_rate = rate(deserialize, count)
+        compiled.set_mode(compiled.MODE_VERIFY)
+        serialize()
+        deserialize()
+        compiled.set_mode(compiled.MODE_ON)
+        compiled_rate = rate(serialize, count)
+        compiled_load_rate = rate(deserialize, count)
+        compiled.set_mode(compiled.MODE_OFF)
+
+        print(
+            f"{name:>24} {plain_rate:14.1f} {compiled_rate:14.1f}"
+            f" {plain_load_rate:14.1f} {compiled_load_rate:14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measures serialize and deserialize throughput of models."
+    )
+    parser.add_argument(
+        "-c",
+        "--count",
+        type=int,
+        default=2000,
+        help="Set the number of operations to time for each model",
+    )
+    parser.add_argument(
+        "-a",
+        "--attributes",
+        type=int,
+        default=20,
+        help="Set the number of credential attributes in the sample messages",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Construct a new schema for every operation, for comparison",
+    )
+    args = parser.parse_args()
+
+    run_benchmark(args.count, args.attributes, args.fresh)